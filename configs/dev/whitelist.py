@@ -5,9 +5,7 @@ _.raw  # (src/saim/culture_link/private/cached_session.py:77)
 _._content  # (src/saim/culture_link/private/cached_session.py:78)
 _.reason  # (src/saim/culture_link/private/cached_session.py:79)
 found_ccno  # (src/saim/culture_link/private/container.py:98)
-_._content  # (src/saim/culture_link/private/verify_ccno.py:140)
-_._content  # (src/saim/culture_link/private/verify_ccno.py:147)
-_._content  # (src/saim/culture_link/private/verify_ccno.py:149)
+ClosureWarn  # unused class (src/saim/shared/error/warnings.py:9)
 f_cc_db  # (src/saim/shared/data_con/brc.py:20)
 pri  # (src/saim/shared/data_con/culture.py:48)
 dea  # (src/saim/shared/data_con/culture.py:49)
@@ -59,6 +57,7 @@ get_is_acc_regex  # (src/saim/shared/parse/sequence.py:49)
 is_assembly  # (src/saim/shared/parse/sequence.py:53)
 is_nucleotide  # (src/saim/shared/parse/sequence.py:57)
 radix_keys  # (src/saim/shared/search/radix_tree.py:144)
+radix_get_next  # (src/saim/shared/search/radix_tree.py:126)
 ch_int  # (src/saim/shared/verify/types.py:48)
 ch_opt_int  # (src/saim/shared/verify/types.py:52)
 ch_float  # (src/saim/shared/verify/types.py:56)
@@ -93,14 +92,26 @@ check_value_or  # (src/saim/shared/verify/types.py:39)
 to_json  # (src/saim/shared/data_con/culture.py:236)
 package_data  # (src/saim/shared/iter/pack.py:25)
 slim_extract_taxa_from_text  # (src/saim/taxon_name/manager.py:449)
-simple_ccno_linking  # (src/saim/culture_link/create_links.py:175)
+simple_ccno_linking  # (src/saim/culture_link/create_links.py:198)
+create_ccno_brc_links  # unused function (src/saim/culture_link/create_links.py:37)
+read_tasks  # unused function (src/saim/culture_link/validate_file.py:47)
 check_str_warn  # (src/saim/shared/verify/types.py:8)
 match_factory  # (src/saim/strain_matching/match.py:84)
-history_has_cycle  # (src/saim/history/extract_dep_des.py:157)
+history_has_cycle  # (src/saim/history/extract_dep_des.py:225)
 _.send  # (src/saim/culture_link/private/cached_session.py:202)
 create_update_results  # (src/saim/strain_matching/match.py:59)
 _.to_dict_core  # (src/saim/shared/data_con/culture.py:181)
 clean_empty_values_in_dict  # (src/saim/shared/data_ops/clean.py:27)
 has_reasonable_taxon_overlap  # (src/saim/taxon_name/manager.py:410)
-assign_depositor_designation  # (src/saim/history/extract_dep_des.py:113)
+assign_depositor_designation  # (src/saim/history/extract_dep_des.py:239)
+assign_depositor_designations  # unused function (src/saim/history/extract_dep_des.py:291)
 is_species_or_lower  # unused function (src/saim/shared/data_con/taxon.py:289)
+__missing__  # unused function (src/saim/shared/parse/string.py:51)
+__contains__  # unused function (src/saim/culture_link/private/journal.py:73)
+find_all_cycle_members  # unused function (src/saim/history/graph.py:71)
+_.disable  # unused method (src/saim/shared/misc/metrics.py:98)
+_.reset  # unused method (src/saim/shared/misc/metrics.py:101)
+load_metrics  # unused function (src/saim/shared/misc/metrics.py:196)
+_.to_prometheus  # unused method (src/saim/shared/misc/metrics.py:155)
+identify_ccno_batch  # unused function (src/saim/designation/manager.py:144)
+_.client  # unused method (src/saim/designation/service.py:226)
@@ -1,12 +1,13 @@
 import atexit
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import AsyncIterable, Iterable, final
+from typing import AsyncIterable, Final, Iterable, final
 
 from cafi.constants.versions import CURRENT_VER
 from cafi.library.catalogue import create_ccno_links
 from cafi.container.links import CatalogueLink, LinkLevel
 from saim.culture_link.private.container import SearchTask
+from saim.culture_link.private.link_template import LinkTemplateCache
 
 
 from saim.culture_link.private.manager import (
@@ -14,9 +15,12 @@ from saim.culture_link.private.manager import (
     TaskPackage,
     VerifiedURL,
 )
-from saim.designation.manager import AcronymManager
+from saim.designation.manager import AcronymLookup, AcronymManager
 from saim.shared.data_con.designation import CCNoDes
-from saim.shared.cafi.adapter import get_domain_from_cafi, parse_ccno_to_cat_args
+from saim.shared.cafi.adapter import parse_ccno_to_cat_args
+
+# buffered tasks per worker before a package is released
+_PACKAGE_BUFFER: Final[int] = 8
 
 
 @final
@@ -30,27 +34,14 @@ class SearchRequest:
     exclude: tuple[LinkLevel, ...] = field(default_factory=tuple)
 
 
-def _filter_domain_tasks(
-    domain_tasks: dict[str, list[TaskPackage]],
-    new_task: tuple[str, TaskPackage] | None = None,
-    /,
-) -> dict[str, list[TaskPackage]]:
-    filtered = dict(filter(lambda item: len(item[1]) > 0, domain_tasks.items()))
-    if new_task is not None:
-        domain, task = new_task
-        buf_list = filtered.get(domain, [])
-        buf_list.append(task)
-        filtered[domain] = buf_list
-    return filtered
-
-
 def create_ccno_brc_links(
     ccno: CCNoDes,
-    acr_man: AcronymManager,
+    acr_man: AcronymLookup,
     bid: int,
     exclude: tuple[LinkLevel, ...] = (),
     /,
 ) -> list[tuple[int, CatalogueLink]]:
+    """Creates the links through CAFI without the templates of `LinkTemplateCache`."""
     if len(brc_ids := acr_man.identify_acr(ccno.acr)) > 0:
         return [
             (brc_id, create_ccno_links(acr_db, parse_ccno_to_cat_args(ccno), exclude))
@@ -61,9 +52,49 @@ def create_ccno_brc_links(
     return []
 
 
+def _take_package[T](domain_tasks: dict[str, list[T]], size: int, /) -> list[T]:
+    package: list[T] = []
+    while len(domain_tasks) > 0 and len(package) < size:
+        for domain in list(domain_tasks):
+            if len(package) >= size:
+                break
+            tasks = domain_tasks[domain]
+            package.append(tasks.pop())
+            if len(tasks) == 0:
+                del domain_tasks[domain]
+    return package
+
+
+def pack_domain_tasks[T](
+    domain_tasks: Iterable[tuple[str, T]], workers: int, /
+) -> Iterable[list[T]]:
+    """Packs tasks into packages of up to `workers` tasks spread over the domains.
+
+    A package is released as soon as tasks of `workers` domains
+    or `workers * _PACKAGE_BUFFER` tasks are buffered,
+    so the input is read lazily even if it only targets a few domains.
+    """
+    buffered: dict[str, list[T]] = {}
+    size = 0
+    for domain, task in domain_tasks:
+        buffered.setdefault(domain, []).append(task)
+        size += 1
+        if len(buffered) >= workers or size >= workers * _PACKAGE_BUFFER:
+            package = _take_package(buffered, workers)
+            size -= len(package)
+            yield package
+    while len(buffered) > 0:
+        yield _take_package(buffered, workers)
+
+
 @final
 class CcnoLinkGenerator:
-    __slots__: tuple[str, ...] = "__acr_man", "__manager", "__worker_cnt"
+    __slots__: tuple[str, ...] = (
+        "__acr_man",
+        "__manager",
+        "__templates",
+        "__worker_cnt",
+    )
 
     def __init__(
         self,
@@ -71,14 +102,16 @@ class CcnoLinkGenerator:
         work_dir: Path,
         contact: str = "",
         db_size_gb: int = 100,
-        acr_man: AcronymManager | None = None,
+        acr_man: AcronymLookup | None = None,
+        pool_size: int = 1,
         /,
     ) -> None:
         acr = acr_man
         if acr is None:
             acr = AcronymManager(CURRENT_VER)
-        self.__acr_man: AcronymManager = acr
-        self.__manager = RequestManager(worker, work_dir, db_size_gb, contact)
+        self.__acr_man: AcronymLookup = acr
+        self.__templates = LinkTemplateCache(acr)
+        self.__manager = RequestManager(worker, work_dir, db_size_gb, contact, pool_size)
         self.__worker_cnt: int = worker
         atexit.register(lambda: self.__manager.close())
         super().__init__()
@@ -89,9 +122,7 @@ class CcnoLinkGenerator:
 
     def create_ccno_link_task(self, request: SearchRequest, /) -> TaskPackage | None:
         ccno_ided = self.__acr_man.identify_ccno(request.find_ccno)
-        links = create_ccno_brc_links(
-            ccno_ided, self.__acr_man, request.brc_id, request.exclude
-        )
+        links = self.__templates.create_links(ccno_ided, request.brc_id, request.exclude)
         if len(links) != 1:
             return None
         bid, link = links[0]
@@ -116,37 +147,27 @@ class CcnoLinkGenerator:
         task = self.create_ccno_link_task(search_request)
         if task is None:
             return None
-        domain = get_domain_from_cafi(task.template_links, search_request.fallback_link)
+        domain = self.__templates.get_domain(
+            task.search_task.brc_id,
+            search_request.exclude,
+            task.template_links,
+            search_request.fallback_link,
+        )
         if domain == "":
             return None
         return (domain, task)
 
-    def _create_work_package(
-        self, domain_tasks: dict[str, list[TaskPackage]], /
-    ) -> tuple[dict[str, list[TaskPackage]], list[TaskPackage]]:
-        package: list[TaskPackage] = []
-        while len(domain_tasks) > 0 and len(package) < self.__worker_cnt:
-            cnt = len(package)
-            package.extend(
-                tasks.pop()
-                for tasks in domain_tasks.values()
-                if (cnt := cnt + 1) <= self.__worker_cnt
-            )
-            domain_tasks = _filter_domain_tasks(domain_tasks)
-        return domain_tasks, package
-
     def create_work_packages(
         self, req_data: Iterable[SearchRequest], /
     ) -> Iterable[list[TaskPackage]]:
-        req_iter = iter(req_data)
-        domain_tasks: dict[str, list[TaskPackage]] = {}
-        while (req := next(req_iter, None)) is not None or len(domain_tasks) > 0:
-            domain_tasks = _filter_domain_tasks(
-                domain_tasks, self._create_domain_task(req)
-            )
-            if len(domain_tasks) >= self.__worker_cnt or req is None:
-                domain_tasks, package = self._create_work_package(domain_tasks)
-                yield package
+        return pack_domain_tasks(
+            (
+                domain_task
+                for req in req_data
+                if (domain_task := self._create_domain_task(req)) is not None
+            ),
+            self.__worker_cnt,
+        )
 
     async def verify_ccno_url(
         self, task_packages: Iterable[list[TaskPackage]], /
@@ -164,6 +185,7 @@ class CcnoLinkGenerator:
                     break
                 yield awaited
                 if len(stack) == 0 and (tasks := next(task_iter, None)) is not None:
+                    self.__manager.prefetch_robots(tasks)
                     stack.extend(tasks)
                 try:
                     next_task = stack.pop() if len(stack) > 0 else None
@@ -7,6 +7,7 @@ from cafi.constants.versions import CURRENT_VER
 from saim.culture_link.validate_file import validate_file
 
 from saim.culture_link.validate_cafi import validate_cafi
+from saim.shared.error.exceptions import ValidationEx
 
 
 def _parse_args(argv: list[str], /) -> argparse.Namespace:
@@ -74,6 +75,23 @@ def _parse_args(argv: list[str], /) -> argparse.Namespace:
         help="whether to check CAFI database and not a file",
         dest="cafi",
     )
+    parser.add_argument(
+        "-p",
+        "--progress",
+        action="store",
+        type=float,
+        required=False,
+        default=30.0,
+        help="the interval (seconds) between progress reports",
+        dest="progress",
+        metavar="float",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="whether to continue from the result journal of a previous run",
+        dest="resume",
+    )
 
     return parser.parse_args(argv)
 
@@ -89,11 +107,22 @@ def run() -> None:
             args.output,
             in_file,
             args.contact,
+            args.resume,
+            float(args.progress),
         )
     else:
-        validate_cafi(
-            CURRENT_VER, int(args.worker), int(args.db_size), args.output, args.contact
-        )
+        try:
+            validate_cafi(
+                CURRENT_VER,
+                int(args.worker),
+                int(args.db_size),
+                args.output,
+                args.contact,
+                args.resume,
+            )
+        except ValidationEx as exc:
+            print(f"ERROR: {exc.message}", file=sys.stderr)
+            sys.exit(2)
 
 
 if __name__ == "__main__":
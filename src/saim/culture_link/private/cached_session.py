@@ -1,5 +1,4 @@
 import asyncio
-from datetime import timedelta
 from io import BytesIO
 import random
 import tempfile
@@ -7,17 +6,14 @@ import time
 from typing import (
     Awaitable,
     Callable,
-    Concatenate,
     Final,
     Mapping,
-    ParamSpec,
     final,
 )
 import warnings
-from requests import PreparedRequest, Timeout
+from requests import PreparedRequest, Session, Timeout
 from requests.structures import CaseInsensitiveDict
 from requests.adapters import BaseAdapter
-from requests_cache import BaseCache, CachedSession
 from playwright.async_api import (
     Response,
     async_playwright,
@@ -30,13 +26,24 @@ from urllib3 import HTTPResponse
 from requests.models import Response as RequestResponse
 from requests.exceptions import RequestException
 from saim.shared.misc.constants import ENCODING
+from saim.shared.misc.metrics import METRICS
 
 from saim.culture_link.private.container import CachedPageResp
 from saim.culture_link.private.cool_down import CoolDownDomain
+from saim.culture_link.private.page_pool import PagePool
 from saim.culture_link.private.robots_txt import RobotsTxt, get_user_agent
 from saim.shared.error.exceptions import SessionCreationEx
 from saim.shared.error.warnings import RequestWarn
 
+_SETTLE_SEC: Final[float] = 6.0
+_POLL_MSEC: Final[float] = 250.0
+# true as soon as every search pattern matches the current document
+_FIND_PATTERNS_JS: Final[str] = """(patterns) => {
+    const root = document.documentElement;
+    const text = root === null ? "" : root.outerHTML;
+    return patterns.every((pat) => new RegExp(pat, "i").test(text));
+}"""
+
 
 async def _get_resp(
     call: Callable[[], Awaitable[Response | None]], err_str: str, retry: int, /
@@ -94,6 +101,19 @@ def _create_response(
     return response
 
 
+async def _await_settle(page: Page, start_time: float, /) -> None:
+    try:
+        with METRICS.timer("browser.networkidle"):
+            await page.wait_for_load_state("networkidle", timeout=60_000.0)
+    except Error:
+        METRICS.count("browser.networkidle_timeout")
+    else:
+        remaining = max(0.0, _SETTLE_SEC - (time.time() - start_time))
+        if remaining > 0:
+            with METRICS.timer("browser.settle"):
+                await asyncio.sleep(remaining)
+
+
 @final
 class PWContext:
     __slots__: tuple[str, ...] = ("__cnt", "__runner", "__spw", "__test")
@@ -139,23 +159,16 @@ class PWContext:
             runner.close()
 
 
-BLOCK_TYPES: Final[list[str]] = [
-    "image",
-    "media",
-    "font",
-    "ping",
-    "manifest",
-    "prefetch",
-]
-
-
 @final
 class BrowserPWAdapter(BaseAdapter):
     __slots__: tuple[str, ...] = (
+        "__adaptive",
         "__browser",
         "__contact",
         "__cool_down",
         "__delay",
+        "__patterns",
+        "__pool",
         "__pwc",
         "__retries",
         "__runner",
@@ -163,9 +176,18 @@ class BrowserPWAdapter(BaseAdapter):
     )
 
     def __init__(
-        self, pwc: PWContext, contact: str = "", max_attempts: int = 1, /
+        self,
+        pwc: PWContext,
+        contact: str = "",
+        max_attempts: int = 1,
+        pool_size: int = 1,
+        page_uses: int = 50,
+        adaptive: bool = True,
+        /,
     ) -> None:
         self.__pwc: PWContext = pwc
+        self.__adaptive = adaptive
+        self.__patterns: tuple[str, ...] | None = None
         self.__contact = contact
         self.__tmp = tempfile.TemporaryDirectory()
         self.__cool_down: CoolDownDomain | None = None
@@ -183,14 +205,28 @@ class BrowserPWAdapter(BaseAdapter):
                     args=["--disable-gpu"],
                 )
             )
+            self.__pool: PagePool | None = PagePool(
+                self.__browser, contact, pool_size, page_uses
+            )
+            self.__pwc.runner.run(self.__pool.warm_up())
         else:
             self.__browser = None
+            self.__pool = None
         super().__init__()
 
+    @property
+    def pool_stats(self) -> dict[str, int]:
+        if self.__pool is None:
+            return {}
+        return self.__pool.stats
+
     def set_cool_down(self, cool_down: CoolDownDomain, delay: float, /) -> None:
         self.__cool_down = cool_down
         self.__delay = delay
 
+    def set_search_patterns(self, patterns: tuple[str, ...] | None, /) -> None:
+        self.__patterns = patterns
+
     async def __await_cool_down(self) -> None:
         if self.__cool_down is None:
             await asyncio.sleep(1.0)
@@ -205,51 +241,72 @@ class BrowserPWAdapter(BaseAdapter):
         err_str: str = "",
         /,
     ) -> RequestResponse | None:
-        if self.__browser is None:
+        if self.__pool is None:
             raise SessionCreationEx("browser not started")
         tout_msec = 30_000.0
         if isinstance(timeout, (float, int)):
             tout_msec = timeout * 1000.0
         for attempt in range(self.__retries):
-            page = await self.__browser.new_page()
-            await page.route(
-                "**/*",
-                lambda route, req: (
-                    route.abort()
-                    if req.resource_type in BLOCK_TYPES
-                    else route.continue_()
-                ),
-            )
-            page.on("console", lambda _: None)
-            await page.set_extra_http_headers(
-                {"User-Agent": get_user_agent(self.__contact)}
-            )
-            att_time = tout_msec * (0.5 if attempt > 0 else 1.0)
-
-            async def go_to_page(p: Page = page, t: float = att_time) -> Response | None:
-                return await p.goto(url, timeout=t, wait_until="load")
-
-            await self.__await_cool_down()
-            resp: Response | None = await _get_resp(go_to_page, err_str, attempt + 1)
-            if resp is not None:
-                start_time = time.time()
-                try:
-                    await page.wait_for_load_state("networkidle", timeout=60_000.0)
-                except Error:
-                    pass
-                else:
-                    elapsed = time.time() - start_time
-                    remaining = max(0, 6 - elapsed)
-                    if remaining > 0:
-                        await asyncio.sleep(remaining)
-                content = await page.content()
-                await page.close()
-                return _create_response(request, resp, content)
-            await page.close()
+            with METRICS.timer("browser.acquire_page"):
+                pooled = await self.__pool.acquire()
+            try:
+                response = await self.__visit(
+                    pooled.page, url, request, (attempt, tout_msec), err_str
+                )
+            finally:
+                await self.__pool.release(pooled)
+            if response is not None:
+                return response
+            METRICS.count("browser.failed_attempt")
             if attempt + 1 < self.__retries:
                 await asyncio.sleep(1.0 + (random.random() - 0.5))  # noqa: S311
         return None
 
+    async def __await_patterns(self, page: Page, /) -> bool:
+        if not self.__adaptive or self.__patterns is None:
+            return False
+        try:
+            with METRICS.timer("browser.adaptive_settle"):
+                await page.wait_for_function(
+                    _FIND_PATTERNS_JS,
+                    arg=list(self.__patterns),
+                    polling=_POLL_MSEC,
+                    timeout=_SETTLE_SEC * 1000.0,
+                )
+        except Error:
+            METRICS.count("browser.adaptive_fallback")
+            return False
+        METRICS.count("browser.adaptive_hit")
+        return True
+
+    async def __visit(
+        self,
+        page: Page,
+        url: str,
+        request: PreparedRequest,
+        attempt: tuple[int, float],
+        err_str: str,
+        /,
+    ) -> RequestResponse | None:
+        att_cnt, tout_msec = attempt
+        att_time = tout_msec * (0.5 if att_cnt > 0 else 1.0)
+
+        async def go_to_page() -> Response | None:
+            return await page.goto(url, timeout=att_time, wait_until="load")
+
+        with METRICS.timer("browser.cool_down"):
+            await self.__await_cool_down()
+        with METRICS.timer("browser.goto"):
+            resp: Response | None = await _get_resp(go_to_page, err_str, att_cnt + 1)
+        if resp is None:
+            return None
+        start_time = time.time()
+        if not await self.__await_patterns(page):
+            await _await_settle(page, start_time)
+        with METRICS.timer("browser.content"):
+            content = await page.content()
+        return _create_response(request, resp, content)
+
     def send(
         self,
         request: PreparedRequest,
@@ -274,33 +331,19 @@ class BrowserPWAdapter(BaseAdapter):
 
     def finish(self) -> None:
         print("CLOSING PW")
+        if self.__pool is not None:
+            print(f"[PAGE POOL] {self.__pool.stats!s}")
+            self.__pwc.runner.run(self.__pool.close())
+            self.__pool = None
         if self.__browser is not None:
             self.__pwc.runner.run(self.__browser.close())
         self.__pwc.close(False)
         self.__tmp.cleanup()
 
 
-P = ParamSpec("P")
-
-
-def _create_get_cache(
-    adapter: BrowserPWAdapter,
-    exp_days: int,
-    backend: BaseCache,
-    key_fn: Callable[Concatenate[PreparedRequest, P], str],
-    /,
-) -> CachedSession:
+def _create_get_session(adapter: BrowserPWAdapter, /) -> Session:
     try:
-        session = CachedSession(
-            backend=backend,
-            expire_after=timedelta(days=exp_days),
-            cache_control=False,
-            stale_if_error=False,
-            always_revalidate=False,
-            allowable_codes=[*range(200, 400), 404, 403],
-            allowable_methods=("GET",),
-            key_fn=key_fn,
-        )
+        session = Session()
         session.mount("http://", adapter)
         session.mount("https://", adapter)
     except Error as cex:
@@ -310,47 +353,42 @@ def _create_get_cache(
 
 def make_get_request(
     url: str,
-    session: tuple[
-        BrowserPWAdapter,
-        int,
-        BaseCache,
-        Callable[Concatenate[PreparedRequest, P], str],
-    ],
+    pw_adapter: BrowserPWAdapter,
     info: tuple[CoolDownDomain, RobotsTxt, str],
     tasks_cnt: int,
     /,
 ) -> CachedPageResp:
     results = CachedPageResp(prohibited=True)
     cool_down, robots_txt, contact = info
-    pw_adapter, exp, cache, call = session
-
-    pw_adapter.set_cool_down(cool_down, robots_txt.get_delay())
-    cached_session = _create_get_cache(
-        pw_adapter,
-        exp,
-        cache,
-        call,
-    )
 
-    if robots_txt.can_fetch(url):
+    with METRICS.timer("link.robots_txt"):
+        pw_adapter.set_cool_down(cool_down, robots_txt.get_delay())
+    session = _create_get_session(pw_adapter)
+
+    with METRICS.timer("link.robots_txt"):
+        can_fetch = robots_txt.can_fetch(url)
+    if can_fetch:
         if cool_down.skip_request():
+            METRICS.count("link.skipped")
             return results
         try:
-            response = cached_session.get(
-                url,
-                **{
-                    "timeout": 180,
-                    "allow_redirects": True,
-                    "headers": {"User-Agent": get_user_agent(contact)},
-                },
-            )
+            with METRICS.timer("link.request"):
+                response = session.get(
+                    url,
+                    timeout=180,
+                    allow_redirects=True,
+                    headers={"User-Agent": get_user_agent(contact)},
+                )
         except (Error, RequestException):
+            METRICS.count("link.timeout")
             cool_down.finished_request(True, tasks_cnt)
             return CachedPageResp(timeout=True)
+        METRICS.count("link.fetched")
         results = CachedPageResp(
             response=b"" if response.content is None else response.content,
             status=response.status_code,
-            cached=response.from_cache,
         )
+    else:
+        METRICS.count("link.prohibited")
     cool_down.finished_request(results.timeout, tasks_cnt)
     return results
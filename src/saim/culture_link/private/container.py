@@ -3,6 +3,7 @@ from typing import Iterator, final
 
 from cafi.container.links import CatalogueLink
 from pydantic import HttpUrl, ValidationError
+from saim.culture_link.private.search_matcher import SearchMatcher
 from saim.culture_link.private.constants import (
     CAT_DET_EXP_DAYS,
     CAT_EXP_DAYS,
@@ -55,6 +56,14 @@ class TaskPackage:
     search_task: SearchTask
     template_links: CatalogueLink
     fallback_link: str = ""
+    matcher: SearchMatcher = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "matcher",
+            SearchMatcher(self.search_task.find_ccno, self.search_task.find_extra),
+        )
 
     @property
     def urls(self) -> list[tuple[str, str, str, int]]:
@@ -128,19 +137,6 @@ class VerifiedURL:
 @dataclass(frozen=True, slots=True)
 class CachedPageResp:
     response: bytes = b""
-    cached: bool = False
     status: int = 500
     timeout: bool = False
     prohibited: bool = False
-
-    @staticmethod
-    def change_to_cached_content(
-        page: "CachedPageResp", new_content: bytes, /
-    ) -> "CachedPageResp":
-        return CachedPageResp(
-            response=new_content,
-            cached=True,
-            status=page.status,
-            timeout=page.timeout,
-            prohibited=page.prohibited,
-        )
@@ -12,6 +12,10 @@ _T_LIMIT: Final[float] = 3.0
 _MAX_DELAY: Final[int] = 5
 
 
+def get_cool_down_sec(delay: float, /) -> float:
+    return delay if 0 < delay < _MAX_DELAY else _COOL_DOWN
+
+
 @final
 class CoolDownDomain:
     __slots__: tuple[str, ...] = ("__domain", "__last_request", "__lock", "__timeout_cnt")
@@ -29,7 +33,7 @@ class CoolDownDomain:
 
     def await_cool_down(self, delay: float, /) -> None:
         wait_time = 0.0
-        cool_down_sec = delay if 0 < delay < _MAX_DELAY else _COOL_DOWN
+        cool_down_sec = get_cool_down_sec(delay)
 
         while True:
             with self.__lock:
@@ -42,6 +46,10 @@ class CoolDownDomain:
                     break
             time.sleep(wait_time + 0.01)
 
+    def next_request_at(self, delay: float, /) -> float:
+        with self.__lock:
+            return float(self.__last_request.value) + get_cool_down_sec(delay)
+
     def skip_request(self) -> bool:
         with self.__lock:
             last_req = self.__last_request.value
@@ -0,0 +1,214 @@
+from collections.abc import Iterator
+import json
+import os
+from pathlib import Path
+from typing import Any, Final, TextIO, final
+import warnings
+
+from saim.culture_link.private.container import LinkResult, VerifiedURL
+from saim.shared.error.warnings import RequestWarn
+from saim.shared.misc.constants import ENCODING
+
+_SYNC_EVERY: Final[int] = 64
+# ids below are kept as bits, 32 MiB at most, larger ids in a set
+_MAX_DENSE_ID: Final[int] = 1 << 28
+
+type JournalEntry = dict[str, Any]
+
+
+def _create_success_entry(link: VerifiedURL, result: LinkResult, /) -> JournalEntry:
+    link_type = ""
+    for status in link.status:
+        if status.link == result.link:
+            link_type = status.link_type
+    return {
+        "brc_id": result.brc_id,
+        "link": result.link,
+        "link_type": link_type,
+        "status": [
+            {"link": status.link, "reason": str(status.status.value)}
+            for status in link.status
+        ],
+    }
+
+
+def _create_fail_entry(link: VerifiedURL, /) -> JournalEntry:
+    return {
+        "result": (
+            None
+            if link.result is None
+            else {"link": link.result.link, "brc_id": link.result.brc_id}
+        ),
+        "status": [
+            {
+                "link": status.link,
+                "type": status.link_type,
+                "reason": str(status.status.value),
+            }
+            for status in link.status
+        ],
+    }
+
+
+@final
+class TaskIdSet:
+    """Compact set of the non-negative, mostly dense task ids of one run.
+
+    An id takes one bit, so the memory grows with the largest id
+    and not with the number of entries.
+    Negative or very large ids are kept in a plain set.
+    """
+
+    __slots__ = ("__bits", "__count", "__sparse")
+
+    def __init__(self) -> None:
+        self.__bits = bytearray()
+        self.__sparse: set[int] = set()
+        self.__count = 0
+        super().__init__()
+
+    def __len__(self) -> int:
+        return self.__count + len(self.__sparse)
+
+    def __contains__(self, task_id: object, /) -> bool:
+        if not isinstance(task_id, int):
+            return False
+        if 0 <= task_id < _MAX_DENSE_ID:
+            byte = task_id >> 3
+            return byte < len(self.__bits) and bool(
+                self.__bits[byte] >> (task_id & 7) & 1
+            )
+        return task_id in self.__sparse
+
+    def __iter__(self) -> Iterator[int]:
+        for byte, bits in enumerate(self.__bits):
+            if bits != 0:
+                yield from (byte * 8 + bit for bit in range(8) if bits >> bit & 1)
+        yield from sorted(self.__sparse)
+
+    def add(self, task_id: int, /) -> None:
+        if not 0 <= task_id < _MAX_DENSE_ID:
+            self.__sparse.add(task_id)
+            return None
+        byte, mask = task_id >> 3, 1 << (task_id & 7)
+        if byte >= len(self.__bits):
+            self.__bits.extend(
+                bytes(max(byte + 1, 2 * len(self.__bits)) - len(self.__bits))
+            )
+        if not self.__bits[byte] & mask:
+            self.__bits[byte] |= mask
+            self.__count += 1
+
+
+def _is_verified(link: VerifiedURL, /) -> bool:
+    return link.result is not None and link.result.link != ""
+
+
+def _repair_tail(path: Path, /) -> None:
+    # a crash during a write can leave a partial last line behind
+    with path.open("rb+") as fhd:
+        size = fhd.seek(0, os.SEEK_END)
+        if size == 0:
+            return None
+        fhd.seek(size - 1)
+        if fhd.read(1) == b"\n":
+            return None
+        fhd.seek(0)
+        keep = fhd.read().rfind(b"\n") + 1
+        fhd.truncate(keep)
+
+
+@final
+class ResultJournal:
+    """Append-only NDJSON journal of finished verification tasks.
+
+    Every line holds the task id, whether the link was verified,
+    and the entry written to the final result files.
+    Resuming keeps the existing lines and reports their task ids as completed,
+    otherwise the journal is started empty.
+    The completed ids are kept as a `TaskIdSet`, one bit per id.
+    """
+
+    __slots__ = ("__completed", "__fhd", "__path", "__unsynced")
+
+    def __init__(self, path: Path, resume: bool, /) -> None:
+        self.__path = path
+        self.__completed = TaskIdSet()
+        if resume and path.is_file():
+            _repair_tail(path)
+            for task_id, *_ in self.__read():
+                self.__completed.add(task_id)
+        elif path.is_file():
+            path.unlink()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.__fhd: TextIO = path.open("a", encoding=ENCODING)
+        self.__unsynced = 0
+        super().__init__()
+
+    @property
+    def completed(self) -> TaskIdSet:
+        return self.__completed
+
+    def __read(self) -> Iterator[tuple[int, bool, JournalEntry]]:
+        with self.__path.open("r", encoding=ENCODING) as fhd:
+            for line_nr, line in enumerate(fhd, 1):
+                try:
+                    rec = json.loads(line)
+                    yield int(rec["task_id"]), bool(rec["verified"]), rec["entry"]
+                except (ValueError, KeyError, TypeError):
+                    warnings.warn(
+                        f"[JOURNAL] skipping broken line {line_nr} in {self.__path!s}",
+                        RequestWarn,
+                        stacklevel=2,
+                    )
+
+    def append(self, link: VerifiedURL, /) -> JournalEntry:
+        verified = _is_verified(link)
+        if verified and link.result is not None:
+            entry = _create_success_entry(link, link.result)
+        else:
+            entry = _create_fail_entry(link)
+        self.__fhd.write(
+            json.dumps({"task_id": link.task_id, "verified": verified, "entry": entry})
+            + "\n"
+        )
+        self.__fhd.flush()
+        self.__completed.add(link.task_id)
+        self.__unsynced += 1
+        if self.__unsynced >= _SYNC_EVERY:
+            self.sync()
+        return entry
+
+    def sync(self) -> None:
+        self.__fhd.flush()
+        os.fsync(self.__fhd.fileno())
+        self.__unsynced = 0
+
+    def entries(self) -> Iterator[tuple[int, bool, JournalEntry]]:
+        self.sync()
+        yield from self.__read()
+
+    def compact(self, success: Path, failed: Path, /) -> tuple[int, int]:
+        """Streams the journal into one JSON object per outcome keyed by task id."""
+        counts = [0, 0]
+        with (
+            success.open("w", encoding=ENCODING) as sfh,
+            failed.open("w", encoding=ENCODING) as ffh,
+        ):
+            sfh.write("{")
+            ffh.write("{")
+            for task_id, verified, entry in self.entries():
+                out, ind = (sfh, 0) if verified else (ffh, 1)
+                out.write(
+                    f"{', ' if counts[ind] > 0 else ''}"
+                    f"{json.dumps(str(task_id))}: {json.dumps(entry)}"
+                )
+                counts[ind] += 1
+            sfh.write("}")
+            ffh.write("}")
+        return counts[0], counts[1]
+
+    def close(self) -> None:
+        if not self.__fhd.closed:
+            self.sync()
+            self.__fhd.close()
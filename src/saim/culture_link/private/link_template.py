@@ -0,0 +1,258 @@
+from dataclasses import dataclass
+import re
+import secrets
+from typing import Final, final
+
+from cafi.container.acr_db import AcrDbEntry, CatArgs
+from cafi.container.links import CatalogueLink, LinkLevel
+from cafi.library.catalogue import create_ccno_links
+
+from saim.designation.manager import AcronymLookup
+from saim.shared.cafi.adapter import get_domain_from_cafi, parse_ccno_to_cat_args
+from saim.shared.data_con.designation import CCNoDes
+from saim.shared.parse.http_url import get_domain
+
+_FIELDS: Final[tuple[str, ...]] = ("acr", "id", "pre", "suf", "core")
+_DIGIT_R: Final[re.Pattern[str]] = re.compile(r"\d")
+_LOWER_R: Final[re.Pattern[str]] = re.compile(r"[a-z]")
+_UPPER_R: Final[re.Pattern[str]] = re.compile(r"[A-Z]")
+
+type _Pieces = tuple[str, ...]
+type _TemplateKey = tuple[int, tuple[LinkLevel, ...]]
+type _RegexId = tuple[re.Pattern[str] | None, ...]
+# the match states of the regex_id parts and the char class of every id char
+type _Shape = tuple[tuple[int, ...], tuple[str, ...]]
+
+
+def _create_marks() -> dict[str, str]:
+    # random word chars, not changed by url quoting and not part of a template,
+    # the leading zero and the mixed case catch value dependent formatting
+    token = secrets.token_hex(8)
+    return {fld: f"0Saim{token}{fld}" for fld in _FIELDS}
+
+
+def _split_url(url: str, mark_re: re.Pattern[str], marks: dict[str, str], /) -> _Pieces:
+    # literal text at even positions, the field names at odd positions
+    fields = {mark: fld for fld, mark in marks.items()}
+    return tuple(
+        fields[piece] if pos % 2 == 1 else piece
+        for pos, piece in enumerate(mark_re.split(url))
+    )
+
+
+def _fill(pieces: _Pieces, values: dict[str, str], /) -> str:
+    return "".join(
+        values[piece] if pos % 2 == 1 else piece for pos, piece in enumerate(pieces)
+    )
+
+
+@final
+@dataclass(frozen=True, slots=True, kw_only=True)
+class LinkTemplate:
+    level: LinkLevel
+    catalogue: tuple[_Pieces, ...]
+    homepage: str
+    # empty if the domain depends on the culture id
+    cat_domain: str
+
+    def create(self, ccno: CCNoDes, /) -> CatalogueLink:
+        values = {
+            "acr": ccno.acr,
+            "id": ccno.id.full,
+            "pre": ccno.id.pre,
+            "suf": ccno.id.suf,
+            "core": ccno.id.core,
+        }
+        return CatalogueLink(
+            level=self.level,
+            catalogue=[_fill(pieces, values) for pieces in self.catalogue],
+            homepage=self.homepage,
+        )
+
+    def domain(self, link: CatalogueLink, fallback: str, /) -> str:
+        if (
+            link.level == LinkLevel.cat
+            and self.cat_domain != ""
+            and len(link.catalogue) > 0
+            and link.catalogue[0].startswith(self.catalogue[0][0])
+        ):
+            return self.cat_domain
+        return get_domain_from_cafi(link, fallback)
+
+
+def _compile_regex(pattern: str, /) -> re.Pattern[str] | None:
+    if pattern == "":
+        return None
+    try:
+        return re.compile(pattern)
+    except re.error:
+        return None
+
+
+def _layout(value: str, /) -> str:
+    # keeps the length, so only ids of the same length share a shape
+    return _UPPER_R.sub("A", _LOWER_R.sub("a", _DIGIT_R.sub("9", value)))
+
+
+def _match_state(pattern: re.Pattern[str] | None, value: str, /) -> int:
+    if pattern is None:
+        return -1
+    if pattern.fullmatch(value) is not None:
+        return 2
+    return 1 if pattern.match(value) is not None else 0
+
+
+def _compile_regex_id(acr_db: AcrDbEntry, /) -> _RegexId:
+    reg = acr_db.regex_id
+    return tuple(_compile_regex(pat) for pat in (reg.full, reg.core, reg.pre, reg.suf))
+
+
+def _get_shape(ccno: CCNoDes, regex_id: _RegexId, /) -> _Shape:
+    values = (ccno.id.full, ccno.id.core, ccno.id.pre, ccno.id.suf)
+    return (
+        tuple(
+            _match_state(pat, value) for pat, value in zip(regex_id, values, strict=True)
+        ),
+        tuple(_layout(value) for value in (ccno.acr, *values)),
+    )
+
+
+def _compile(
+    acr_db: AcrDbEntry, exclude: tuple[LinkLevel, ...], /
+) -> LinkTemplate | None:
+    marks = _create_marks()
+    mark_re = re.compile(f"({'|'.join(marks.values())})")
+    try:
+        link = create_ccno_links(acr_db, CatArgs(**marks), exclude)
+    except Exception:
+        return None
+    if mark_re.search(link.homepage) is not None:
+        return None
+    catalogue = tuple(_split_url(url, mark_re, marks) for url in link.catalogue)
+    cat_domain = ""
+    if len(link.catalogue) > 0 and mark_re.search(get_domain(link.catalogue[0])) is None:
+        cat_domain = get_domain(link.catalogue[0])
+    return LinkTemplate(
+        level=link.level,
+        catalogue=catalogue,
+        homepage=link.homepage,
+        cat_domain=cat_domain,
+    )
+
+
+def _same_links(first: CatalogueLink, second: CatalogueLink, /) -> bool:
+    return (
+        first.level == second.level
+        and list(first.catalogue) == list(second.catalogue)
+        and first.homepage == second.homepage
+    )
+
+
+@final
+@dataclass(frozen=True, slots=True, kw_only=True)
+class _BrcTemplates:
+    acr_db: AcrDbEntry
+    regex_id: _RegexId
+    # None if the markers were altered by CAFI
+    template: LinkTemplate | None
+    # None marks shapes which have to be linked by CAFI
+    shapes: dict[_Shape, LinkTemplate | None]
+
+
+@final
+class LinkTemplateCache:
+    """Catalogue link templates per BRC, compiled once from CAFI.
+
+    A template is built by letting CAFI create the links for marker values
+    and splitting the result on the markers. CAFI may choose other links
+    depending on the culture id, so the template is compared with CAFI
+    once for every id shape, i.e. the match states of all regex_id parts
+    and the char class of every char of the designation fields.
+    Shapes whose link differs and BRCs whose markers were altered
+    are always linked through CAFI.
+    """
+
+    __slots__ = ("__acr_ids", "__acr_man", "__templates")
+
+    def __init__(self, acr_man: AcronymLookup, /) -> None:
+        self.__acr_man = acr_man
+        self.__acr_ids: dict[str, set[int]] = {}
+        # None marks unknown BRCs
+        self.__templates: dict[_TemplateKey, _BrcTemplates | None] = {}
+        super().__init__()
+
+    def __brc_ids(self, acr: str, /) -> set[int]:
+        if (brc_ids := self.__acr_ids.get(acr)) is None:
+            brc_ids = self.__acr_man.identify_acr(acr)
+            self.__acr_ids[acr] = brc_ids
+        return brc_ids
+
+    def __brc_templates(
+        self, brc_id: int, exclude: tuple[LinkLevel, ...], /
+    ) -> _BrcTemplates | None:
+        key = (brc_id, exclude)
+        if key in self.__templates:
+            return self.__templates[key]
+        templates = None
+        if (acr_db := self.__acr_man.get_brc_by_id(brc_id)) is not None:
+            templates = _BrcTemplates(
+                acr_db=acr_db,
+                regex_id=_compile_regex_id(acr_db),
+                template=_compile(acr_db, exclude),
+                shapes={},
+            )
+        self.__templates[key] = templates
+        return templates
+
+    def __create_link(
+        self, ccno: CCNoDes, brc_id: int, exclude: tuple[LinkLevel, ...], /
+    ) -> CatalogueLink | None:
+        if (templates := self.__brc_templates(brc_id, exclude)) is None:
+            return None
+        if templates.template is None:
+            return create_ccno_links(
+                templates.acr_db, parse_ccno_to_cat_args(ccno), exclude
+            )
+        shape = _get_shape(ccno, templates.regex_id)
+        if shape in templates.shapes:
+            if (template := templates.shapes[shape]) is not None:
+                return template.create(ccno)
+            return create_ccno_links(
+                templates.acr_db, parse_ccno_to_cat_args(ccno), exclude
+            )
+        link = create_ccno_links(templates.acr_db, parse_ccno_to_cat_args(ccno), exclude)
+        template = templates.template
+        templates.shapes[shape] = (
+            template if _same_links(template.create(ccno), link) else None
+        )
+        return link
+
+    def create_links(
+        self, ccno: CCNoDes, bid: int, exclude: tuple[LinkLevel, ...] = (), /
+    ) -> list[tuple[int, CatalogueLink]]:
+        """The links of CAFI's `create_ccno_links` for every BRC of the acronym.
+
+        A link comes from the template only if CAFI created the same link
+        for the first id of the same shape.
+        """
+        if len(brc_ids := self.__brc_ids(ccno.acr)) == 0:
+            return []
+        return [
+            (brc_id, link)
+            for brc_id in brc_ids
+            if (bid < 1 or brc_id == bid)
+            and (link := self.__create_link(ccno, brc_id, exclude)) is not None
+        ]
+
+    def get_domain(
+        self,
+        brc_id: int,
+        exclude: tuple[LinkLevel, ...],
+        link: CatalogueLink,
+        fallback: str,
+        /,
+    ) -> str:
+        templates = self.__templates.get((brc_id, exclude))
+        if templates is None or (template := templates.template) is None:
+            return get_domain_from_cafi(link, fallback)
+        return template.domain(link, fallback)
@@ -1,69 +1,175 @@
+import asyncio
 from collections.abc import Iterable
 from multiprocessing import Queue
 from multiprocessing.context import SpawnProcess
 from pathlib import Path
 from queue import Empty, Full
-from typing import AsyncGenerator, Protocol, TypeAlias, final
+from threading import Event, Thread
+import time
+from typing import AsyncGenerator, Final, Protocol, TypeAlias, final
 
 from saim.culture_link.private.container import TaskPackage, VerifiedURL
-from saim.culture_link.private.cool_down import CoolDownDomain
-from saim.culture_link.private.robots_txt import RobotsTxt
+from saim.culture_link.private.cool_down import CoolDownDomain, get_cool_down_sec
+from saim.culture_link.private.robots_txt import RobotsService, RobotsTxt
+from saim.culture_link.private.scheduler import DomainScheduler
 from saim.culture_link.private.verify_ccno import VerifyCcNosProc
+from saim.culture_link.private.work_steal import WorkStealingDeques
 from saim.shared.misc.ctx import get_worker_ctx
+from saim.shared.misc.metrics import METRICS
 from saim.shared.parse.http_url import get_domain
 
 _ARGS_T: TypeAlias = tuple[TaskPackage, dict[str, tuple[CoolDownDomain, RobotsTxt]]]
+_RES_T: TypeAlias = tuple[int, VerifiedURL]
+_WORKER_QUEUE: Final[int] = 2
 
 
 class ValueP(Protocol):
     value: bool
 
 
+@final
+class _WorkerUsage:
+    __slots__ = ("__busy", "__busy_sec", "__last", "__start", "__workers")
+
+    def __init__(self, workers: int, /) -> None:
+        self.__workers = workers
+        self.__busy = 0
+        self.__busy_sec = 0.0
+        self.__start = time.monotonic()
+        self.__last = self.__start
+        super().__init__()
+
+    @property
+    def busy(self) -> int:
+        return self.__busy
+
+    def __advance(self) -> float:
+        now = time.monotonic()
+        self.__busy_sec += min(self.__busy, self.__workers) * (now - self.__last)
+        self.__last = now
+        return now
+
+    def started(self) -> None:
+        self.__advance()
+        self.__busy += 1
+        METRICS.count("culture_link.dispatched")
+
+    def finished(self) -> None:
+        self.__advance()
+        self.__busy -= 1
+        self.report()
+
+    def report(self) -> None:
+        total = (self.__advance() - self.__start) * self.__workers
+        METRICS.gauge(
+            "culture_link.worker_utilization_ratio",
+            self.__busy_sec / total if total > 0 else 0.0,
+        )
+
+
+@final
+class _ResultBridge:
+    """Moves the worker results from the process queue into an asyncio queue.
+
+    A reader thread blocks on the process queue,
+    so the event loop only wakes up for a result or a timeout.
+    """
+
+    __slots__ = ("__queue", "__res", "__stop", "__thread")
+
+    def __init__(self, res: "Queue[_RES_T]", /) -> None:
+        self.__res = res
+        self.__queue: asyncio.Queue[_RES_T] = asyncio.Queue()
+        self.__stop = Event()
+        self.__thread = Thread(
+            target=self.__read, args=(asyncio.get_running_loop(),), daemon=True
+        )
+        self.__thread.start()
+        super().__init__()
+
+    def __read(self, loop: asyncio.AbstractEventLoop, /) -> None:
+        while not self.__stop.is_set():
+            try:
+                result = self.__res.get(timeout=0.5)
+            except (TimeoutError, Empty):
+                pass
+            else:
+                loop.call_soon_threadsafe(self.__queue.put_nowait, result)
+
+    async def get(self, timeout: float | None, /) -> _RES_T | None:
+        if not self.__queue.empty():
+            return self.__queue.get_nowait()
+        try:
+            return await asyncio.wait_for(self.__queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.__stop.set()
+        self.__thread.join()
+
+
 @final
 class RequestManager:
     __slots__: tuple[str, ...] = (
         "__contact",
         "__db_size_gb",
+        "__deques",
         "__domain_info",
         "__finish",
         "__mpc",
-        "__queue_size",
+        "__pool_size",
         "__req",
         "__res",
+        "__robots",
         "__work_dir",
         "__worker",
     )
 
     def __init__(
-        self, worker: int, work_dir: Path, db_size_gb: int, contact: str, /
+        self,
+        worker: int,
+        work_dir: Path,
+        db_size_gb: int,
+        contact: str,
+        pool_size: int = 1,
+        /,
     ) -> None:
         self.__work_dir: Path = work_dir
         self.__contact = contact
+        self.__pool_size = pool_size
         self.__db_size_gb: int = db_size_gb
         if self.__db_size_gb < 1:
             self.__db_size_gb = 100
         self.__mpc = get_worker_ctx()
         worker_cnt = 1 if worker < 2 else worker
-        self.__queue_size = worker_cnt * 4
         self.__domain_info: dict[str, tuple[CoolDownDomain, RobotsTxt]] = {}
-        self.__req: Queue[_ARGS_T] = self.__mpc.Queue(maxsize=self.__queue_size)
-        self.__res: Queue[VerifiedURL] = self.__mpc.Queue()
+        self.__robots = RobotsService(work_dir)
+        # one request queue per worker, the parent decides who gets which task
+        self.__req: list[Queue[_ARGS_T]] = [
+            self.__mpc.Queue(maxsize=_WORKER_QUEUE) for _ in range(worker_cnt)
+        ]
+        self.__res: Queue[_RES_T] = self.__mpc.Queue()
         self.__finish: ValueP = self.__mpc.Value("b", False)
         self.__worker = list(self.__create_workers(worker_cnt))
+        # domain affinity outlives single runs like the browser contexts of the workers
+        self.__deques: WorkStealingDeques[_ARGS_T] = WorkStealingDeques(worker_cnt)
         for pro in self.__worker:
             pro.start()
         super().__init__()
 
     def __create_workers(self, worker: int, /) -> Iterable[SpawnProcess]:
-        for _ in range(worker):
+        for worker_id in range(worker):
             yield self.__mpc.Process(
                 target=VerifyCcNosProc(
-                    self.__req,
+                    self.__req[worker_id],
                     self.__res,
                     self.__db_size_gb,
                     self.__work_dir,
                     self.__finish,
                     self.__contact,
+                    self.__pool_size,
+                    worker_id,
                 ).run
             )
 
@@ -73,57 +179,126 @@ class RequestManager:
         closed_domain = {}
         for _, url, *_ in task:
             if (domain := get_domain(url)) != "":
-                if domain not in self.__domain_info:
-                    self.__domain_info[domain] = (
-                        CoolDownDomain(self.__mpc, domain),
-                        RobotsTxt(url, self.__mpc),
-                    )
+                # the service refreshes expired robots.txt rules
+                robots_txt = self.__robots.get(url)
+                if (info := self.__domain_info.get(domain)) is None:
+                    cool_down = CoolDownDomain(self.__mpc, domain)
+                else:
+                    cool_down, _ = info
+                self.__domain_info[domain] = (cool_down, robots_txt)
                 closed_domain[domain] = self.__domain_info[domain]
         return closed_domain
 
-    async def __get_next_result(self) -> VerifiedURL | None:
-        try:
-            result = self.__res.get_nowait()
-        except Empty:
-            return None
-        else:
-            return result
+    def prefetch_robots(self, workload: Iterable[TaskPackage], /) -> None:
+        self.__robots.prefetch(url for task in workload for _, url, *_ in task)
 
-    async def __put_next_request(self, request: _ARGS_T, /) -> bool:
+    async def __put_next_request(self, worker: int, request: _ARGS_T, /) -> bool:
         try:
-            self.__req.put_nowait(request)
+            self.__req[worker].put_nowait(request)
         except Full:
             return False
         else:
             return True
 
+    def __next_eligible(self, domain: str, last: float | None, /) -> float:
+        if (info := self.__domain_info.get(domain)) is None:
+            return 0.0
+        cool_down, robots_txt = info
+        delay = robots_txt.get_delay()
+        eligible = cool_down.next_request_at(delay)
+        if last is not None:
+            eligible = max(eligible, last + get_cool_down_sec(delay))
+        return eligible
+
+    async def __dispatch(
+        self,
+        deques: WorkStealingDeques[_ARGS_T],
+        idle: set[int],
+        usage: _WorkerUsage,
+        /,
+    ) -> None:
+        # idle owners take their own tasks first, the remaining idle workers steal
+        for take in (deques.pop_own, deques.steal):
+            for worker in sorted(idle):
+                if (task := take(worker)) is None:
+                    continue
+                domain, request = task
+                if not await self.__put_next_request(worker, request):
+                    deques.requeue(worker, domain, request)
+                    continue
+                idle.discard(worker)
+                deques.started(worker, domain)
+                usage.started()
+
+    def __wait_time(
+        self, scheduler: DomainScheduler[_ARGS_T], idle: set[int], /
+    ) -> float | None:
+        # with an idle worker wake up for the next eligible domain,
+        # domains in flight wait for the result of their worker
+        if len(idle) == 0:
+            return None
+        if (eligible := scheduler.next_eligible(self.__idle_domain)) is None:
+            return None
+        return max(0.0, eligible - time.time())
+
+    def __idle_domain(self, domain: str, /) -> bool:
+        return not self.__deques.in_flight(domain)
+
+    async def __release(
+        self,
+        scheduler: DomainScheduler[_ARGS_T],
+        idle: set[int],
+        usage: _WorkerUsage,
+        /,
+    ) -> None:
+        deques = self.__deques
+        await self.__dispatch(deques, idle, usage)
+        # a task leaves the scheduler only if an idle worker can take it right away,
+        # so the scheduler records the actual dispatch time of the domain,
+        # idle owners get their domains first, the remaining idle workers steal
+        for accept in (lambda dom: deques.owned_by(dom, idle), self.__idle_domain):
+            while len(deques) < len(idle):
+                if (ready := scheduler.pop_ready(None, accept)) is None:
+                    break
+                deques.push(*ready)
+            await self.__dispatch(deques, idle, usage)
+
+    def __schedule(
+        self, scheduler: DomainScheduler[_ARGS_T], task: TaskPackage, /
+    ) -> None:
+        sub_domains = self.__create_sub_domain(task)
+        scheduler.add(next(iter(sub_domains), ""), (task, sub_domains))
+
     async def verify_url(
         self, workload: list[TaskPackage], /
     ) -> AsyncGenerator[VerifiedURL, TaskPackage | None]:
-        results_cnt: int = 0
-        task_package_cnt = len(workload)
-        tasks: list[TaskPackage] = [task for task in workload]
-        while (task_cnt := len(tasks)) > 0 or task_package_cnt > results_cnt:
-            buffered = 0
-            while task_cnt > 0 and buffered < len(self.__worker):
-                buffered += 1
-                *_, task = tasks
-                if not self.__req.full() and await self.__put_next_request(
-                    (task, self.__create_sub_domain(task))
-                ):
-                    tasks.pop()
-                    task_cnt -= 1
-                else:
-                    break
+        scheduler: DomainScheduler[_ARGS_T] = DomainScheduler(self.__next_eligible)
+        self.prefetch_robots(workload)
+        for task in workload:
+            self.__schedule(scheduler, task)
+        usage = _WorkerUsage(len(self.__worker))
+        deques = self.__deques
+        idle = set(range(len(self.__worker)))
+        bridge = _ResultBridge(self.__res)
+        try:
+            while len(scheduler) > 0 or len(deques) > 0 or usage.busy > 0:
+                await self.__release(scheduler, idle, usage)
 
-            if (result := await self.__get_next_result()) is not None:
-                results_cnt += 1
-                task_send = yield result
-                if task_send is not None:
-                    task_package_cnt += 1
-                    tasks.append(task_send)
+                wait = self.__wait_time(scheduler, idle)
+                if (finished := await bridge.get(wait)) is not None:
+                    worker, result = finished
+                    idle.add(worker)
+                    deques.finished(worker)
+                    usage.finished()
+                    task_send = yield result
+                    if task_send is not None:
+                        self.__schedule(scheduler, task_send)
+        finally:
+            bridge.close()
+        usage.report()
 
     def close(self) -> None:
+        self.__robots.close()
         self.__finish.value = True
         for pro in self.__worker:
             pro.join()
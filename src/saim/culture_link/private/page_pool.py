@@ -0,0 +1,160 @@
+from collections import deque
+from typing import Final, final
+
+from playwright.async_api import BrowserContext, Error, Page, Route, Request
+
+from saim.culture_link.private.robots_txt import get_user_agent
+from saim.shared.misc.metrics import METRICS
+
+BLOCK_TYPES: Final[list[str]] = [
+    "image",
+    "media",
+    "font",
+    "ping",
+    "manifest",
+    "prefetch",
+]
+_BLANK: Final[str] = "about:blank"
+
+
+async def _block_resources(route: Route, req: Request, /) -> None:
+    if req.resource_type in BLOCK_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+@final
+class PooledPage:
+    __slots__ = ("__crashed", "__page", "__uses")
+
+    def __init__(self, page: Page, /) -> None:
+        self.__page = page
+        self.__uses = 0
+        self.__crashed = False
+        page.on("crash", lambda _: self.__mark_crashed())
+        super().__init__()
+
+    def __mark_crashed(self) -> None:
+        self.__crashed = True
+
+    @property
+    def page(self) -> Page:
+        return self.__page
+
+    @property
+    def uses(self) -> int:
+        return self.__uses
+
+    @property
+    def usable(self) -> bool:
+        return not (self.__crashed or self.__page.is_closed())
+
+    def used(self) -> None:
+        self.__uses += 1
+
+
+@final
+class PagePool:
+    """Pool of browser pages with resource routing and headers set up once.
+
+    Released pages are reset to a blank page and reused,
+    they are replaced after a maximum number of uses or when they crashed.
+    At most `size` idle pages are kept.
+    """
+
+    __slots__ = (
+        "__browser",
+        "__busy",
+        "__contact",
+        "__idle",
+        "__max_uses",
+        "__size",
+        "__stats",
+    )
+
+    def __init__(
+        self, browser: BrowserContext, contact: str, size: int, max_uses: int, /
+    ) -> None:
+        self.__browser = browser
+        self.__contact = contact
+        self.__size = max(1, size)
+        self.__max_uses = max(1, max_uses)
+        self.__idle: deque[PooledPage] = deque()
+        self.__busy = 0
+        self.__stats: dict[str, int] = {
+            "created": 0,
+            "acquired": 0,
+            "reused": 0,
+            "replaced": 0,
+            "peak_busy": 0,
+        }
+        super().__init__()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"size": self.__size, "idle": len(self.__idle), **self.__stats}
+
+    def __count(self, name: str, /) -> None:
+        self.__stats[name] += 1
+        METRICS.count(f"browser.page_{name}")
+
+    async def __create(self) -> PooledPage:
+        with METRICS.timer("browser.new_page"):
+            page = await self.__browser.new_page()
+            await page.route("**/*", _block_resources)
+            page.on("console", lambda _: None)
+            await page.set_extra_http_headers(
+                {"User-Agent": get_user_agent(self.__contact)}
+            )
+        self.__count("created")
+        return PooledPage(page)
+
+    async def warm_up(self) -> None:
+        while len(self.__idle) < self.__size:
+            self.__idle.append(await self.__create())
+
+    async def acquire(self) -> PooledPage:
+        pooled: PooledPage | None = None
+        while pooled is None and len(self.__idle) > 0:
+            if (cand := self.__idle.pop()).usable:
+                pooled = cand
+                self.__count("reused")
+            else:
+                self.__count("replaced")
+                await self.__discard(cand)
+        if pooled is None:
+            pooled = await self.__create()
+        self.__count("acquired")
+        self.__busy += 1
+        self.__stats["peak_busy"] = max(self.__stats["peak_busy"], self.__busy)
+        return pooled
+
+    async def __discard(self, pooled: PooledPage, /) -> None:
+        if not pooled.page.is_closed():
+            try:
+                await pooled.page.close()
+            except Error:
+                pass
+
+    async def release(self, pooled: PooledPage, /) -> None:
+        self.__busy -= 1
+        pooled.used()
+        if not pooled.usable or pooled.uses >= self.__max_uses:
+            self.__count("replaced")
+            await self.__discard(pooled)
+            return None
+        if len(self.__idle) >= self.__size:
+            await self.__discard(pooled)
+            return None
+        try:
+            await pooled.page.goto(_BLANK)
+        except Error:
+            self.__count("replaced")
+            await self.__discard(pooled)
+        else:
+            self.__idle.append(pooled)
+
+    async def close(self) -> None:
+        while len(self.__idle) > 0:
+            await self.__discard(self.__idle.popleft())
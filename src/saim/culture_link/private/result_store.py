@@ -0,0 +1,181 @@
+from dataclasses import dataclass
+from pathlib import Path
+import sqlite3
+import struct
+import time
+from typing import Final, final
+
+from saim.shared.error.exceptions import SessionCreationEx
+from saim.shared.misc.metrics import METRICS
+
+# status, search hit, creation timestamp
+_RECORD: Final[struct.Struct] = struct.Struct("<HBd")
+_DAY_SEC: Final[int] = 86_400
+_BUSY_MSEC: Final[int] = 30_000
+_EVICT_STEP: Final[int] = 256
+_STORED_CODES: Final[frozenset[int]] = frozenset((*range(200, 400), 403, 404))
+_SCHEMA: Final[tuple[str, ...]] = (
+    "CREATE TABLE IF NOT EXISTS results ("
+    "key BLOB PRIMARY KEY, record BLOB NOT NULL,"
+    " expires INTEGER NOT NULL, access INTEGER NOT NULL"
+    ") WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS results_expires ON results (expires)",
+    "CREATE INDEX IF NOT EXISTS results_access ON results (access)",
+)
+
+
+@final
+@dataclass(frozen=True, slots=True, kw_only=True)
+class StoredResult:
+    status: int
+    found: bool
+    created: float
+
+
+def _pack(status: int, found: bool, created: float, /) -> bytes:
+    return _RECORD.pack(status, found, created)
+
+
+def _unpack(record: bytes, /) -> StoredResult:
+    status, found, created = _RECORD.unpack(record)
+    return StoredResult(status=status, found=found == 1, created=created)
+
+
+def is_storable(status: int, /) -> bool:
+    return status in _STORED_CODES
+
+
+@final
+class VerifyResultStore:
+    """Persistent store for link verification results.
+
+    Each worker keeps one connection to a shared SQLite file in WAL mode.
+    Writes and access times are buffered and committed in batches,
+    every batch also evicts a bounded number of expired
+    and least recently used records.
+    """
+
+    __slots__ = (
+        "__con",
+        "__interval",
+        "__last_flush",
+        "__limit",
+        "__pending",
+        "__size_bytes",
+        "__touched",
+    )
+
+    def __init__(
+        self,
+        db_path: Path,
+        size_gb: int,
+        limit: int = 64,
+        interval: float = 5.0,
+        /,
+    ) -> None:
+        if size_gb <= 0:
+            raise SessionCreationEx(f"{size_gb!s} should be at least 1 GB")
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.__con = sqlite3.connect(
+                db_path, timeout=_BUSY_MSEC / 1000, autocommit=True
+            )
+            self.__con.execute("PRAGMA journal_mode=WAL")
+            self.__con.execute("PRAGMA synchronous=NORMAL")
+            self.__con.execute(f"PRAGMA busy_timeout={_BUSY_MSEC}")
+            for statement in _SCHEMA:
+                self.__con.execute(statement)
+        except sqlite3.Error as err:
+            raise SessionCreationEx(f"{err!s}") from err
+        self.__size_bytes = size_gb * 1000**3
+        self.__limit = max(1, limit)
+        self.__interval = interval
+        self.__last_flush = time.monotonic()
+        self.__pending: dict[bytes, tuple[bytes, int, int]] = {}
+        self.__touched: dict[bytes, int] = {}
+        super().__init__()
+
+    def get(self, key: str, /) -> StoredResult | None:
+        bkey = bytes.fromhex(key)
+        now = int(time.time())
+        if (pending := self.__pending.get(bkey)) is not None:
+            record, expires, _ = pending
+        else:
+            row = self.__con.execute(
+                "SELECT record, expires FROM results WHERE key = ?", (bkey,)
+            ).fetchone()
+            if row is None:
+                METRICS.count("store.miss")
+                return None
+            record, expires = row
+        if expires <= now:
+            METRICS.count("store.expired")
+            return None
+        METRICS.count("store.hit")
+        self.__touched[bkey] = now
+        return _unpack(record)
+
+    def put(self, key: str, status: int, found: bool, exp_days: int, /) -> None:
+        if exp_days <= 0:
+            raise SessionCreationEx(f"{exp_days!s} should be at least 1 day")
+        now = time.time()
+        self.__pending[bytes.fromhex(key)] = (
+            _pack(status, found, now),
+            int(now) + exp_days * _DAY_SEC,
+            int(now),
+        )
+        if (
+            len(self.__pending) >= self.__limit
+            or time.monotonic() - self.__last_flush >= self.__interval
+        ):
+            self.flush()
+
+    def __live_size(self) -> int:
+        page_size = self.__con.execute("PRAGMA page_size").fetchone()[0]
+        pages = self.__con.execute("PRAGMA page_count").fetchone()[0]
+        free = self.__con.execute("PRAGMA freelist_count").fetchone()[0]
+        return int(page_size * (pages - free))
+
+    def __evict(self, now: int, /) -> None:
+        self.__con.execute(
+            "DELETE FROM results WHERE key IN"
+            " (SELECT key FROM results WHERE expires <= ? LIMIT ?)",
+            (now, _EVICT_STEP),
+        )
+        if self.__live_size() > self.__size_bytes:
+            METRICS.count("store.evicted_lru")
+            self.__con.execute(
+                "DELETE FROM results WHERE key IN"
+                " (SELECT key FROM results ORDER BY access LIMIT ?)",
+                (_EVICT_STEP,),
+            )
+
+    def flush(self) -> None:
+        pending, self.__pending = self.__pending, {}
+        touched, self.__touched = self.__touched, {}
+        self.__last_flush = time.monotonic()
+        with METRICS.timer("store.flush"):
+            try:
+                self.__con.execute("BEGIN IMMEDIATE")
+                try:
+                    self.__con.executemany(
+                        "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                        ((key, *val) for key, val in pending.items()),
+                    )
+                    self.__con.executemany(
+                        "UPDATE results SET access = ? WHERE key = ?",
+                        ((acc, key) for key, acc in touched.items()),
+                    )
+                    self.__evict(int(time.time()))
+                except sqlite3.Error:
+                    self.__con.execute("ROLLBACK")
+                    raise
+                self.__con.execute("COMMIT")
+            except sqlite3.Error as err:
+                raise SessionCreationEx(f"{err!s}") from err
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self.__con.close()
@@ -1,19 +1,28 @@
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+import json
 import math
-from multiprocessing.context import SpawnContext
+from pathlib import Path
 import time
 from typing import Final, final
+import warnings
 import requests
 from requests import RequestException
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
 from urllib.robotparser import RobotFileParser
 from saim.shared.misc.constants import ENCODING, VERSION
+from saim.shared.misc.metrics import METRICS
 
 from saim.shared.error.exceptions import RequestURIEx
+from saim.shared.error.warnings import RequestWarn
 
 
 BOT_NAME: Final[str] = "saim"
 USER_AGENT: Final[str] = f"{BOT_NAME}-bot/{VERSION}"
 ROB_EXP_SEC: Final[int] = 86400
+_ROB_FILE: Final[str] = "robots_txt.json"
 
 
 def get_user_agent(contact: str, /) -> str:
@@ -22,63 +31,57 @@ def get_user_agent(contact: str, /) -> str:
     return f"{USER_AGENT} (Python library; {contact})"
 
 
+def create_robots_url(url: str, /) -> str:
+    url_loc = urlparse(url)
+    if (
+        url_loc.hostname is None
+        or url_loc.hostname == ""
+        or url_loc.scheme not in ["http", "https"]
+    ):
+        raise RequestURIEx(f"Wrong URL format: {url} -  expected http(s)://route")
+    return f"{url_loc.scheme}://{url_loc.netloc}/robots.txt"
+
+
 @final
-class RobotsTxt:
-    __slots__: tuple[str, ...] = (
-        "__active",
-        "__lock",
-        "__modified",
-        "__parser",
-        "__robots_txt",
-        "__url",
-    )
+@dataclass(frozen=True, slots=True, kw_only=True)
+class RobotsRecord:
+    url: str
+    active: bool
+    text: str
+    fetched: float
 
-    def __init__(self, url: str, mpc: SpawnContext, /) -> None:
-        url_loc = urlparse(url)
-        if (
-            url_loc.hostname is None
-            or url_loc.hostname == ""
-            or url_loc.scheme not in ["http", "https"]
-        ):
-            raise RequestURIEx(f"Wrong URL format: {url} -  expected http(s)://route")
-        self.__url = f"{url_loc.scheme}://{url_loc.netloc}/robots.txt"
-        manager = mpc.Manager()
-        self.__active = manager.Value("b", True)
-        self.__modified = manager.Value("d", 0.0)
-        self.__robots_txt = manager.Value("b", b"")
-        self.__lock = manager.RLock()
-        self.__update()
-        super().__init__()
+    @property
+    def expired(self) -> bool:
+        return time.time() - self.fetched > ROB_EXP_SEC
 
-    def __fetch_robots_txt(self) -> None:
-        with self.__lock:
-            try:
-                res = requests.get(self.__url, timeout=10)
-                self.__active.value = res.status_code == 200
-                if res.status_code == 200:
-                    self.__robots_txt.value = res.text.encode(ENCODING)
-            except RequestException:
-                self.__active.value = False
-            self.__modified.value = time.time()
-
-    def __update(self) -> None:
-        with self.__lock:
-            update_dif = time.time() - self.__modified.value
-            self.__parser = RobotFileParser()
-            if self.__modified.value == 0 or update_dif > ROB_EXP_SEC:
-                self.__fetch_robots_txt()
-            self.__parser.parse(self.__robots_txt.value.decode(ENCODING).split("\n"))
 
-    def can_fetch(self, url: str, /) -> bool:
-        if not self.__active.value:
-            return True
-        self.__update()
-        return self.__parser.can_fetch(BOT_NAME, url)
+def _fetch_robots_record(session: requests.Session, url: str, /) -> RobotsRecord:
+    active, text = False, ""
+    try:
+        with METRICS.timer("robots.fetch"):
+            res = session.get(url, timeout=10)
+        active = res.status_code == 200
+        if active:
+            text = res.content.decode(ENCODING, errors="replace")
+    except RequestException:
+        active = False
+    return RobotsRecord(url=url, active=active, text=text, fetched=time.time())
 
-    def get_delay(self) -> int:
-        if not self.__active.value:
+
+@final
+class RobotsTxt:
+    __slots__: tuple[str, ...] = ("__active", "__delay", "__parser")
+
+    def __init__(self, record: RobotsRecord, /) -> None:
+        self.__active = record.active
+        self.__parser = RobotFileParser()
+        self.__parser.parse(record.text.split("\n"))
+        self.__delay = self.__parse_delay()
+        super().__init__()
+
+    def __parse_delay(self) -> int:
+        if not self.__active:
             return 0
-        self.__update()
         delay = self.__parser.crawl_delay(BOT_NAME)
         if (isinstance(delay, int) or (isinstance(delay, str) and delay.isdigit())) and (
             del_int := int(delay)
@@ -88,3 +91,108 @@ class RobotsTxt:
         if request_rate is not None:
             return math.ceil(request_rate.seconds / request_rate.requests)
         return 0
+
+    def can_fetch(self, url: str, /) -> bool:
+        if not self.__active:
+            return True
+        return self.__parser.can_fetch(BOT_NAME, url)
+
+    def get_delay(self) -> int:
+        return self.__delay
+
+
+@final
+class RobotsService:
+    """Parsed robots.txt rules per domain.
+
+    The raw files are persisted with their fetch time in the work directory,
+    entries older than `ROB_EXP_SEC` are fetched again.
+    """
+
+    __slots__: tuple[str, ...] = (
+        "__file",
+        "__modified",
+        "__records",
+        "__robots",
+        "__session",
+        "__workers",
+    )
+
+    def __init__(self, work_dir: Path, workers: int = 8, /) -> None:
+        self.__file = work_dir.joinpath(_ROB_FILE)
+        self.__workers = max(1, workers)
+        self.__session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.__workers, pool_maxsize=self.__workers
+        )
+        self.__session.mount("http://", adapter)
+        self.__session.mount("https://", adapter)
+        self.__records: dict[str, RobotsRecord] = self.__load()
+        self.__robots: dict[str, RobotsTxt] = {}
+        self.__modified = False
+        super().__init__()
+
+    def __load(self) -> dict[str, RobotsRecord]:
+        if not self.__file.is_file():
+            return {}
+        try:
+            with self.__file.open("r", encoding=ENCODING) as fhd:
+                records = [RobotsRecord(**rec) for rec in json.load(fhd)]
+        except (OSError, ValueError, TypeError) as exc:
+            warnings.warn(
+                f"[ROBOTS] could not read {self.__file!s} - {exc!s}",
+                RequestWarn,
+                stacklevel=2,
+            )
+            return {}
+        return {rec.url: rec for rec in records if not rec.expired}
+
+    def __is_fresh(self, robots_url: str, /) -> bool:
+        return (rec := self.__records.get(robots_url)) is not None and not rec.expired
+
+    def __add(self, record: RobotsRecord, /) -> None:
+        self.__records[record.url] = record
+        self.__robots.pop(record.url, None)
+        self.__modified = True
+
+    def prefetch(self, urls: Iterable[str], /) -> None:
+        to_fetch: set[str] = set()
+        for url in urls:
+            try:
+                robots_url = create_robots_url(url)
+            except RequestURIEx:
+                continue
+            if not self.__is_fresh(robots_url):
+                to_fetch.add(robots_url)
+        if len(to_fetch) == 0:
+            return None
+        with ThreadPoolExecutor(max_workers=self.__workers) as pool:
+            for record in pool.map(
+                lambda rob_url: _fetch_robots_record(self.__session, rob_url),
+                sorted(to_fetch),
+            ):
+                self.__add(record)
+        self.save()
+
+    def get(self, url: str, /) -> RobotsTxt:
+        robots_url = create_robots_url(url)
+        if not self.__is_fresh(robots_url):
+            self.__add(_fetch_robots_record(self.__session, robots_url))
+        if (robots := self.__robots.get(robots_url)) is None:
+            robots = RobotsTxt(self.__records[robots_url])
+            self.__robots[robots_url] = robots
+        return robots
+
+    def save(self) -> None:
+        if not self.__modified:
+            return None
+        self.__file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.__file.with_suffix(".tmp")
+        with tmp_file.open("w", encoding=ENCODING) as fhd:
+            json.dump([asdict(rec) for rec in self.__records.values()], fhd)
+        tmp_file.replace(self.__file)
+        self.__modified = False
+
+    def close(self) -> None:
+        self.save()
+        self.__session.close()
@@ -0,0 +1,95 @@
+from collections import deque
+from collections.abc import Callable
+import heapq
+import time
+from typing import final
+
+
+@final
+class DomainScheduler[T]:
+    """Per-domain task queues ordered by the time each domain becomes eligible.
+
+    The eligibility of a domain is provided by a callable, which receives the domain
+    and the time of its last dispatch, or None if it has not been dispatched yet.
+    """
+
+    __slots__ = ("__eligible", "__heap", "__last", "__pending", "__queues", "__seq")
+
+    def __init__(self, eligible: Callable[[str, float | None], float], /) -> None:
+        self.__eligible = eligible
+        self.__queues: dict[str, deque[T]] = {}
+        # eligible time, insertion order, domain
+        self.__heap: list[tuple[float, int, str]] = []
+        self.__last: dict[str, float] = {}
+        self.__seq = 0
+        self.__pending = 0
+        super().__init__()
+
+    def __len__(self) -> int:
+        return self.__pending
+
+    def __schedule(self, domain: str, /) -> None:
+        self.__seq += 1
+        eligible = self.__eligible(domain, self.__last.get(domain))
+        heapq.heappush(self.__heap, (eligible, self.__seq, domain))
+
+    def add(self, domain: str, task: T, /) -> None:
+        self.__pending += 1
+        if (queue := self.__queues.get(domain)) is not None:
+            queue.append(task)
+            return None
+        self.__queues[domain] = deque((task,))
+        self.__schedule(domain)
+
+    def requeue(self, domain: str, task: T, /) -> None:
+        """Puts back a task that could not be handed to a worker."""
+        self.__pending += 1
+        if (queue := self.__queues.get(domain)) is not None:
+            queue.appendleft(task)
+            return None
+        self.__queues[domain] = deque((task,))
+        self.__schedule(domain)
+
+    def next_eligible(
+        self, accept: Callable[[str], bool] | None = None, /
+    ) -> float | None:
+        """The earliest eligible time of the domains passing `accept`."""
+        if len(self.__heap) == 0:
+            return None
+        if accept is None or accept(self.__heap[0][2]):
+            return self.__heap[0][0]
+        return min(
+            (eligible for eligible, _, domain in self.__heap if accept(domain)),
+            default=None,
+        )
+
+    def pop_ready(
+        self, now: float | None = None, accept: Callable[[str], bool] | None = None, /
+    ) -> tuple[str, T] | None:
+        """Pops the next task of an eligible domain passing `accept`.
+
+        The time of the pop counts as the dispatch of the domain,
+        so only tasks which are handed to a worker right away should be popped.
+        """
+        now = time.time() if now is None else now
+        skipped: list[tuple[float, int, str]] = []
+        ready = None
+        while len(self.__heap) > 0 and self.__heap[0][0] <= now:
+            entry = heapq.heappop(self.__heap)
+            if accept is None or accept(entry[2]):
+                ready = entry[2]
+                break
+            skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(self.__heap, entry)
+        if ready is None:
+            return None
+        queue = self.__queues[ready]
+        task = queue.popleft()
+        self.__pending -= 1
+        self.__last[ready] = now
+        if len(queue) > 0:
+            self.__schedule(ready)
+        else:
+            del self.__queues[ready]
+        return ready, task
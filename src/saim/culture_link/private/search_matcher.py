@@ -0,0 +1,121 @@
+import re
+from re import Pattern
+from typing import Final, final
+
+from saim.designation.extract_ccno import DEF_SUF_RM
+from saim.shared.data_con.designation import CCNoDes
+from saim.shared.misc.constants import ENCODING
+
+_WSP: Final[Pattern[str]] = re.compile(r"\s+")
+_SEP: Final[str] = r"(?:\W+|$)?"
+_END: Final[str] = r"(?:\W|$)"
+# marks a match ending at the end of the confirmed text, which may be cut
+_END_CUT: Final[str] = r"(?:\W|(?P<cut>\Z))"
+# longest utf-8 sequence, enough to decode the character after a hit
+_MAX_CHAR: Final[int] = 4
+
+
+def _case_variants(char: str, /) -> list[str]:
+    return sorted({char, char.lower(), char.upper()})
+
+
+def _escape(text: str, /) -> str:
+    # ascii letters are folded by the pattern flag, bytes patterns ignore the rest
+    return "".join(
+        re.escape(char)
+        if char.isascii()
+        else "(?:" + "|".join(map(re.escape, _case_variants(char))) + ")"
+        for char in text
+    )
+
+
+def _escape_class(chars: str, /) -> str:
+    return "".join(
+        re.escape(var)
+        for char in sorted(set(chars))
+        for var in (_case_variants(char) if not char.isascii() else [char])
+        if len(var) == 1
+    )
+
+
+def _compile(pattern: str, /) -> Pattern[bytes]:
+    return re.compile(pattern.encode(ENCODING), re.IGNORECASE)
+
+
+def _create_ccno_pattern(ccno: CCNoDes, end: str, /) -> str:
+    # the optional acronym and leading zeros do not change whether a match exists,
+    # leaving them out lets the search skip ahead to the literal id
+    suffix = ccno.id.suf.upper() + "".join(suf.upper() for suf in DEF_SUF_RM)
+    core = _escape(ccno.id.core.upper())
+    if ccno.id.pre != "":
+        core = _escape(ccno.id.pre.upper()) + _SEP + r"0*" + core
+    return (
+        core
+        + _SEP
+        + r"["
+        + _escape_class(suffix)
+        + r"]{"
+        + f"{len(ccno.id.suf)}"
+        + r",}"
+        + end
+    )
+
+
+def _create_word_patterns(extra: list[str], /) -> tuple[Pattern[bytes], ...]:
+    words = {
+        _WSP.sub(" ", word).upper()
+        for task in extra
+        for word in task.split(" ")
+        if word.strip() != ""
+    }
+    return tuple(_compile(_escape(word)) for word in sorted(words))
+
+
+@final
+class SearchMatcher:
+    """Precompiled case-insensitive search for a CCNo and its extra strings.
+
+    The patterns run directly on the encoded page,
+    so no decoded or upper-cased copy of the page is created.
+    Each pattern stops at its first hit.
+    A bytes pattern treats every non-ascii byte as a non-word character,
+    so a CCNo hit is confirmed on its decoded text with the str pattern.
+    """
+
+    __slots__ = ("__ccno", "__ccno_str", "__words")
+
+    def __init__(self, ccno: CCNoDes, extra: list[str], /) -> None:
+        self.__ccno = _compile(_create_ccno_pattern(ccno, _END))
+        self.__ccno_str = re.compile(_create_ccno_pattern(ccno, _END_CUT), re.IGNORECASE)
+        self.__words = _create_word_patterns(extra)
+        super().__init__()
+
+    @property
+    def patterns(self) -> tuple[str, ...]:
+        # the sources are also valid case-insensitive javascript patterns
+        return tuple(pat.pattern.decode(ENCODING) for pat in (self.__ccno, *self.__words))
+
+    def __confirm(self, content: bytes, start: int, end: int, /) -> bool:
+        # the end of a cut text is no word boundary,
+        # so the text grows until the match ends before the cut or at the page end
+        while True:
+            text = content[start:end].decode(ENCODING, errors="ignore")
+            if (found := self.__ccno_str.match(text)) is None:
+                return False
+            if found.group("cut") is None or end >= len(content):
+                return True
+            end += max(end - start, _MAX_CHAR)
+
+    def has_ccno(self, content: bytes, /) -> bool:
+        pos = 0
+        while (hit := self.__ccno.search(content, pos)) is not None:
+            if self.__confirm(content, hit.start(), hit.end() + _MAX_CHAR):
+                return True
+            pos = hit.start() + 1
+        return False
+
+    def has_extra(self, content: bytes, /) -> bool:
+        return all(word.search(content) is not None for word in self.__words)
+
+    def search(self, content: bytes, /) -> bool:
+        return self.has_ccno(content) and self.has_extra(content)
@@ -1,22 +1,13 @@
 import atexit
-import copy
 from dataclasses import dataclass
 from hashlib import sha256
 from multiprocessing.queues import Queue
 from pathlib import Path
 from queue import Empty
-from re import Pattern
-import re
 from typing import Any, Final, Protocol, TypeAlias, final
 import warnings
-from requests import Response
-from requests_cache import (
-    PreparedRequest,
-    SerializerPipeline,
-    Stage,
-    create_key,
-    yaml_serializer,
-)
+from requests import Request
+from requests_cache import PreparedRequest, create_key
 from saim.culture_link.private.cached_session import (
     BrowserPWAdapter,
     PWContext,
@@ -32,14 +23,16 @@ from saim.culture_link.private.container import (
     VerifiedURL,
 )
 from saim.culture_link.private.cool_down import CoolDownDomain
+from saim.culture_link.private.result_store import (
+    StoredResult,
+    VerifyResultStore,
+    is_storable,
+)
 from saim.culture_link.private.robots_txt import RobotsTxt
-from saim.designation.extract_ccno import DEF_SUF_RM
-from saim.shared.cache.request import create_sqlite_backend
-from saim.shared.misc.constants import ENCODING
-from saim.shared.data_con.designation import CCNoDes
+from saim.shared.misc.metrics import METRICS
 from saim.shared.error.exceptions import KnownException
 from saim.shared.parse.http_url import get_domain
-from saim.shared.error.warnings import ClosureWarn, ValidationWarn
+from saim.shared.error.warnings import ValidationWarn
 
 
 def _wrap_status(
@@ -64,8 +57,10 @@ def _wrap_status(
 
 _REQ: TypeAlias = dict[str, tuple[CoolDownDomain, RobotsTxt]]
 _ARGS_T: TypeAlias = tuple[TaskPackage, _REQ]
-_ARGS_ST: TypeAlias = tuple[TaskPackage, _REQ, int, Path, BrowserPWAdapter | None, str]
-_WSP: Final[Pattern[str]] = re.compile(r"\s+")
+_ARGS_ST: TypeAlias = tuple[
+    TaskPackage, _REQ, VerifyResultStore, BrowserPWAdapter | None, str
+]
+_STORE_NAME: Final[str] = "verify_ccno_results.sqlite"
 
 
 @final
@@ -75,104 +70,24 @@ class SessionSettings:
     url: str
     name: str
     exp_days: int
-    db_size_gb: int
-    work_dir: Path
     contact: str
 
 
-def _is_string_in_text(text: str, to_find: list[str], /) -> bool:
-    for task in to_find:
-        for word in task.split(" "):
-            if (
-                word.strip() != ""
-                and re.compile(re.escape(_WSP.sub(" ", word).upper())).search(text)
-                is None
-            ):
-                return False
-    return True
-
-
-def _is_ccno_in_text(text: str, to_find: CCNoDes, /) -> bool:
-    return (
-        re.compile(
-            r"(?:\W+|$)?".join(
-                [
-                    r"(?:" + re.escape(to_find.acr.upper()) + r")?",
-                    re.escape(to_find.id.pre.upper()),
-                    r"0*" + re.escape(to_find.id.core.upper()),
-                    r"["
-                    + "".join(re.escape(suf) for suf in to_find.id.suf.upper())
-                    + "".join(
-                        set(
-                            re.escape(suf.upper())
-                            for suf_con in DEF_SUF_RM
-                            for suf in suf_con
-                        )
-                    )
-                    + r"]{"
-                    + f"{len(to_find.id.suf)}"
-                    + r",}",
-                ]
-            )
-            + r"(?:\W|$)"
-        ).search(text)
-        is not None
-    )
-
-
-def _find_elements_in_content(content: bytes, sea_task: SearchTask, /) -> bool:
-    upper_text = content.decode(encoding=ENCODING).upper()
-    if not _is_ccno_in_text(upper_text, sea_task.find_ccno):
-        return False
-    if not _is_string_in_text(upper_text, sea_task.find_extra):
-        return False
-    return True
-
-
-def _serialize_results(
-    resp: Response, sea_task: SearchTask, skip_search: bool, /
-) -> Response:
-    c_resp: Response = copy.copy(resp)
-    if 200 <= c_resp.status_code < 400 and skip_search:
-        c_resp._content = "ONLY PINGED".encode(ENCODING)
-        return c_resp
-    if 200 <= c_resp.status_code < 400 and _find_elements_in_content(
-        c_resp.content, sea_task
-    ):
-        extra = " - ".join(sea_task.extra_key)
-        sea_res = f"{sea_task.ccno_key} - {extra}"
-        c_resp._content = sea_res.encode(ENCODING)
-        return c_resp
-    c_resp._content = b""
-    return c_resp
-
-
-def _prepare_result_cached(
-    link: str, resp: CachedPageResp, sea_task: SearchTask, skip_search: bool, /
+def _prepare_result_stored(
+    link: str, stored: StoredResult, sea_task: SearchTask, /
 ) -> LinkResult | None:
-    if resp.status < 200 or resp.status >= 400:
+    if stored.status < 200 or stored.status >= 400 or not stored.found:
         return None
-    if not skip_search:
-        content = resp.response.decode(ENCODING)
-        if sea_task.ccno_key not in content:
-            return None
-        for sea_ext in sea_task.extra_key:
-            if sea_ext not in content:
-                return None
     return LinkResult(link=link, brc_id=sea_task.brc_id, found_ccno=sea_task.find_ccno)
 
 
 def _prepare_result_raw(
-    link: str, resp: CachedPageResp, sea_task: SearchTask, skip_search: bool, /
+    link: str, resp: CachedPageResp, task: TaskPackage, skip_search: bool, /
 ) -> LinkResult | None:
     if resp.status < 200 or resp.status >= 400:
         return None
-    warnings.warn(
-        f"[SERIALIZATION] {link} - was parsed without removing its content!",
-        ClosureWarn,
-        stacklevel=2,
-    )
-    if skip_search or _find_elements_in_content(resp.response, sea_task):
+    if skip_search or task.matcher.search(resp.response):
+        sea_task = task.search_task
         return LinkResult(
             link=link, brc_id=sea_task.brc_id, found_ccno=sea_task.find_ccno
         )
@@ -190,65 +105,59 @@ def _create_custom_key(
     return key.hexdigest()
 
 
+def _create_result_key(url: str, sea_task: SearchTask, skip_search: bool, /) -> str:
+    request = Request("GET", url).prepare()
+    if skip_search:
+        return create_key(request)
+    return _create_custom_key(sea_task, request)
+
+
 def _get_result(
     settings: SessionSettings,
+    store: VerifyResultStore,
     domain: tuple[CoolDownDomain, RobotsTxt],
-    sea_task: SearchTask,
+    task: TaskPackage,
     tasks_cnt: int,
     /,
 ) -> tuple[CachedPageResp, LinkResult | None]:
+    sea_task = task.search_task
     skip_search = settings.name == str(CacheNames.hom.value)
-    buffered: bytes = b""
-    closure: bool = False
-
-    def wrap_ser_f(response: Response) -> Response:
-        nonlocal buffered
-        nonlocal closure
-        serialized = _serialize_results(response, sea_task, skip_search)
-        if isinstance(serialized.content, bytes):
-            buffered = serialized.content
-            closure = True
-        return serialized
-
-    def wrap_key_f(request: PreparedRequest, **kwargs: Any) -> str:
-        if skip_search:
-            return create_key(request, **kwargs)
-        return _create_custom_key(sea_task, request, **kwargs)
-
-    custom_ser_p = SerializerPipeline(
-        [
-            Stage(dumps=wrap_ser_f, loads=lambda resp: resp),
-            *yaml_serializer.stages,
-        ],
-        name="yaml_slim",
-        is_binary=False,
-    )
-    backend = create_sqlite_backend(
-        f"verify_ccno_{settings.name}", settings.work_dir, custom_ser_p
-    )(settings.db_size_gb, settings.exp_days)
+    key = _create_result_key(settings.url, sea_task, skip_search)
+    if (stored := store.get(key)) is not None:
+        METRICS.count("link.cached")
+        return (
+            CachedPageResp(status=stored.status),
+            _prepare_result_stored(settings.url, stored, sea_task),
+        )
+    settings.pw_adapter.set_search_patterns(() if skip_search else task.matcher.patterns)
     resp = make_get_request(
-        settings.url,
-        (settings.pw_adapter, settings.exp_days, backend, wrap_key_f),
-        (*domain, settings.contact),
-        tasks_cnt,
+        settings.url, settings.pw_adapter, (*domain, settings.contact), tasks_cnt
     )
-    if not resp.cached and closure:
-        resp = CachedPageResp.change_to_cached_content(resp, buffered)
-    if resp.cached:
-        return resp, _prepare_result_cached(settings.url, resp, sea_task, skip_search)
-    return resp, _prepare_result_raw(settings.url, resp, sea_task, skip_search)
+    with METRICS.timer("link.search"):
+        result = _prepare_result_raw(settings.url, resp, task, skip_search)
+    if not (resp.timeout or resp.prohibited) and is_storable(resp.status):
+        store.put(key, resp.status, result is not None, settings.exp_days)
+    return resp, result
 
 
 def _create_pw_adapter(
-    adapter: BrowserPWAdapter | None, contact: str, /
+    adapter: BrowserPWAdapter | None, contact: str, pool_size: int = 1, /
 ) -> BrowserPWAdapter:
     if adapter is not None:
         return adapter
-    return BrowserPWAdapter(PWContext(2), contact, 3)
+    return BrowserPWAdapter(PWContext(2), contact, 3, pool_size)
+
+
+def _create_result_store(
+    store: VerifyResultStore | None, folder: Path, size: int, /
+) -> VerifyResultStore:
+    if store is not None:
+        return store
+    return VerifyResultStore(folder.joinpath(_STORE_NAME), size)
 
 
 def verify_ccno_in_url(args: _ARGS_ST, /) -> VerifiedURL:
-    task, cool_down, size, folder, pwa, contact = args
+    task, cool_down, store, pwa, contact = args
     status = []
     try:
         for url_typ, url, name, exp in task:
@@ -261,12 +170,11 @@ def verify_ccno_in_url(args: _ARGS_ST, /) -> VerifiedURL:
                     url,
                     name,
                     exp,
-                    size,
-                    folder,
                     contact,
                 ),
+                store,
                 domain,
-                task.search_task,
+                task,
                 len(task.urls),
             )
             status.append(
@@ -304,45 +212,59 @@ class VerifyCcNosProc:
         "__contact",
         "__finish",
         "__folder",
+        "__pool_size",
         "__pw_adapter",
         "__read",
         "__size",
+        "__store",
+        "__worker_id",
         "__write",
     )
 
     def __init__(
         self,
         read: Queue[_ARGS_T],
-        write: Queue[VerifiedURL],
+        write: Queue[tuple[int, VerifiedURL]],
         size: int,
         folder: Path,
         finish: ValueP,
         contact: str,
+        pool_size: int = 1,
+        worker_id: int = 0,
         /,
     ) -> None:
         self.__read: Queue[_ARGS_T] = read
-        self.__write: Queue[VerifiedURL] = write
+        self.__write: Queue[tuple[int, VerifiedURL]] = write
+        self.__worker_id = worker_id
         self.__size = size
         self.__folder = folder
         self.__finish: ValueP = finish
         self.__contact = contact
+        self.__pool_size = pool_size
         self.__pw_adapter: BrowserPWAdapter | None = None
+        self.__store: VerifyResultStore | None = None
         atexit.register(lambda: self.close())
         super().__init__()
 
     @property
     def _pw_adapter(self) -> BrowserPWAdapter:
-        self.__pw_adapter = _create_pw_adapter(self.__pw_adapter, self.__contact)
+        self.__pw_adapter = _create_pw_adapter(
+            self.__pw_adapter, self.__contact, self.__pool_size
+        )
         return self.__pw_adapter
 
+    @property
+    def _store(self) -> VerifyResultStore:
+        self.__store = _create_result_store(self.__store, self.__folder, self.__size)
+        return self.__store
+
     def __verify_ccno_in_url(self, args: _ARGS_T, /) -> VerifiedURL:
         task, req = args
         return verify_ccno_in_url(
             (
                 task,
                 req,
-                self.__size,
-                self.__folder,
+                self._store,
                 self._pw_adapter,
                 self.__contact,
             )
@@ -357,9 +279,12 @@ class VerifyCcNosProc:
                 pass
             else:
                 result = self.__verify_ccno_in_url(request)
-                self.__write.put(result)
+                self.__write.put((self.__worker_id, result))
 
     def close(self) -> None:
+        if self.__store is not None:
+            self.__store.close()
+            self.__store = None
         if self.__pw_adapter is not None:
             self.__pw_adapter.finish()
             self.__pw_adapter = None
@@ -0,0 +1,122 @@
+from collections import deque
+from collections.abc import Collection
+from typing import final
+
+from saim.shared.misc.metrics import METRICS
+
+
+@final
+class WorkStealingDeques[T]:
+    """Per-worker task queues grouped by domain.
+
+    All tasks of a domain are queued for the worker owning the domain,
+    so its browser context, cookies, and connections are reused.
+    A worker finishes one domain group before it starts the next one.
+    A worker without own tasks steals from the most loaded worker
+    its last domain group together with the domain.
+    Groups are never split and a domain in flight on another worker
+    is not stolen, so one domain is never crawled by two workers at once.
+    Tasks without a domain never count as in flight.
+    """
+
+    __slots__ = ("__groups", "__load", "__owned", "__owner", "__pending", "__running")
+
+    def __init__(self, workers: int, /) -> None:
+        self.__groups: list[dict[str, deque[T]]] = [{} for _ in range(workers)]
+        self.__load = [0] * workers
+        self.__owned = [0] * workers
+        self.__owner: dict[str, int] = {}
+        self.__pending = 0
+        # the domain each worker is crawling, empty if idle
+        self.__running = [""] * workers
+        super().__init__()
+
+    def __len__(self) -> int:
+        return self.__pending
+
+    def __set_owner(self, domain: str, worker: int, /) -> None:
+        if (last := self.__owner.get(domain)) is not None:
+            self.__owned[last] -= 1
+        self.__owner[domain] = worker
+        self.__owned[worker] += 1
+
+    def __add(self, worker: int, domain: str, tasks: deque[T], /) -> None:
+        if (group := self.__groups[worker].get(domain)) is None:
+            self.__groups[worker][domain] = tasks
+        else:
+            group.extend(tasks)
+        self.__load[worker] += len(tasks)
+
+    def in_flight(self, domain: str, worker: int = -1, /) -> bool:
+        """Whether a worker other than `worker` is crawling the domain."""
+        return domain != "" and any(
+            running == domain
+            for wid, running in enumerate(self.__running)
+            if wid != worker
+        )
+
+    def owned_by(self, domain: str, workers: Collection[int], /) -> bool:
+        """Whether the domain is new or owned by one of `workers`."""
+        return (owner := self.__owner.get(domain)) is None or owner in workers
+
+    def started(self, worker: int, domain: str, /) -> None:
+        self.__running[worker] = domain
+
+    def finished(self, worker: int, /) -> None:
+        self.__running[worker] = ""
+
+    def owner(self, domain: str, /) -> int:
+        if (worker := self.__owner.get(domain)) is None:
+            worker = min(
+                range(len(self.__groups)),
+                key=lambda wid: (self.__load[wid], self.__owned[wid]),
+            )
+            self.__set_owner(domain, worker)
+        return worker
+
+    def push(self, domain: str, task: T, /) -> int:
+        worker = self.owner(domain)
+        self.__add(worker, domain, deque((task,)))
+        self.__pending += 1
+        return worker
+
+    def requeue(self, worker: int, domain: str, task: T, /) -> None:
+        """Puts back a task that could not be handed to the worker."""
+        groups = self.__groups[worker]
+        tasks = groups.pop(domain, deque())
+        tasks.appendleft(task)
+        self.__groups[worker] = {domain: tasks, **groups}
+        self.__load[worker] += 1
+        self.__pending += 1
+
+    def pop_own(self, worker: int, /) -> tuple[str, T] | None:
+        groups = self.__groups[worker]
+        if len(groups) == 0:
+            return None
+        domain = next(iter(groups))
+        tasks = groups[domain]
+        task = tasks.popleft()
+        if len(tasks) == 0:
+            del groups[domain]
+        self.__load[worker] -= 1
+        self.__pending -= 1
+        return domain, task
+
+    def steal(self, worker: int, /) -> tuple[str, T] | None:
+        victims = sorted(
+            (wid for wid in range(len(self.__groups)) if wid != worker),
+            key=lambda wid: self.__load[wid],
+            reverse=True,
+        )
+        for victim in victims:
+            groups = self.__groups[victim]
+            for domain in reversed(groups):
+                if self.in_flight(domain, worker):
+                    continue
+                METRICS.count("culture_link.steal")
+                stolen = groups.pop(domain)
+                self.__set_owner(domain, worker)
+                self.__load[victim] -= len(stolen)
+                self.__add(worker, domain, stolen)
+                return self.pop_own(worker)
+        return None
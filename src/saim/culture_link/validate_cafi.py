@@ -6,7 +6,9 @@ from cafi.library.loader import load_catalogue_db, load_regex_db
 from cafi.container.acr_db import AcrDbEntry
 from cafi.container.links import LinkLevel
 from saim.culture_link.create_links import CcnoLinkGenerator, SearchRequest
+from saim.culture_link.private.journal import ResultJournal
 from saim.designation.manager import AcronymManager
+from saim.shared.error.exceptions import ValidationEx
 
 
 def _create_search_request_homepage(
@@ -44,28 +46,61 @@ def _create_search_request_catalogue(
 
 
 async def _verify_links(
-    linker: CcnoLinkGenerator, link_requests: list[SearchRequest], /
+    linker: CcnoLinkGenerator,
+    link_requests: list[SearchRequest],
+    journal: ResultJournal,
+    /,
 ) -> None:
-    verified_task_ids = set()
-    results = {}
-    async for link in linker.ccno_linking(link_requests):
+    done = journal.completed
+    if len(done) > 0:
+        print(f"RESUME - [{len(done)}/{len(link_requests)}] tasks already done")
+    async for link in linker.ccno_linking(
+        req for req in link_requests if req.task_id not in done
+    ):
         print(f"TASK ID - {link.task_id} - [done]")
-        results[link.task_id] = link
+        journal.append(link)
         if link.result is not None and link.result.link != "":
             print(f"\\-> BRC ID - {link.result.brc_id} - [verified]")
-            verified_task_ids.add(link.task_id)
     print("VERIFICATION FINISHED! printing results --->")
+    brc_ids = {link_req.task_id: link_req.brc_id for link_req in link_requests}
+    for task_id, verified, entry in journal.entries():
+        if not verified:
+            print(f"ERROR: {brc_ids.get(task_id, -1)} - {task_id} - {entry!s}")
+    # requests without a task, e.g. without a link for the CCNo, are not journaled
     for link_req in link_requests:
-        task_id = link_req.task_id
-        if task_id not in verified_task_ids:
-            print(f"ERROR: {link_req.brc_id} - {results.get(task_id, link_req)!s}")
+        if link_req.task_id not in done:
+            print(f"ERROR: {link_req.brc_id} - {link_req.task_id} - {link_req!s}")
     print("<---")
 
 
+def _run_journaled(
+    linker: CcnoLinkGenerator,
+    link_requests: list[SearchRequest],
+    journal_file: Path,
+    resume: bool,
+    /,
+) -> None:
+    journal = ResultJournal(journal_file, resume)
+    try:
+        asyncio.run(_verify_links(linker, link_requests, journal))
+    finally:
+        journal.close()
+
+
 def validate_cafi(
-    version: str, worker: int, db_size: int, output: str, contact: str, /
+    version: str,
+    worker: int,
+    db_size: int,
+    output: str,
+    contact: str,
+    resume: bool = False,
+    /,
 ) -> None:
     if output == "" or not (work_dir := Path(output)).is_dir():
+        if resume:
+            raise ValidationEx(
+                "resuming needs an existing output folder for the journals"
+            )
         tmp = tempfile.TemporaryDirectory()
         atexit.register(lambda: tmp.cleanup())
         work_dir = Path(tmp.name)
@@ -79,11 +114,17 @@ def validate_cafi(
         db_size,
     )
     print("VERIFY HOMEPAGES")
-    asyncio.run(
-        _verify_links(
-            linker, _create_search_request_homepage(acr_man.brc_container.cc_db, reg_db)
-        )
+    _run_journaled(
+        linker,
+        _create_search_request_homepage(acr_man.brc_container.cc_db, reg_db),
+        work_dir.joinpath(f"cafi_{version}_homepage.journal.ndjson"),
+        resume,
     )
     print("VERIFY CATALOGUES")
-    asyncio.run(_verify_links(linker, _create_search_request_catalogue(cat_db)))
+    _run_journaled(
+        linker,
+        _create_search_request_catalogue(cat_db),
+        work_dir.joinpath(f"cafi_{version}_catalogue.journal.ndjson"),
+        resume,
+    )
     print("--- DONE ---")
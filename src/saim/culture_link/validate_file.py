@@ -1,101 +1,92 @@
 import asyncio
 import atexit
+from collections.abc import Iterable, Iterator
 import csv
-import json
 from pathlib import Path
 import tempfile
-import time
+import warnings
 
 from saim.culture_link.create_links import CcnoLinkGenerator, SearchRequest
+from saim.culture_link.private.journal import ResultJournal, TaskIdSet
 from saim.designation.manager import AcronymManager
+from saim.shared.error.warnings import ReadWarn
+from saim.shared.misc.constants import ENCODING
+from saim.shared.misc.progress import ProgressReport
 
 
-def read_tasks(task_file: Path, /) -> list[SearchRequest]:
-    tasks = []
-    with task_file.open() as tfh:
-        for line in csv.reader(tfh, delimiter=",", quotechar='"'):
-            tasks.append(
-                SearchRequest(
-                    find_ccno=line[2],
-                    task_id=int(line[0]),
-                    find_extra=[
-                        extra_cl
-                        for extra in line[3].split(",")
-                        if (extra_cl := extra.strip()) != ""
-                    ],
-                    brc_id=int(line[1]) if line[1].isdigit() else -1,
-                    fallback_link=line[4],
+def _parse_task(line: list[str], /) -> SearchRequest | None:
+    if len(line) < 5 or not (task_id := line[0].strip()).isdigit():
+        return None
+    return SearchRequest(
+        find_ccno=line[2],
+        task_id=int(task_id),
+        find_extra=[
+            extra_cl for extra in line[3].split(",") if (extra_cl := extra.strip()) != ""
+        ],
+        brc_id=int(line[1]) if line[1].isdigit() else -1,
+        fallback_link=line[4],
+    )
+
+
+def iter_tasks(task_file: Path, /) -> Iterator[SearchRequest]:
+    with task_file.open(newline="", encoding=ENCODING) as tfh:
+        reader = csv.reader(tfh, delimiter=",", quotechar='"')
+        for line in reader:
+            if len(line) == 0:
+                continue
+            if (task := _parse_task(line)) is None:
+                warnings.warn(
+                    f"[CSV] skipping malformed row {task_file.name!s}:{reader.line_num}",
+                    ReadWarn,
+                    stacklevel=2,
                 )
-            )
-    return tasks
+                continue
+            yield task
 
 
-def _gen_out_path(output: str, in_file: Path, /) -> tuple[Path, Path]:
+def read_tasks(task_file: Path, /) -> list[SearchRequest]:
+    return list(iter_tasks(task_file))
+
+
+def _gen_out_path(output: str, in_file: Path, /) -> tuple[Path, Path, Path]:
     if output == "" or not (out_path := Path(output)).is_dir():
         suc = f"{in_file.absolute()!s}.res.json"
         fail = f"{in_file.absolute()!s}.fail.json"
-        return Path(suc), Path(fail)
+        jour = f"{in_file.absolute()!s}.journal.ndjson"
+        return Path(suc), Path(fail), Path(jour)
     suc = f"{in_file.name!s}.res.json"
     fail = f"{in_file.name!s}.fail.json"
-    return out_path.joinpath(suc), out_path.joinpath(fail)
+    jour = f"{in_file.name!s}.journal.ndjson"
+    return out_path.joinpath(suc), out_path.joinpath(fail), out_path.joinpath(jour)
+
+
+def _open_tasks(in_file: Path, done: TaskIdSet, /) -> Iterator[SearchRequest]:
+    return (task for task in iter_tasks(in_file) if task.task_id not in done)
 
 
 async def _verify_links(
     linker: CcnoLinkGenerator,
-    link_requests: list[SearchRequest],
-    output: str,
-    in_file: Path,
+    link_requests: Iterable[SearchRequest],
+    journal: ResultJournal,
+    progress: ProgressReport,
     /,
 ) -> None:
-    failed, success, start = {}, {}, time.time()
-    task_num = 0
     async for link in linker.ccno_linking(link_requests):
-        task_num += 1
-        calc_time = int((time.time() - start) / 36) / 100
-        print(f"TASK ID - {link.task_id} - [done] - [{task_num}/{len(link_requests)}]")
-        prog = int(task_num / len(link_requests) * 100)
-        print(f"\\-> Time - {calc_time}h - progress - {prog}%")
-        if link.result is not None and link.result.link != "":
-            print(f"\\-> BRC ID - {link.result.brc_id} - [verified]")
-            success[link.task_id] = {
-                "brc_id": link.result.brc_id,
-                "link": link.result.link,
-                "link_type": list(
-                    filter(
-                        lambda status: link.result is not None
-                        and status.link == link.result.link,
-                        link.status,
-                    )
-                )
-                .pop()
-                .link_type,
-                "status": [
-                    {"link": status.link, "reason": str(status.status.value)}
-                    for status in link.status
-                ],
-            }
-        else:
-            failed[link.task_id] = {
-                "result": link.result,
-                "status": [
-                    {
-                        "link": status.link,
-                        "type": status.link_type,
-                        "reason": str(status.status.value),
-                    }
-                    for status in link.status
-                ],
-            }
-    print("<---")
-    s_out, f_out = _gen_out_path(output, in_file)
-    with s_out.open("w") as sfh:
-        json.dump(success, sfh)
-    with f_out.open("w") as ffh:
-        json.dump(failed, ffh)
+        journal.append(link)
+        progress.step()
+    print(progress.summary())
 
 
 def validate_file(
-    version: str, worker: int, db_size: int, output: str, in_file: Path, contact: str, /
+    version: str,
+    worker: int,
+    db_size: int,
+    output: str,
+    in_file: Path,
+    contact: str,
+    resume: bool = False,
+    interval: float = 30.0,
+    /,
 ) -> None:
     if output == "" or not (work_dir := Path(output)).is_dir():
         tmp = tempfile.TemporaryDirectory()
@@ -104,6 +95,21 @@ def validate_file(
     linker = CcnoLinkGenerator(
         worker, work_dir, contact, db_size, AcronymManager(version)
     )
+    s_out, f_out, j_out = _gen_out_path(output, in_file)
+    journal = ResultJournal(j_out, resume)
     print("VERIFY FILE")
-    asyncio.run(_verify_links(linker, read_tasks(in_file), output, in_file))
+    try:
+        done = journal.completed
+        if len(done) > 0:
+            print(f"RESUME - {len(done)} tasks already done")
+        with warnings.catch_warnings():
+            # rows are validated again while streaming
+            warnings.simplefilter("ignore", ReadWarn)
+            open_cnt = sum(1 for _ in _open_tasks(in_file, done))
+        progress = ProgressReport(open_cnt, interval)
+        asyncio.run(_verify_links(linker, _open_tasks(in_file, done), journal, progress))
+        suc_cnt, fail_cnt = journal.compact(s_out, f_out)
+        print(f"RESULTS - {suc_cnt} verified - {fail_cnt} failed")
+    finally:
+        journal.close()
     print("--- DONE ---")
@@ -2,7 +2,7 @@ from collections.abc import Iterable
 import re
 
 from re import Pattern
-from typing import Any, Final, Never
+from typing import Any, Final, Never, final
 from cafi.container.acr_db import AcrCoreReg
 from saim.designation.known_acr_db import (
     identify_acr,
@@ -10,15 +10,18 @@ from saim.designation.known_acr_db import (
 )
 from saim.shared.parse.string import (
     PATTERN_CORE_ID_R,
-    PATTERN_CORE_ID_EDGE_R,
     PATTERN_CORE_ID_TXT_R,
-    PATTERN_EDGE_R,
     PATTERN_ID_EDGE_R,
     PATTERN_LEAD_ZERO_R,
     PATTERN_SEP,
     PATTERN_THREE_GROUPS_R,
     PATTERN_PREFIX_START_R,
+    clean_core_id_edges,
+    clean_edges,
+    clean_id_edges,
     clean_string,
+    edge_span,
+    is_word_char,
 )
 from saim.shared.data_con.brc import BrcContainer
 from saim.shared.data_con.designation import (
@@ -27,6 +30,7 @@ from saim.shared.data_con.designation import (
     STRAIN_INFO_SI_ID_REG,
     DesignationType,
     CCNoDes,
+    CCNoDesSpan,
     CCNoId,
 )
 from saim.shared.error.exceptions import DesignationEx
@@ -35,12 +39,15 @@ from saim.shared.search.radix_tree import RadixTree, find_first_match_with_fix
 DEF_SUF_RM: Final[tuple[str, ...]] = (r"T", r"\s")
 _SUF_CLEAN: Final[tuple[Pattern[str], ...]] = (re.compile(r"T$"),)
 _PATTERN_PARA: Final[Pattern[str]] = re.compile(r"\(.*\)|\[.*]|<.*>")
-_PATTERNS_DES_CL: Final[tuple[Pattern[str], ...]] = (
-    re.compile(r"^([Tt]ype[-\s]+)?[Ss]train[.:\s]+"),
-    re.compile(r"^([Ss]pecimen[-\s]+)?[Vv]oucher[.:\s]+"),
-    re.compile(r"^([Cc]ulture[-\s]+)?[Cc]ollection[.:\s]+"),
-    re.compile(rf"[{''.join(DEF_SUF_RM)}]+$"),
+# the prefixes are removed in this order, so one anchored match covers all of them
+_PATTERN_DES_PRE: Final[Pattern[str]] = re.compile(
+    r"(?:([Tt]ype[-\s]+)?[Ss]train[.:\s]+)?"
+    + r"(?:([Ss]pecimen[-\s]+)?[Vv]oucher[.:\s]+)?"
+    + r"(?:([Cc]ulture[-\s]+)?[Cc]ollection[.:\s]+)?"
 )
+_PATTERN_DES_SUF_CHAR: Final[Pattern[str]] = re.compile(rf"[{''.join(DEF_SUF_RM)}]")
+_LEFT_WINDOW: Final[int] = 64
+_RIGHT_WINDOW: Final[int] = 9
 _SET_ONE_DIG_NUMS: Final[set[str]] = {str(num) for num in range(10)}
 
 
@@ -70,11 +77,11 @@ def get_ccno_id(ccno: str, acr: str, /) -> str:
 
 
 def _cl_core(core: str, /) -> str:
-    return clean_string(core, PATTERN_CORE_ID_EDGE_R, PATTERN_LEAD_ZERO_R)
+    return clean_string(clean_core_id_edges(core), PATTERN_LEAD_ZERO_R)
 
 
 def _cl_id(cid: str, /) -> str:
-    return clean_string(cid, PATTERN_ID_EDGE_R)
+    return clean_id_edges(cid)
 
 
 def _extract_suf_pre(to_check: str, allowed: str, /) -> str:
@@ -91,7 +98,7 @@ def _is_reasonable_suf(suf: Any, brc_reg: AcrCoreReg, /) -> tuple[bool, str]:
     if not isinstance(suf, str):
         return False, ""
     suf_e = _extract_suf_pre(suf, brc_reg.suf)
-    suf_cl = clean_string(suf, PATTERN_ID_EDGE_R)
+    suf_cl = clean_id_edges(suf)
     if suf_cl != "" and suf_cl != suf_e and clean_string(suf_cl, *_SUF_CLEAN) != suf_e:
         return False, ""
     return True, suf_e
@@ -101,7 +108,7 @@ def _is_reasonable_pre(pre: Any, brc_reg: AcrCoreReg, /) -> tuple[bool, str]:
     if not isinstance(pre, str):
         return False, ""
     pre_e = _extract_suf_pre(pre, brc_reg.pre)
-    pre_cl = clean_string(pre, PATTERN_ID_EDGE_R)
+    pre_cl = clean_id_edges(pre)
     if pre_cl != "" and pre_e != pre_cl:
         return False, ""
     return True, pre_e
@@ -173,10 +180,10 @@ def _identify_ccno_fix(
     suffix: str,
     brc: BrcContainer,
     /,
-) -> CCNoDes:
+) -> tuple[CCNoDes, int]:
     clean_ccno = clean_designation(ccno)
     if (res_no := _split_acr_id(clean_ccno, acr)) is None:
-        return CCNoDes(designation=clean_ccno)
+        return CCNoDes(designation=clean_ccno), 0
     brc_acr, fixed_id = res_no
     fixed_id_cl = _cl_id(fixed_id)
     pre, core, suf = ["", "", ""]
@@ -191,15 +198,19 @@ def _identify_ccno_fix(
             pre, core, suf = res_id
             break
     if core == "":
-        return CCNoDes(designation=clean_ccno)
+        return CCNoDes(designation=clean_ccno), 0
+    to_add = ""
     if suf != "":
         to_add = _add_suffix(suffix, suf)
         clean_ccno += to_add
         fixed_id += to_add
-    return CCNoDes(
-        acr=brc_acr,
-        id=CCNoId(full=fixed_id, pre=pre, core=core, suf=suf),
-        designation=clean_ccno,
+    return (
+        CCNoDes(
+            acr=brc_acr,
+            id=CCNoId(full=fixed_id, pre=pre, core=core, suf=suf),
+            designation=clean_ccno,
+        ),
+        len(to_add),
     )
 
 
@@ -246,9 +257,7 @@ def identify_all_valid_ccno(ccno: str, brc: BrcContainer, /) -> list[CCNoDes]:
 def _identify_designation_types(designation: CCNoDes, /) -> Iterable[DesignationType]:
     if designation.acr != "" and designation.id.core != "":
         yield DesignationType.ccno
-    des_clean = clean_string(
-        designation.designation, _PATTERN_PARA, PATTERN_EDGE_R, *_PATTERNS_DES_CL
-    )
+    des_clean = clean_designation(designation.designation)
     for typ, pats in ALL_DES_TYPES:
         for reg in pats:
             if reg.match(des_clean) is not None:
@@ -306,45 +315,149 @@ def get_syn_eq_struct(designation: str, /) -> tuple[str, str, str]:
     ):
         return (
             rm_complex_structure(pre),
-            clean_string(core, PATTERN_CORE_ID_EDGE_R),
-            clean_string(suf, PATTERN_ID_EDGE_R, *_SUF_CLEAN).upper(),
+            clean_core_id_edges(core),
+            clean_string(clean_id_edges(suf), *_SUF_CLEAN).upper(),
         )
     return "", "", ""
 
 
 def clean_designation(designation: str, /) -> str:
-    return clean_string(designation, _PATTERN_PARA, PATTERN_EDGE_R, *_PATTERNS_DES_CL)
+    """Removes brackets, non-word edges, designation prefixes and type suffixes.
+
+    The cleaning steps are applied in the same order as sequential `clean_string`
+    calls, but after the bracket removal only indices are moved,
+    so at most one new string is created for the result.
+
+    Args:
+        designation (str): The designation to clean.
+
+    Returns:
+        str: The cleaned designation.
+    """
+    text = _PATTERN_PARA.sub("", designation)
+    start, end = edge_span(text)
+    if (pre := _PATTERN_DES_PRE.match(text, start, end)) is not None:
+        start = pre.end()
+    while end > start and _PATTERN_DES_SUF_CHAR.match(text, end - 1) is not None:
+        end -= 1
+    return text[start:end]
 
 
 def _get_acronyms(
     left: str, pre_end: int, prefix: str, brc: BrcContainer, /
 ) -> Iterable[tuple[str, str]]:
-    for acr in get_ccno_acr(left, brc.kn_acr_rev, False):
+    for acr in brc.kn_acr_rev_idx.find_prefixes(left):
         yield acr, ""
-    new_start = clean_string(left[pre_end:], PATTERN_EDGE_R)
-    for acr in get_ccno_acr(new_start, brc.kn_acr_rev, False):
+    new_start = clean_edges(left[pre_end:])
+    for acr in brc.kn_acr_rev_idx.find_prefixes(new_start):
         yield acr, prefix
 
 
-def extract_ccno_from_text(text: str, brc: BrcContainer, /) -> Iterable[CCNoDes]:
-    last_end = 0
-    for match in PATTERN_CORE_ID_TXT_R.finditer(text):
-        last_end = max(last_end, match.start(1) - 64)
-        left_full = text[last_end : match.start(1)][::-1]
-        sub_left = clean_string(left_full, PATTERN_EDGE_R)
-        rev_pre = PATTERN_PREFIX_START_R.search(sub_left)
-        if rev_pre is None:
+def _has_left_acr(text: str, left_end: int, core_start: int, /) -> bool:
+    # same as matching PATTERN_PREFIX_START_R on the cleaned reversed left window
+    for pos in range(core_start - 1, left_end - 1, -1):
+        if (char := text[pos]).isalnum():
+            return is_word_char(char) and not char.isdecimal()
+    return False
+
+
+def _identify_core_ccno(
+    text: str, core: re.Match[str], left_end: int, brc: BrcContainer, /
+) -> Iterable[CCNoDesSpan]:
+    core_start, core_end = core.span(1)
+    left_full = text[left_end:core_start][::-1]
+    sub_left = clean_edges(left_full)
+    if (rev_pre := PATTERN_PREFIX_START_R.search(sub_left)) is None:
+        return None
+    sub_right = text[core_end : core_end + _RIGHT_WINDOW]
+    for rev_acr_d, rev_pre_d in _get_acronyms(
+        sub_left, rev_pre.end(1), rev_pre.group(1), brc
+    ):
+        ccno_left = _identify_left_ccno(rev_acr_d, rev_pre_d, left_full)
+        if ccno_left == "":
             continue
-        sub_right = text[match.end(1) : match.end(1) + 9]
-        for rev_acr_d, rev_pre_d in _get_acronyms(
-            sub_left, rev_pre.end(1), rev_pre.group(1), brc
-        ):
-            ccno_left = _identify_left_ccno(rev_acr_d, rev_pre_d, left_full)
-            if ccno_left == "":
-                continue
-            ccno_des = _identify_ccno_fix(
-                rev_acr_d[::-1], ccno_left + match.group(1), sub_right, brc
+        ccno_des, added = _identify_ccno_fix(
+            rev_acr_d[::-1], ccno_left + core.group(1), sub_right, brc
+        )
+        if ccno_des.acr != "":
+            yield CCNoDesSpan(
+                start=core_start - len(ccno_left), end=core_end + added, ccno=ccno_des
             )
-            if ccno_des.acr != "":
-                yield ccno_des
-        last_end = match.end(1)
+
+
+@final
+class _CCNoScanner:
+    __slots__ = ("__brc", "__buffer", "__last_end", "__offset", "__pos")
+
+    def __init__(self, brc: BrcContainer, /) -> None:
+        self.__brc = brc
+        self.__buffer = ""
+        # absolute position of the first buffered char
+        self.__offset = 0
+        # positions relative to the buffer
+        self.__pos = 0
+        self.__last_end = 0
+        super().__init__()
+
+    def __trim(self) -> None:
+        keep = max(0, self.__pos - _LEFT_WINDOW)
+        if keep > 0:
+            self.__buffer = self.__buffer[keep:]
+            self.__offset += keep
+            self.__pos -= keep
+            self.__last_end = max(0, self.__last_end - keep)
+
+    def scan(self, chunk: str, final: bool, /) -> Iterable[CCNoDesSpan]:
+        self.__buffer += chunk
+        text, offset = self.__buffer, self.__offset
+        for core in PATTERN_CORE_ID_TXT_R.finditer(text, self.__pos):
+            if not final and core.end(1) + _RIGHT_WINDOW > len(text):
+                # the core or its suffix window may continue in the next chunk
+                self.__pos = core.start(1)
+                break
+            self.__pos = core.end(1)
+            core_start = core.start(1)
+            self.__last_end = max(self.__last_end, core_start - _LEFT_WINDOW)
+            if not _has_left_acr(text, self.__last_end, core_start):
+                continue
+            for span in _identify_core_ccno(text, core, self.__last_end, self.__brc):
+                yield CCNoDesSpan(
+                    start=span.start + offset, end=span.end + offset, ccno=span.ccno
+                )
+            self.__last_end = core.end(1)
+        else:
+            self.__pos = len(text)
+        if not final:
+            self.__trim()
+
+
+def extract_ccno_spans_from_text(
+    text: str, brc: BrcContainer, /
+) -> Iterable[CCNoDesSpan]:
+    yield from _CCNoScanner(brc).scan(text, True)
+
+
+def extract_ccno_spans_from_stream(
+    chunks: Iterable[str], brc: BrcContainer, /
+) -> Iterable[CCNoDesSpan]:
+    """Extract culture collection numbers from a chunked text.
+
+    Only a small window around the current scan position is buffered,
+    the results are equal to those of the concatenated text.
+
+    Args:
+        chunks: consecutive parts of the text.
+        brc: container with the known culture collections.
+
+    Yields:
+        The found designations with their absolute positions.
+    """
+    scanner = _CCNoScanner(brc)
+    for chunk in chunks:
+        yield from scanner.scan(chunk, False)
+    yield from scanner.scan("", True)
+
+
+def extract_ccno_from_text(text: str, brc: BrcContainer, /) -> Iterable[CCNoDes]:
+    for span in extract_ccno_spans_from_text(text, brc):
+        yield span.ccno
@@ -4,24 +4,19 @@ from typing import Never
 from cafi.container.acr_db import AcrDbEntry
 from cafi.library.loader import CURRENT_VER, load_acr_db
 
-from saim.shared.parse.string import (
-    PATTERN_SEP_R,
-    PATTERN_EDGE_R,
-    clean_string,
-    replace_non_word_chars,
-)
+from saim.shared.parse.string import STR_DEFINED_SEP, remove_non_word_chars_upper
 from saim.shared.data_con.brc import AcrDbEntryFixed, BrcContainer
+from saim.shared.error.exceptions import DesignationEx
 from saim.shared.search.radix_tree import (
     RadixTree,
+    find_fuzzy_matches,
     is_full_match,
-    radix_add,
-    radix_compact,
+    radix_build,
 )
 
 
 def rm_complex_structure(acr: str, /) -> str:
-    slim_acr = replace_non_word_chars(acr)
-    return clean_string(slim_acr, PATTERN_SEP_R, PATTERN_EDGE_R).upper()
+    return remove_non_word_chars_upper(acr)
 
 
 def _add_fixed_acr(cc_db: dict[int, AcrDbEntry], /) -> dict[int, AcrDbEntryFixed]:
@@ -68,14 +63,10 @@ def create_brc_con(
     cc_db_acr, cc_db_code = _create_acr_code_index(cc_db_m)
     all_acr = _create_all_valid_acr(acr_db)
 
-    first_acr = all_acr.pop()
-    kn_acr: RadixTree[Never] = RadixTree(first_acr, tuple())
-    kn_acr_rev: RadixTree[Never] = RadixTree(first_acr[::-1], tuple())
-    for acr in all_acr:
-        radix_add(kn_acr, acr, tuple())
-        radix_add(kn_acr_rev, acr[::-1], tuple())
-    radix_compact(kn_acr)
-    radix_compact(kn_acr_rev)
+    kn_acr: RadixTree[Never] | None = radix_build((acr, ()) for acr in all_acr)
+    kn_acr_rev: RadixTree[Never] | None = radix_build((acr[::-1], ()) for acr in all_acr)
+    if kn_acr is None or kn_acr_rev is None:
+        raise DesignationEx(f"no acronyms found in the CAFI database {version}")
 
     return BrcContainer(
         cc_db=acr_db,
@@ -108,6 +99,29 @@ def identify_acr_or_code(acr: str, brc_con: BrcContainer, /) -> set[int]:
     return brc_con.f_cc_db_acr.get(fixed, set()) | brc_con.f_cc_db_code.get(fixed, set())
 
 
+def identify_similar_acr(
+    designation: str, brc_con: BrcContainer, max_dist: int, /
+) -> list[tuple[str, int, set[int]]]:
+    """Finds acronyms and codes within an edit distance of the designation start.
+
+    Returns:
+        list[tuple[str, int, set[int]]]: The acronym, its distance,
+            and the matching BRC ids, ordered by distance.
+    """
+    found: dict[str, int] = {}
+    for key, dist, _ in find_fuzzy_matches(brc_con.kn_acr, designation, max_dist, True):
+        found.setdefault(key.replace(STR_DEFINED_SEP, ""), dist)
+    return [
+        (acr, dist, brc_ids)
+        for acr, dist in found.items()
+        if len(
+            brc_ids := brc_con.f_cc_db_acr.get(acr, set())
+            | brc_con.f_cc_db_code.get(acr, set())
+        )
+        > 0
+    ]
+
+
 def parse_acr_or_code(acr_or_code: str, brc_con: BrcContainer, /) -> str:
     mat, *_ = is_full_match(brc_con.kn_acr, acr_or_code)
     if mat:
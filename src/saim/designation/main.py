@@ -1,17 +1,47 @@
 import argparse
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+import csv
 from importlib.abc import Traversable
+import io
+from itertools import islice
+import json
+from multiprocessing.pool import AsyncResult
 from pathlib import Path
 import sys
 from importlib import resources
+import time
+from typing import IO, Final
 import warnings
 
+from saim.shared.data_con.brc import BrcContainer
 from saim.shared.error.warnings import ReadWarn
 from saim.designation.known_acr_db import create_brc_con
 from saim.designation.extract_ccno import identify_designation
 from saim import data
 from saim.shared.data_con.designation import ccno_designation_to_dict
+from saim.shared.misc.constants import ENCODING
+from saim.shared.misc.ctx import get_worker_ctx
 from saim.shared.search.radix_tree import radix_compact
 
+FORMATS: Final[tuple[str, ...]] = ("text", "jsonl", "csv")
+_CSV_HEADER: Final[tuple[str, ...]] = (
+    "input",
+    "type",
+    "acr",
+    "full",
+    "core",
+    "pre",
+    "suf",
+    "designation",
+)
+
+# pending chunks per job, keeps the input read ahead bounded
+_WINDOW: Final[int] = 2
+# set once per worker process by the pool initializer
+_WORKER: dict[str, tuple[BrcContainer, str]] = {}
+
 
 def _parse_args(argv: list[str], /) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -23,27 +53,55 @@ def _parse_args(argv: list[str], /) -> argparse.Namespace:
         nargs="?",
         default="",
         type=str,
-        help="text file with ccnos or designations (1 per line)",
+        help="text file with ccnos or designations (1 per line), '-' reads stdin",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        type=int,
+        required=False,
+        default=1,
+        help="the number of processes classifying lines",
+        dest="jobs",
+        metavar="int",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        action="store",
+        type=str,
+        required=False,
+        default="text",
+        choices=FORMATS,
+        help="the output format",
+        dest="format",
+    )
+    parser.add_argument(
+        "-c",
+        "--chunk",
+        action="store",
+        type=int,
+        required=False,
+        default=2000,
+        help="the number of lines handed to a process at once",
+        dest="chunk",
+        metavar="int",
     )
     return parser.parse_args(argv)
 
 
-def _get_file_content(filename: str, /) -> list[str]:
-    lines = []
+@contextmanager
+def _open_input(filename: str, /) -> Iterator[IO[str]]:
+    if filename == "-":
+        yield sys.stdin
+        return None
     file_path: Traversable | Path = Path(filename)
-    warnings.formatwarning = lambda msg, *_arg: f"WARN: {msg}\n"
     if isinstance(file_path, Path) and not file_path.is_file():
         file_path = resources.files(data).joinpath("test_ccnos.txt")
+    # only opening errors are reported, errors of the caller pass through
     try:
-        with file_path.open("r") as file_in:
-            lines = file_in.readlines()
-        if len(lines) == 0:
-            warnings.warn(
-                f"Failed to open file {filename!s}",
-                ReadWarn,
-                stacklevel=2,
-            )
-            sys.exit(1)
+        file_in = file_path.open("r", encoding=ENCODING)
     except FileNotFoundError as fnf:
         warnings.warn(
             f"File not found {fnf!s}",
@@ -51,32 +109,142 @@ def _get_file_content(filename: str, /) -> list[str]:
             stacklevel=2,
         )
         sys.exit(1)
-    except IOError as io:
+    except IOError as io_err:
         warnings.warn(
-            f"Failed to open file {io!s}",
+            f"Failed to open file {io_err!s}",
             ReadWarn,
             stacklevel=2,
         )
         sys.exit(1)
-    return lines
+    with file_in:
+        yield file_in
+
+
+def _to_text(line: str, brc: BrcContainer, /) -> str:
+    des_type, ccno_des = identify_designation(line, brc)
+    des_str = "\t".join(
+        [f"{key!s}={val!s}" for key, val in ccno_designation_to_dict(ccno_des).items()]
+    )
+    return f"{des_type.name!s} - {des_str!s}\n"
+
+
+def _to_json(line: str, brc: BrcContainer, /) -> str:
+    des_type, ccno_des = identify_designation(line, brc)
+    return (
+        json.dumps(
+            {
+                "input": line,
+                "type": des_type.name,
+                **ccno_designation_to_dict(ccno_des),
+            }
+        )
+        + "\n"
+    )
+
+
+def _to_csv(lines: list[str], brc: BrcContainer, /) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for line in lines:
+        des_type, ccno_des = identify_designation(line, brc)
+        writer.writerow(
+            (
+                line,
+                des_type.name,
+                ccno_des.acr,
+                ccno_des.id.full,
+                ccno_des.id.core,
+                ccno_des.id.pre,
+                ccno_des.id.suf,
+                ccno_des.designation,
+            )
+        )
+    return buffer.getvalue()
+
+
+def classify_chunk(lines: list[str], brc: BrcContainer, out_format: str, /) -> str:
+    match out_format:
+        case "jsonl":
+            return "".join(_to_json(line, brc) for line in lines)
+        case "csv":
+            return _to_csv(lines, brc)
+        case _:
+            return "".join(_to_text(line, brc) for line in lines)
+
+
+def _init_worker(brc: BrcContainer, out_format: str, /) -> None:
+    _WORKER["ctx"] = (brc, out_format)
+
+
+def _classify_in_worker(lines: list[str], /) -> tuple[int, str]:
+    brc, out_format = _WORKER["ctx"]
+    return len(lines), classify_chunk(lines, brc, out_format)
+
+
+def _chunk_lines(lines: Iterable[str], size: int, /) -> Iterator[list[str]]:
+    line_iter = (line.rstrip("\r\n") for line in lines)
+    while len(chunk := list(islice(line_iter, max(1, size)))) > 0:
+        yield chunk
+
+
+def classify_stream(
+    lines: Iterable[str],
+    brc: BrcContainer,
+    out_format: str,
+    jobs: int,
+    chunk: int,
+    /,
+) -> Iterator[tuple[int, str]]:
+    """Classifies lines in chunks and yields the formatted output in input order.
+
+    With more than one job each worker process receives its own copy of the
+    BRC container once, afterwards only the lines and formatted chunks are sent.
+    At most `_WINDOW` chunks per job are read ahead of the output.
+    """
+    chunks = _chunk_lines(lines, chunk)
+    if jobs <= 1:
+        for lines_chunk in chunks:
+            yield len(lines_chunk), classify_chunk(lines_chunk, brc, out_format)
+        return None
+    with get_worker_ctx().Pool(jobs, _init_worker, (brc, out_format)) as pool:
+        pending: deque[AsyncResult[tuple[int, str]]] = deque()
+        for lines_chunk in chunks:
+            pending.append(pool.apply_async(_classify_in_worker, (lines_chunk,)))
+            if len(pending) >= jobs * _WINDOW:
+                yield pending.popleft().get()
+        while len(pending) > 0:
+            yield pending.popleft().get()
 
 
 def run() -> None:
     args = _parse_args(sys.argv[1:])
+    warnings.formatwarning = lambda msg, *_arg: f"WARN: {msg}\n"
     brc = create_brc_con()
     radix_compact(brc.kn_acr)
     radix_compact(brc.kn_acr_rev)
-    file_content = _get_file_content(args.filename)
-
-    for ccno in file_content:
-        des_type, ccno_des = identify_designation(ccno, brc)
-        des_str = "\t".join(
-            [
-                f"{key!s}={val!s}"
-                for key, val in ccno_designation_to_dict(ccno_des).items()
-            ]
+
+    start, total = time.perf_counter(), 0
+    with _open_input(args.filename) as file_in:
+        if args.format == "csv":
+            sys.stdout.write(",".join(_CSV_HEADER) + "\n")
+        for cnt, res in classify_stream(
+            file_in, brc, args.format, int(args.jobs), int(args.chunk)
+        ):
+            total += cnt
+            sys.stdout.write(res)
+    if total == 0:
+        warnings.warn(
+            f"Failed to read any line from {args.filename!s}",
+            ReadWarn,
+            stacklevel=2,
         )
-        print(f"{des_type.name!s} - {des_str!s}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+    print(
+        f"DONE - {total} lines in {elapsed:.2f}s"
+        f" - {total / elapsed if elapsed > 0 else 0.0:.0f} lines/s",
+        file=sys.stderr,
+    )
 
 
 if __name__ == "__main__":
@@ -1,17 +1,42 @@
 from datetime import datetime, timedelta
-from typing import Callable, Iterable, Self, final
+from typing import Callable, Iterable, Protocol, Self, final
 
 from saim.designation.extract_ccno import (
     extract_ccno_from_text,
+    extract_ccno_spans_from_stream,
     identify_all_valid_ccno,
     identify_ccno,
     identify_designation_type,
     identify_designation_types,
 )
-from saim.designation.known_acr_db import create_brc_con, identify_acr
-from saim.shared.data_con.designation import CCNoDes, CCNoId, DesignationType
+from saim.designation.known_acr_db import (
+    create_brc_con,
+    identify_acr,
+    identify_similar_acr,
+)
+from saim.shared.data_con.designation import (
+    CCNoDes,
+    CCNoDesSpan,
+    CCNoId,
+    DesignationType,
+)
 from cafi.container.acr_db import AcrDbEntry
 from saim.shared.data_con.brc import BrcContainer
+from saim.shared.misc.metrics import METRICS, timed
+
+
+class AcronymLookup(Protocol):
+    """The lookups shared by `AcronymManager` and the service client."""
+
+    def get_brc_by_id(self, brc_id: int, /) -> AcrDbEntry | None: ...
+
+    def identify_ccno(self, designation: str, /) -> CCNoDes: ...
+
+    def identify_ccno_batch(self, designations: Iterable[str], /) -> list[CCNoDes]: ...
+
+    def identify_ccno_by_brc(self, designation: str, brc_id: int, /) -> CCNoDes: ...
+
+    def identify_acr(self, acr: str, /) -> set[int]: ...
 
 
 def _verify_date[T, V](
@@ -98,20 +123,27 @@ class AcronymManager:
             key = next(iter(self._ca_req_all))
             self._ca_req_all.pop(key)
 
+    @timed("acronym.identify_ccno")
     @_verify_date
     def identify_ccno(self, designation: str, /) -> CCNoDes:
         trimmed = designation.strip()
         if trimmed in self._ca_req_all and trimmed in self._ca_req:
             del self._ca_req[trimmed]
         if trimmed in self._ca_req_all and len(self._ca_req_all[trimmed]) > 0:
+            METRICS.count("acronym.cache_hit")
             return _cr_ccno_des(self._ca_req_all[trimmed][0])
         if trimmed in self._ca_req:
+            METRICS.count("acronym.cache_hit")
             return _cr_ccno_des(self._ca_req[trimmed])
+        METRICS.count("acronym.cache_miss")
         ide = identify_ccno(trimmed, self._ca_brc)
         self.__check_limit()
         self._ca_req[trimmed] = _cr_tuple_from_ccno_des(ide)
         return ide
 
+    def identify_ccno_batch(self, designations: Iterable[str], /) -> list[CCNoDes]:
+        return [self.identify_ccno(des) for des in designations]
+
     def identify_ccno_by_brc(self, designation: str, brc_id: int, /) -> CCNoDes:
         trimmed = designation.strip()
         for ccno in self.identify_ccno_all_valid(trimmed):
@@ -119,11 +151,14 @@ class AcronymManager:
                 return ccno
         return CCNoDes(designation=trimmed)
 
+    @timed("acronym.identify_ccno_all_valid")
     @_verify_date
     def identify_ccno_all_valid(self, designation: str, /) -> list[CCNoDes]:
         trimmed = designation.strip()
         if trimmed in self._ca_req_all:
+            METRICS.count("acronym.cache_hit")
             return [_cr_ccno_des(val) for val in self._ca_req_all[trimmed]]
+        METRICS.count("acronym.cache_miss")
         ides = identify_all_valid_ccno(trimmed, self._ca_brc)
         if len(ides) > 0:
             self.__check_limit()
@@ -134,10 +169,29 @@ class AcronymManager:
     def extract_all_valid_ccno_from_text(self, text: str, /) -> Iterable[CCNoDes]:
         yield from extract_ccno_from_text(text, self._ca_brc)
 
+    @_verify_date
+    def extract_all_valid_ccno_spans_from_stream(
+        self, chunks: Iterable[str], /
+    ) -> Iterable[CCNoDesSpan]:
+        yield from extract_ccno_spans_from_stream(chunks, self._ca_brc)
+
+    @timed("acronym.identify_acr")
     @_verify_date
     def identify_acr(self, acr: str, /) -> set[int]:
         return identify_acr(acr, self._ca_brc)
 
+    @timed("acronym.identify_similar_acr")
+    def identify_similar_acr(
+        self, designation: str, max_dist: int = 1, /
+    ) -> list[tuple[str, int, set[int]]]:
+        """Fallback for designations without a known acronym, e.g. typos or OCR noise.
+
+        Returns:
+            list[tuple[str, int, set[int]]]: The acronym, its edit distance
+                to the designation start, and the matching BRC ids.
+        """
+        return identify_similar_acr(designation.strip(), self._ca_brc, max_dist)
+
     @_verify_date
     def is_brc_deprecated(self, brc_id: int, /) -> bool:
         dep = self._ca_brc.cc_db.get(brc_id, None)
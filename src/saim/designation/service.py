@@ -0,0 +1,241 @@
+from collections.abc import Iterable
+from multiprocessing.connection import Client, Connection, Listener
+from multiprocessing.context import SpawnProcess
+import os
+import secrets
+from threading import Lock, Thread
+from typing import Any, Final, Self, final
+
+from cafi.container.acr_db import AcrDbEntry
+
+from saim.designation.manager import AcronymManager
+from saim.shared.data_con.designation import CCNoDes, DesignationType
+from saim.shared.error.exceptions import DesignationEx
+from saim.shared.misc.ctx import get_worker_ctx
+
+_BATCH: Final[int] = 512
+_STOP: Final[str] = "stop"
+# the only manager methods a client may call
+_SERVED: Final[frozenset[str]] = frozenset(
+    (
+        "get_brc_by_id",
+        "identify_acr",
+        "identify_ccno",
+        "identify_ccno_all_valid",
+        "identify_ccno_by_brc",
+        "identify_designation_type",
+        "identify_designation_types",
+        "identify_similar_acr",
+        "is_brc_deprecated",
+    )
+)
+
+type _Request = tuple[str, list[tuple[Any, ...]]]
+type _Response = tuple[bool, Any]
+
+
+@final
+class AcronymServer:
+    """Answers batched acronym requests from other processes with one manager.
+
+    Each connection is served by its own thread,
+    the calls on the manager and its cache are serialized.
+    """
+
+    __slots__ = ("__acr_man", "__listener", "__lock", "__running")
+
+    def __init__(self, acr_man: AcronymManager, listener: Listener, /) -> None:
+        self.__acr_man = acr_man
+        self.__listener = listener
+        self.__lock = Lock()
+        self.__running = True
+        super().__init__()
+
+    def __answer(self, request: _Request, /) -> _Response:
+        method, batch = request
+        if method not in _SERVED:
+            return False, DesignationEx(f"[SERVICE] unknown method {method}")
+        func = getattr(self.__acr_man, method)
+        try:
+            with self.__lock:
+                return True, [func(*args) for args in batch]
+        except Exception as exc:
+            return False, exc
+
+    def __handle(self, conn: Connection, /) -> None:
+        with conn:
+            while True:
+                try:
+                    request: _Request = conn.recv()
+                except (EOFError, OSError):
+                    return None
+                if request[0] == _STOP:
+                    self.__running = False
+                    conn.send((True, []))
+                    return None
+                success, payload = self.__answer(request)
+                try:
+                    conn.send((success, payload))
+                except Exception as exc:
+                    # unpicklable error, the stream is untouched at this point
+                    conn.send((False, DesignationEx(f"[SERVICE] {exc!s}")))
+
+    def serve(self) -> None:
+        with self.__listener:
+            while self.__running:
+                conn = self.__listener.accept()
+                Thread(target=self.__handle, args=(conn,), daemon=True).start()
+
+
+def _run_server(version: str, limit: int, authkey: bytes, ready: Connection, /) -> None:
+    acr_man = AcronymManager(version, limit)
+    with Listener(authkey=authkey) as listener:
+        ready.send(listener.address)
+        ready.close()
+        AcronymServer(acr_man, listener).serve()
+
+
+def _send(conn: Connection, request: _Request, /) -> list[Any]:
+    conn.send(request)
+    success, payload = conn.recv()
+    if not success:
+        raise payload
+    return list(payload)
+
+
+@final
+class AcronymClient:
+    """Exposes the `AcronymManager` lookups of an `AcronymService` process.
+
+    The client only keeps the address and key, so it can be handed to spawned
+    workers, each process opens its own connection on the first request.
+    """
+
+    __slots__ = ("__address", "__authkey", "__conn", "__pid")
+
+    def __init__(self, address: str, authkey: bytes, /) -> None:
+        self.__address = address
+        self.__authkey = authkey
+        self.__conn: Connection | None = None
+        self.__pid = -1
+        super().__init__()
+
+    def __reduce__(self) -> tuple[type[Self], tuple[str, bytes]]:
+        return self.__class__, (self.__address, self.__authkey)
+
+    def __connection(self) -> Connection:
+        if self.__conn is None or self.__pid != os.getpid():
+            self.__conn = Client(self.__address, authkey=self.__authkey)
+            self.__pid = os.getpid()
+        return self.__conn
+
+    def __call(self, method: str, batch: list[tuple[Any, ...]], /) -> list[Any]:
+        return _send(self.__connection(), (method, batch))
+
+    def __single(self, method: str, *args: Any) -> Any:
+        return self.__call(method, [args])[0]
+
+    def get_brc_by_id(self, brc_id: int, /) -> AcrDbEntry | None:
+        res: AcrDbEntry | None = self.__single("get_brc_by_id", brc_id)
+        return res
+
+    def identify_ccno(self, designation: str, /) -> CCNoDes:
+        res: CCNoDes = self.__single("identify_ccno", designation)
+        return res
+
+    def identify_ccno_batch(self, designations: Iterable[str], /) -> list[CCNoDes]:
+        batch = [(des,) for des in designations]
+        results: list[CCNoDes] = []
+        for start in range(0, len(batch), _BATCH):
+            results.extend(self.__call("identify_ccno", batch[start : start + _BATCH]))
+        return results
+
+    def identify_ccno_by_brc(self, designation: str, brc_id: int, /) -> CCNoDes:
+        res: CCNoDes = self.__single("identify_ccno_by_brc", designation, brc_id)
+        return res
+
+    def identify_ccno_all_valid(self, designation: str, /) -> list[CCNoDes]:
+        res: list[CCNoDes] = self.__single("identify_ccno_all_valid", designation)
+        return res
+
+    def identify_acr(self, acr: str, /) -> set[int]:
+        res: set[int] = self.__single("identify_acr", acr)
+        return res
+
+    def identify_similar_acr(
+        self, designation: str, max_dist: int = 1, /
+    ) -> list[tuple[str, int, set[int]]]:
+        res: list[tuple[str, int, set[int]]] = self.__single(
+            "identify_similar_acr", designation, max_dist
+        )
+        return res
+
+    def is_brc_deprecated(self, brc_id: int, /) -> bool:
+        res: bool = self.__single("is_brc_deprecated", brc_id)
+        return res
+
+    def identify_designation_type(self, des: str, /) -> DesignationType:
+        res: DesignationType = self.__single("identify_designation_type", des)
+        return res
+
+    def identify_designation_types(self, des: str, /) -> list[DesignationType]:
+        res: list[DesignationType] = self.__single("identify_designation_types", des)
+        return res
+
+    def close(self) -> None:
+        if self.__conn is not None and self.__pid == os.getpid():
+            self.__conn.close()
+        self.__conn = None
+
+
+@final
+class AcronymService:
+    """Runs one `AcronymManager` with a large cache in a separate process.
+
+    All workers share the container and the cache through `AcronymClient`
+    instances, talking to the service over a local socket.
+    """
+
+    __slots__ = ("__address", "__authkey", "__proc")
+
+    def __init__(self, version: str, limit: int = 100_000, /) -> None:
+        self.__authkey = secrets.token_bytes(32)
+        ctx = get_worker_ctx()
+        ready_recv, ready_send = ctx.Pipe(duplex=False)
+        self.__proc: SpawnProcess = ctx.Process(
+            target=_run_server,
+            args=(version, limit, self.__authkey, ready_send),
+            daemon=True,
+        )
+        self.__proc.start()
+        ready_send.close()
+        try:
+            self.__address: str = ready_recv.recv()
+        except EOFError as exc:
+            raise DesignationEx("[SERVICE] acronym service failed to start") from exc
+        finally:
+            ready_recv.close()
+        super().__init__()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        self.close()
+
+    def client(self) -> AcronymClient:
+        return AcronymClient(self.__address, self.__authkey)
+
+    def close(self) -> None:
+        if not self.__proc.is_alive():
+            return None
+        with Client(self.__address, authkey=self.__authkey) as conn:
+            _send(conn, (_STOP, []))
+        # wake up the accept loop to see the stop flag
+        try:
+            Client(self.__address, authkey=self.__authkey).close()
+        except OSError:
+            pass
+        self.__proc.join(10)
+        if self.__proc.is_alive():
+            self.__proc.terminate()
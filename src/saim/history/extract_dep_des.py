@@ -1,9 +1,43 @@
-from collections import defaultdict
-from typing import Iterable
+from collections import defaultdict, deque
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Final, Iterable, final
 from saim.designation.known_acr_db import identify_acr_or_code
+from saim.history.graph import find_cycle_members
 from saim.history.manager import HistoryManager
 from saim.history.private.types import HISTORY, INDEX, STRAIN_CC, STRAIN_DP
 from saim.shared.data_con.history import DepositCon, HistoryDepositor
+from saim.shared.misc.ctx import get_worker_ctx
+
+_CHUNK_SIZE: Final[int] = 256
+# pending chunks per worker in the batch mode
+_WINDOW: Final[int] = 2
+# set by the pool initializer in each worker process
+_WORKER: Final[dict[str, HistoryManager]] = {}
+
+
+@final
+class _SynEqTable:
+    # parses each designation only once per run, unlike the bounded manager cache
+    __slots__ = ("__manager", "__table")
+
+    def __init__(
+        self, deposits: Iterable[DepositCon], manager: HistoryManager, /
+    ) -> None:
+        self.__manager = manager
+        self.__table: dict[str, tuple[str, str, str]] = {}
+        for dep in deposits:
+            self.get_syn_eq_struct(dep.designation)
+            for rel_des in dep.rel_des:
+                self.get_syn_eq_struct(rel_des)
+        super().__init__()
+
+    def get_syn_eq_struct(self, designation: str, /) -> tuple[str, str, str]:
+        if (equ := self.__table.get(designation, None)) is None:
+            equ = self.__manager.get_syn_eq_struct(designation)
+            self.__table[designation] = equ
+        return equ
 
 
 def _create_hist_depositor(history: HISTORY, pos_next: int, /) -> HistoryDepositor:
@@ -42,13 +76,13 @@ def _create_history_index(histories: list[HISTORY], strain_cc: STRAIN_CC, /) ->
 
 
 def _create_unique_strain_cc(
-    strain_dp: Iterable[DepositCon], manager: HistoryManager, /
+    strain_dp: Iterable[DepositCon], manager: HistoryManager, syn_eq: _SynEqTable, /
 ) -> STRAIN_CC:
     memory: set[tuple[str, str, str]] = set()
     container: STRAIN_CC = defaultdict(list)
 
     def __verify_memory_and_add(cc_id: int, designation: str, /) -> None:
-        acr, core, suf = manager.get_syn_eq_struct(designation)
+        acr, core, suf = syn_eq.get_syn_eq_struct(designation)
         if acr != "" and core != "" and (mem := (acr, core, suf)) not in memory:
             cor_cc_id = (
                 {cc_id}
@@ -66,32 +100,94 @@ def _create_unique_strain_cc(
     return container
 
 
-def _prepare_index(strain_dp: STRAIN_DP, manager: HistoryManager, /) -> INDEX:
-    histories = [
+def _parse_histories(
+    deposits: Iterable[DepositCon], manager: HistoryManager, syn_eq: _SynEqTable, /
+) -> list[HISTORY]:
+    return [
         manager.parse_history(
             his,
             dep.cc_id,
-            (dep.designation, *manager.get_syn_eq_struct(dep.designation)),
-            _create_unique_strain_cc([dep], manager),
+            (dep.designation, *syn_eq.get_syn_eq_struct(dep.designation)),
+            _create_unique_strain_cc([dep], manager, syn_eq),
         )
-        for dep in strain_dp.values()
+        for dep in deposits
         for his in dep.history
         if his != ""
     ]
+
+
+def _init_worker(version: str, /) -> None:
+    _WORKER["manager"] = HistoryManager(version)
+
+
+def _parse_histories_worker(parts: list[list[DepositCon]], /) -> list[list[HISTORY]]:
+    manager = _WORKER["manager"]
+    return [
+        _parse_histories(deposits, manager, _SynEqTable(deposits, manager))
+        for deposits in parts
+    ]
+
+
+def create_history_pool(version: str, workers: int, /) -> ProcessPoolExecutor:
+    """Creates a process pool for parsing histories.
+
+    Each worker loads the culture collection container once,
+    so the pool should be kept for all strains of a run.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_worker_ctx(),
+        initializer=_init_worker,
+        initargs=(version,),
+    )
+
+
+def _chunk_deposits(
+    deposits: Iterable[DepositCon], chunk_size: int, /
+) -> Iterable[list[DepositCon]]:
+    dep_iter = iter(deposits)
+    while len(chunk := list(islice(dep_iter, chunk_size))) > 0:
+        yield chunk
+
+
+def _parse_histories_parallel(
+    strain_dp: STRAIN_DP, pool: ProcessPoolExecutor, /
+) -> list[HISTORY]:
+    # map keeps the chunk order, so the index is built in the sequential order
+    return [
+        his
+        for chunk_res in pool.map(
+            _parse_histories_worker,
+            ([chunk] for chunk in _chunk_deposits(strain_dp.values(), _CHUNK_SIZE)),
+        )
+        for his in chunk_res[0]
+    ]
+
+
+def _prepare_index(
+    strain_dp: STRAIN_DP,
+    manager: HistoryManager,
+    syn_eq: _SynEqTable,
+    histories: list[HISTORY] | None,
+    /,
+) -> INDEX:
+    if histories is None:
+        histories = _parse_histories(strain_dp.values(), manager, syn_eq)
     return _create_history_index(
-        histories, _create_unique_strain_cc((dep for dep in strain_dp.values()), manager)
+        histories,
+        _create_unique_strain_cc((dep for dep in strain_dp.values()), manager, syn_eq),
     )
 
 
 def _prepare_index_strain(
-    strain_dp: STRAIN_DP, manager: HistoryManager, /
+    strain_dp: STRAIN_DP, syn_eq: _SynEqTable, /
 ) -> dict[tuple[str, str, str], int]:
     del_ids: set[tuple[str, str, str]] = set()
     index: dict[tuple[str, str, str], int] = {}
     for si_dp, dep in strain_dp.items():
         if dep.designation == "":
             continue
-        if (acr_suf_pre := manager.get_syn_eq_struct(dep.designation))[
+        if (acr_suf_pre := syn_eq.get_syn_eq_struct(dep.designation))[
             0
         ] != "" and acr_suf_pre[1] != "":
             if acr_suf_pre in index:
@@ -110,29 +206,26 @@ def _get_history_or_none(
     return his_con[pos]
 
 
-def assign_depositor_designation(
-    strain_dp: STRAIN_DP, manager: HistoryManager, /
+def _assign_designation(
+    strain_dp: STRAIN_DP,
+    manager: HistoryManager,
+    histories: list[HISTORY] | None,
+    /,
 ) -> Iterable[tuple[int, int]]:
-    index = _prepare_index(strain_dp, manager)
-    index_si_dp = _prepare_index_strain(strain_dp, manager)
+    syn_eq = _SynEqTable(strain_dp.values(), manager)
+    index = _prepare_index(strain_dp, manager, syn_eq, histories)
+    index_si_dp = _prepare_index_strain(strain_dp, syn_eq)
     for si_dp, dep in strain_dp.items():
         if dep.deposited_as > 0:
             continue
         dep_si_dp = set()
-        his_con = index.get(manager.get_syn_eq_struct(dep.designation), [])
+        his_con = index.get(syn_eq.get_syn_eq_struct(dep.designation), [])
         for his_ind, his_anc in enumerate(his_con):
             if (
-                his_anc.deposition_designation(dep.designation, manager) != ""
-                and (
-                    new_si_dp := index_si_dp.get(
-                        manager.get_syn_eq_struct(
-                            his_anc.deposition_designation(dep.designation, manager)
-                        ),
-                        None,
-                    )
-                )
-                is not None
-            ):
+                anc_des := his_anc.deposition_designation(dep.designation, syn_eq)
+            ) != "" and (
+                new_si_dp := index_si_dp.get(syn_eq.get_syn_eq_struct(anc_des), None)
+            ) is not None:
                 dep_si_dp.add(new_si_dp)
             if not his_anc.is_compatible_deposition(
                 _get_history_or_none(his_con, his_ind)
@@ -143,28 +236,112 @@ def assign_depositor_designation(
             yield si_dp, dep_si_dp.pop()
 
 
-def _walk_to_root(dest: int, graph: dict[int, int], path: set[int], /) -> bool:
-    if dest in path:
-        return True
-    if dest in graph:
-        path.add(dest)
-        next_dest = graph[dest]
-        del graph[dest]
-        return _walk_to_root(next_dest, graph, path)
-    return False
+def assign_depositor_designation(
+    strain_dp: STRAIN_DP,
+    manager: HistoryManager,
+    pool: ProcessPoolExecutor | None = None,
+    /,
+) -> Iterable[tuple[int, int]]:
+    """Assign the deposited strain designation to each deposit.
 
+    Args:
+        strain_dp: deposits of one strain.
+        manager: history manager of the parent process.
+        pool: pool from `create_history_pool`, used for strains with more
+            deposits than one chunk.
 
-def history_has_cycle(history: list[tuple[int, int]], /) -> bool:
-    # history tuple(target <- source)
-    graph: dict[int, int] = {}
+    Yields:
+        Pairs of deposit id and the id of the deposit it was deposited as.
+    """
+    histories = None
+    if pool is not None and len(strain_dp) > _CHUNK_SIZE:
+        histories = _parse_histories_parallel(strain_dp, pool)
+    yield from _assign_designation(strain_dp, manager, histories)
 
-    for src, ori in history:
-        if src in graph:
-            return True
-        graph[src] = ori
 
-    while len(graph) > 0:
-        start, dest = graph.popitem()
-        if _walk_to_root(dest, graph, {start}):
+type _Part = tuple[int, bool, list[DepositCon]]
+
+
+def _pack_strains(
+    strains: Iterable[STRAIN_DP], /
+) -> Iterable[tuple[dict[int, STRAIN_DP], list[_Part]]]:
+    # parts of one or more strains with at most one chunk of deposits,
+    # each part knows its strain and whether it is the last part of it
+    new_strains: dict[int, STRAIN_DP] = {}
+    parts: list[_Part] = []
+    size = 0
+    for strain_pos, strain_dp in enumerate(strains):
+        new_strains[strain_pos] = strain_dp
+        deposits = list(strain_dp.values())
+        start = 0
+        while True:
+            end = start + _CHUNK_SIZE - size
+            parts.append((strain_pos, end >= len(deposits), deposits[start:end]))
+            size += len(deposits[start:end])
+            if size >= _CHUNK_SIZE:
+                yield new_strains, parts
+                new_strains, parts, size = {}, [], 0
+            if end >= len(deposits):
+                break
+            start = end
+    if len(parts) > 0:
+        yield new_strains, parts
+
+
+def assign_depositor_designations(
+    strains: Iterable[STRAIN_DP], manager: HistoryManager, workers: int, /
+) -> Iterable[list[tuple[int, int]]]:
+    """Assign the deposited strain designations for many strains.
+
+    The histories of all strains are parsed in one process pool,
+    small strains are packed together into chunks.
+    At most a few chunks per worker are in flight,
+    so the strains are read lazily.
+
+    Yields:
+        The pairs of `assign_depositor_designation` per strain in input order.
+    """
+    if workers <= 1:
+        for strain_dp in strains:
+            yield list(_assign_designation(strain_dp, manager, None))
+        return None
+    pending: deque[tuple[Future[list[list[HISTORY]]], list[_Part]]] = deque()
+    buffered: dict[int, tuple[STRAIN_DP, list[HISTORY]]] = {}
+    with create_history_pool(manager.version, workers) as pool:
+        packs = iter(_pack_strains(strains))
+        while True:
+            while (
+                len(pending) < workers * _WINDOW
+                and (pack := next(packs, None)) is not None
+            ):
+                new_strains, parts = pack
+                for strain_pos, strain_dp in new_strains.items():
+                    buffered[strain_pos] = (strain_dp, [])
+                pending.append(
+                    (
+                        pool.submit(
+                            _parse_histories_worker, [dep for _, _, dep in parts]
+                        ),
+                        parts,
+                    )
+                )
+            if len(pending) == 0:
+                break
+            future, parts = pending.popleft()
+            for (strain_pos, last, _), histories in zip(
+                parts, future.result(), strict=True
+            ):
+                buffered[strain_pos][1].extend(histories)
+                if last:
+                    strain_dp, strain_his = buffered.pop(strain_pos)
+                    yield list(_assign_designation(strain_dp, manager, strain_his))
+
+
+def history_has_cycle(history: list[tuple[int, int]], /) -> bool:
+    # history tuple(target <- source)
+    targets: set[int] = set()
+    for src, _ in history:
+        if src in targets:
             return True
-    return False
+        targets.add(src)
+    return len(find_cycle_members(history)) > 0
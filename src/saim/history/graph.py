@@ -0,0 +1,86 @@
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+
+
+def _create_graph(history: Iterable[tuple[int, int]], /) -> dict[int, list[int]]:
+    # history tuple(target <- source)
+    graph: dict[int, list[int]] = defaultdict(list)
+    for tar, src in history:
+        graph[tar].append(src)
+    return graph
+
+
+def _pop_component(stack: list[int], on_stack: set[int], root: int, /) -> list[int]:
+    component = []
+    while True:
+        node = stack.pop()
+        on_stack.discard(node)
+        component.append(node)
+        if node == root:
+            return component
+
+
+def find_cycle_members(history: Iterable[tuple[int, int]], /) -> set[int]:
+    """Finds all deposits being part of a cycle in a deposit history.
+
+    The strongly connected components are searched iteratively (Tarjan),
+    so the runtime is linear in the number of edges and long deposit chains
+    do not hit the recursion limit.
+
+    Args:
+        history: edges as tuple(target <- source).
+
+    Returns:
+        The members of all cycles, an empty set for an acyclic history.
+    """
+    graph = _create_graph(history)
+    index: dict[int, int] = {}
+    low: dict[int, int] = {}
+    stack: list[int] = []
+    on_stack: set[int] = set()
+    members: set[int] = set()
+    for root in list(graph):
+        if root in index:
+            continue
+        work = [(root, 0)]
+        while len(work) > 0:
+            node, pos = work[-1]
+            if node not in index:
+                index[node] = low[node] = len(index)
+                stack.append(node)
+                on_stack.add(node)
+            sources = graph.get(node, [])
+            if pos < len(sources):
+                work[-1] = (node, pos + 1)
+                if (nxt := sources[pos]) not in index:
+                    work.append((nxt, 0))
+                elif nxt in on_stack:
+                    low[node] = min(low[node], index[nxt])
+                continue
+            work.pop()
+            if len(work) > 0:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = _pop_component(stack, on_stack, node)
+                if len(component) > 1 or node in sources:
+                    members.update(component)
+    return members
+
+
+def find_all_cycle_members[K](
+    histories: Mapping[K, Iterable[tuple[int, int]]], /
+) -> dict[K, set[int]]:
+    """Finds the cycle members for a batch of deposit histories.
+
+    Args:
+        histories: edge lists as tuple(target <- source) keyed by strain.
+
+    Returns:
+        The cycle members for each strain with at least one cycle.
+    """
+    results: dict[K, set[int]] = {}
+    for key, history in histories.items():
+        if len(members := find_cycle_members(history)) > 0:
+            results[key] = members
+    return results
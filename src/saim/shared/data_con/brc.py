@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from typing import Never, final
 
 from cafi.container.acr_db import AcrDbEntry
-from saim.shared.search.radix_tree import RadixTree
+from saim.shared.search.radix_tree import PrefixIndex, RadixTree
 
 
 @final
@@ -22,3 +22,7 @@ class BrcContainer:
     f_cc_db_code: dict[str, set[int]]
     kn_acr: RadixTree[Never]
     kn_acr_rev: RadixTree[Never]
+    kn_acr_rev_idx: PrefixIndex = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "kn_acr_rev_idx", PrefixIndex(self.kn_acr_rev))
@@ -16,7 +16,7 @@ from pydantic import (
 )
 
 from saim.shared.data_con.plugins.sample import Sample
-from saim.designation.manager import AcronymManager
+from saim.designation.manager import AcronymLookup
 from saim.shared.data_con.plugins.dep_iso import Deposition, Isolation
 from saim.shared.parse.sequence import check_sequence
 from saim.shared.parse.string import (
@@ -156,7 +156,7 @@ class CultureCCNo(BaseModel):
         super().__init__(**data)
         self._strict = mode
 
-    def __check_known_acr(self, acr_man: AcronymManager, /) -> None:
+    def __check_known_acr(self, acr_man: AcronymLookup, /) -> None:
         if self.brc_id not in acr_man.identify_acr(self.acr):
             raise ValueError(f"mismatch brc_id - {self.ccno} | {self.brc_id}")
         kn_acr = acr_man.identify_ccno_by_brc(self.ccno, self.brc_id)
@@ -171,7 +171,7 @@ class CultureCCNo(BaseModel):
         if kn_acr.id.suf.lower() != self.id.suf.lower():
             raise ValueError(f"mismatch id suffix - {self.id.suf} | {kn_acr.id.suf}")
 
-    def check_known_acr(self, acr_man: AcronymManager | None, /) -> None:
+    def check_known_acr(self, acr_man: AcronymLookup | None, /) -> None:
         if acr_man is not None:
             self.__check_known_acr(acr_man)
 
@@ -213,7 +213,7 @@ class CultureCCNo(BaseModel):
     def to_dict(
         self,
         tax_man: TaxonManager | None = None,
-        acr_man: AcronymManager | None = None,
+        acr_man: AcronymLookup | None = None,
         trim: bool = True,
         /,
     ) -> dict[str, Any]:
@@ -248,7 +248,7 @@ class CultureCCNo(BaseModel):
     def to_json(
         self,
         tax_man: TaxonManager | None = None,
-        acr_man: AcronymManager | None = None,
+        acr_man: AcronymLookup | None = None,
         /,
     ) -> str:
         return unicodedata.normalize(
@@ -257,7 +257,7 @@ class CultureCCNo(BaseModel):
 
 
 def run_patch_check(
-    con: CultureCCNo, tax_man: TaxonManager | None, acr_man: AcronymManager | None, /
+    con: CultureCCNo, tax_man: TaxonManager | None, acr_man: AcronymLookup | None, /
 ) -> None:
     con.check_known_acr(acr_man)
     con.patch_taxon_name(tax_man)
@@ -80,6 +80,15 @@ class CCNoDes:
     designation: str = ""
 
 
+@final
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CCNoDesSpan:
+    # [start, end) of the CCNo in the searched text
+    start: int
+    end: int
+    ccno: CCNoDes
+
+
 @final
 class CCNoIdM(BaseModel):
     model_config = ConfigDict(frozen=True, extra="forbid", validate_default=False)
@@ -0,0 +1,223 @@
+import atexit
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from functools import wraps
+import json
+import os
+from pathlib import Path
+import re
+from threading import Lock
+import time
+from typing import Any, Final, final
+
+# upper bounds in seconds, the last bucket is +Inf
+_BUCKETS: Final[tuple[float, ...]] = (
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+_PROM_NAME: Final[re.Pattern[str]] = re.compile(r"[^a-zA-Z0-9_]")
+_DISABLED: Final[nullcontext[None]] = nullcontext()
+ENV_METRICS_DIR: Final[str] = "SAIM_METRICS_DIR"
+
+
+@final
+class _Histogram:
+    __slots__ = ("buckets", "count", "max", "min", "total")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        super().__init__()
+
+    def observe(self, seconds: float, /) -> None:
+        self.buckets[bisect_left(_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def merge(self, snapshot: dict[str, Any], /) -> None:
+        for ind, cnt in enumerate(snapshot["buckets"]):
+            self.buckets[ind] += cnt
+        self.count += snapshot["count"]
+        self.total += snapshot["sum"]
+        self.min = min(self.min, snapshot["min"])
+        self.max = max(self.max, snapshot["max"])
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min if self.count > 0 else 0.0,
+            "max": self.max,
+            "buckets": list(self.buckets),
+        }
+
+
+def _prom_name(name: str, suffix: str = "", /) -> str:
+    if suffix == "":
+        return f"saim_{_PROM_NAME.sub('_', name)}"
+    return f"saim_{_PROM_NAME.sub('_', name)}_{suffix}"
+
+
+@final
+class MetricsRegistry:
+    """Opt-in registry for stage timings, counters and gauges.
+
+    When disabled, timers return a shared no-op context
+    and counters return after a single attribute check.
+    """
+
+    __slots__ = ("__counters", "__enabled", "__gauges", "__lock", "__timers")
+
+    def __init__(self) -> None:
+        self.__enabled = False
+        self.__lock = Lock()
+        self.__counters: dict[str, int] = {}
+        self.__gauges: dict[str, float] = {}
+        self.__timers: dict[str, _Histogram] = {}
+        super().__init__()
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+    def enable(self) -> None:
+        self.__enabled = True
+
+    def disable(self) -> None:
+        self.__enabled = False
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.__counters = {}
+            self.__gauges = {}
+            self.__timers = {}
+
+    def count(self, name: str, value: int = 1, /) -> None:
+        if not self.__enabled:
+            return None
+        with self.__lock:
+            self.__counters[name] = self.__counters.get(name, 0) + value
+
+    def gauge(self, name: str, value: float, /) -> None:
+        if not self.__enabled:
+            return None
+        with self.__lock:
+            self.__gauges[name] = value
+
+    def observe(self, name: str, seconds: float, /) -> None:
+        if not self.__enabled:
+            return None
+        with self.__lock:
+            if (hist := self.__timers.get(name)) is None:
+                hist = _Histogram()
+                self.__timers[name] = hist
+            hist.observe(seconds)
+
+    @contextmanager
+    def __timed(self, name: str, /) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield None
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timer(self, name: str, /) -> AbstractContextManager[None]:
+        if not self.__enabled:
+            return _DISABLED
+        return self.__timed(name)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self.__lock:
+            return {
+                "buckets": list(_BUCKETS),
+                "counters": dict(self.__counters),
+                "gauges": dict(self.__gauges),
+                "timers": {name: hist.to_dict() for name, hist in self.__timers.items()},
+            }
+
+    def merge(self, snapshot: dict[str, Any], /) -> None:
+        with self.__lock:
+            for name, value in snapshot.get("counters", {}).items():
+                self.__counters[name] = self.__counters.get(name, 0) + value
+            # gauges are point-in-time values, the highest one across processes wins
+            for name, value in snapshot.get("gauges", {}).items():
+                self.__gauges[name] = max(self.__gauges.get(name, value), value)
+            for name, hist_snap in snapshot.get("timers", {}).items():
+                if (hist := self.__timers.get(name)) is None:
+                    hist = _Histogram()
+                    self.__timers[name] = hist
+                hist.merge(hist_snap)
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        lines: list[str] = []
+        for name, value in sorted(snapshot["counters"].items()):
+            prom = _prom_name(name, "total")
+            lines.extend((f"# TYPE {prom} counter", f"{prom} {value}"))
+        for name, value in sorted(snapshot["gauges"].items()):
+            prom = _prom_name(name)
+            lines.extend((f"# TYPE {prom} gauge", f"{prom} {value}"))
+        for name, hist in sorted(snapshot["timers"].items()):
+            prom = _prom_name(name, "seconds")
+            lines.append(f"# TYPE {prom} histogram")
+            cumulative = 0
+            for bound, cnt in zip((*_BUCKETS, "+Inf"), hist["buckets"], strict=True):
+                cumulative += cnt
+                lines.append(f'{prom}_bucket{{le="{bound}"}} {cumulative}')
+            lines.extend((f"{prom}_sum {hist['sum']}", f"{prom}_count {hist['count']}"))
+        return "\n".join(lines) + "\n"
+
+
+METRICS: Final[MetricsRegistry] = MetricsRegistry()
+
+
+def timed[**P, T](name: str, /) -> Callable[[Callable[P, T]], Callable[P, T]]:
+    def decorator(func: Callable[P, T], /) -> Callable[P, T]:
+        @wraps(func)
+        def wrap(*args: P.args, **kwargs: P.kwargs) -> T:
+            if not METRICS.enabled:
+                return func(*args, **kwargs)
+            with METRICS.timer(name):
+                return func(*args, **kwargs)
+
+        return wrap
+
+    return decorator
+
+
+def dump_metrics(out_dir: Path, /) -> Path:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_file = out_dir / f"metrics_{os.getpid()}.json"
+    out_file.write_text(METRICS.to_json(), encoding="utf-8")
+    return out_file
+
+
+def load_metrics(in_dir: Path, /) -> MetricsRegistry:
+    registry = MetricsRegistry()
+    for in_file in sorted(in_dir.glob("metrics_*.json")):
+        registry.merge(json.loads(in_file.read_text(encoding="utf-8")))
+    return registry
+
+
+# spawned workers inherit the environment, so every process dumps its own snapshot
+if (_METRICS_DIR := os.environ.get(ENV_METRICS_DIR, "")) != "":
+    METRICS.enable()
+    atexit.register(dump_metrics, Path(_METRICS_DIR))
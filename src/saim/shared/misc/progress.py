@@ -0,0 +1,77 @@
+from collections.abc import Callable
+import time
+from typing import final
+
+
+def _format_duration(seconds: float, /) -> str:
+    minutes, sec = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{sec:02d}"
+
+
+@final
+class ProgressReport:
+    """Rate limited progress output with throughput and estimated time left.
+
+    A line is emitted at most once per interval,
+    an interval of zero or less reports every step.
+    """
+
+    __slots__ = (
+        "__clock",
+        "__done",
+        "__interval",
+        "__last",
+        "__out",
+        "__start",
+        "__total",
+    )
+
+    def __init__(
+        self,
+        total: int,
+        interval: float,
+        out: Callable[[str], None] = print,
+        clock: Callable[[], float] = time.monotonic,
+        /,
+    ) -> None:
+        self.__total = max(0, total)
+        self.__out = out
+        self.__clock = clock
+        self.__start = clock()
+        self.__interval = interval
+        self.__last = float("-inf")
+        self.__done = 0
+        super().__init__()
+
+    @property
+    def done(self) -> int:
+        return self.__done
+
+    def __rate(self, now: float, /) -> float:
+        elapsed = now - self.__start
+        return self.__done / elapsed if elapsed > 0 else 0.0
+
+    def __line(self, now: float, /) -> str:
+        rate = self.__rate(now)
+        line = f"PROGRESS - [{self.__done}/{self.__total}]"
+        if self.__total > 0:
+            line += f" - {int(self.__done / self.__total * 100)}%"
+        line += f" - {rate:.2f} tasks/s - elapsed {_format_duration(now - self.__start)}"
+        if rate > 0 and self.__total >= self.__done:
+            line += f" - eta {_format_duration((self.__total - self.__done) / rate)}"
+        return line
+
+    def step(self, count: int = 1, /) -> None:
+        self.__done += count
+        now = self.__clock()
+        if now - self.__last >= self.__interval:
+            self.__last = now
+            self.__out(self.__line(now))
+
+    def summary(self) -> str:
+        now = self.__clock()
+        return (
+            f"DONE - {self.__done} tasks in {_format_duration(now - self.__start)}"
+            f" - {self.__rate(now):.2f} tasks/s"
+        )
@@ -1,7 +1,7 @@
 import re
 
 from re import Pattern
-from typing import Final, Any, Iterable
+from typing import Callable, Final, Any, final
 
 from saim.shared.error.exceptions import DesignationEx
 
@@ -19,13 +19,45 @@ PATTERN_CORE_ID_TXT_R: Final[Pattern[str]] = re.compile(r"(\d+(?:\D\d+)*)")
 PATTERN_PREFIX_START_R: Final[Pattern[str]] = re.compile(r"^\W*([A-Za-z]+)\W*")
 PATTERN_THREE_GROUPS_R: Final[Pattern[str]] = re.compile(r"^(\D*)(\d+(?:\D\d+)*)(\D*)$")
 PATTERN_LEAD_ZERO_R: Final[re.Pattern[str]] = re.compile(r"^0*(?=\d+$)")
-PATTERN_SINGLE_WORD_CHAR_R: Final[Pattern[str]] = re.compile(r"^[A-Za-z0-9]$")
 PATTERN_TAG_R: Final[Pattern[str]] = re.compile(r"<[^<>]*>")
 PATTERN_BRACKETS_RL: Final[tuple[Pattern[str], ...]] = (
     re.compile(r"\([^)(]*\)"),
     re.compile(r"\[[^[\]]*\]"),
 )
 PATTERN_REDUNDANT_SPACE_R: Final[Pattern[str]] = re.compile(r"\s+(?=[\s,.:])")
+_WORD_CHARS: Final[frozenset[str]] = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+)
+_ID_SEP_CHARS: Final[frozenset[str]] = frozenset(",.:/_-")
+_DOUBLE_SEP: Final[str] = STR_DEFINED_SEP * 2
+
+
+@final
+class _WordCharTable(dict[int, int | None]):
+    """Lazily filled `str.translate` table for ASCII word characters.
+
+    Word characters are kept (optionally upper-cased), every other character
+    is mapped on `non_word` (`None` deletes it).
+    """
+
+    __slots__ = ("__non_word", "__upper")
+
+    def __init__(self, non_word: int | None, upper: bool, /) -> None:
+        self.__non_word = non_word
+        self.__upper = upper
+        super().__init__()
+
+    def __missing__(self, key: int, /) -> int | None:
+        char = chr(key)
+        mapped = self.__non_word
+        if char in _WORD_CHARS:
+            mapped = ord(char.upper()) if self.__upper else key
+        self[key] = mapped
+        return mapped
+
+
+_TAB_WORD_SEP: Final[_WordCharTable] = _WordCharTable(ord(STR_DEFINED_SEP), False)
+_TAB_WORD_UPPER: Final[_WordCharTable] = _WordCharTable(None, True)
 
 
 # new version of all the old functions:
@@ -47,28 +79,19 @@ def clean_string(text: str, /, *pattern_args: Pattern[str]) -> str:
     return clean_string
 
 
+def is_word_char(char: str, /) -> bool:
+    return char in _WORD_CHARS
+
+
 def replace_non_word_chars(input_str: str, /) -> str:
-    output_str = "".join(
-        char if PATTERN_SINGLE_WORD_CHAR_R.match(char) is not None else STR_DEFINED_SEP
-        for char in input_str
-    )
-    return PATTERN_SEPARATOR_MULTI_R.sub(STR_DEFINED_SEP, output_str)
-
-
-def replace_non_word_chars_iter(
-    input_str: str, start_pos: int, /
-) -> Iterable[tuple[str, int]]:
-    last_sep = False
-    for char_p in range(start_pos, len(input_str)):
-        new_char = input_str[char_p]
-        if PATTERN_SINGLE_WORD_CHAR_R.match(new_char) is None:
-            new_char = STR_DEFINED_SEP
-            if last_sep:
-                continue
-            last_sep = True
-        else:
-            last_sep = False
-        yield new_char, char_p
+    output_str = input_str.translate(_TAB_WORD_SEP)
+    if _DOUBLE_SEP in output_str:
+        return PATTERN_SEPARATOR_MULTI_R.sub(STR_DEFINED_SEP, output_str)
+    return output_str
+
+
+def remove_non_word_chars_upper(input_str: str, /) -> str:
+    return input_str.translate(_TAB_WORD_UPPER)
 
 
 def check_pattern(input_str: str, pattern: Pattern[str], /) -> None:
@@ -76,21 +99,63 @@ def check_pattern(input_str: str, pattern: Pattern[str], /) -> None:
         raise DesignationEx(f"String '{input_str}' has an invalid format")
 
 
+def _is_edge_char(char: str, /) -> bool:
+    # equivalent to [\W_]
+    return not char.isalnum()
+
+
+def _is_id_edge_char(char: str, /) -> bool:
+    # equivalent to PATTERN_SEP
+    return char in _ID_SEP_CHARS or char.isspace()
+
+
+def _edge_span(
+    text: str, start: int, end: int, is_edge: Callable[[str], bool], /
+) -> tuple[int, int]:
+    while start < end and is_edge(text[start]):
+        start += 1
+    while end > start and is_edge(text[end - 1]):
+        end -= 1
+    return start, end
+
+
+def edge_span(text: str, start: int = 0, end: int = -1, /) -> tuple[int, int]:
+    """Finds the bounds of a string without its leading and trailing non-word chars.
+
+    The result is identical to removing `PATTERN_EDGE_R` from `text[start:end]`,
+    but no intermediate string is created.
+
+    Args:
+        text (str): The string to inspect.
+        start (int): The first index to consider.
+        end (int): The index after the last char to consider, -1 for `len(text)`.
+
+    Returns:
+        tuple[int, int]: The start and end index of the cleaned string.
+    """
+    return _edge_span(text, start, len(text) if end < 0 else end, _is_edge_char)
+
+
 def clean_id_edges(val: Any) -> str:
     if type(val) is str:
-        return clean_string(val, PATTERN_ID_EDGE_R)
+        start, end = _edge_span(val, 0, len(val), _is_id_edge_char)
+        return val[start:end]
     return ""
 
 
 def clean_core_id_edges(val: Any) -> str:
     if type(val) is str:
+        # cores are usually already clean, long non-digit edges are faster in re
+        if val == "" or (val[0].isdecimal() and val[-1].isdecimal()):
+            return val
         return clean_string(val, PATTERN_CORE_ID_EDGE_R)
     return ""
 
 
 def clean_edges(val: Any) -> str:
     if type(val) is str:
-        return clean_string(val, PATTERN_EDGE_R)
+        start, end = _edge_span(val, 0, len(val), _is_edge_char)
+        return val[start:end]
     return ""
 
 
@@ -1,28 +1,27 @@
-import re
-
-from re import Pattern
-from typing import Iterable, final, Final
+from array import array
+from typing import Any, Iterable, final, Final
 
 from saim.shared.parse.string import (
-    PATTERN_SINGLE_WORD_CHAR_R,
     STR_DEFINED_SEP,
+    is_word_char,
     replace_non_word_chars,
-    replace_non_word_chars_iter,
 )
 
 
 _SET_BRACETS_CLOSE: Final[set[str]] = {")", "]"}
-_PATTERN_TWO_CHAR: Final[Pattern[str]] = re.compile(r"^[A-Za-z]{2}$")
-_PATTERN_TWO_NUM: Final[Pattern[str]] = re.compile(r"^[0-9]{2}$")
+_ASCII_LETTERS: Final[frozenset[str]] = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+)
+_ASCII_DIGITS: Final[frozenset[str]] = frozenset("0123456789")
 
 
 def _merge_lead_string_sep(string: str, /) -> str:
     # string is empty or starts with valid char
-    if string == "" or PATTERN_SINGLE_WORD_CHAR_R.match(string[0]) is not None:
+    if string == "" or is_word_char(string[0]):
         return string
     found = 1
     for pos in range(1, len(string)):
-        if PATTERN_SINGLE_WORD_CHAR_R.match(string[pos]) is not None:
+        if is_word_char(string[pos]):
             found = pos
             break
     if string[found:] == "":
@@ -51,6 +50,8 @@ class RadixTree[T]:
 
     Attributes:
         con (tuple[_RQP[T], ...]): Child nodes keyed by character.
+        edges (dict[str, _RQP[T]]): The child nodes by the first char of their key,
+            filled when the node is compacted.
         end (bool): True if this node represents the end of a word.
         index (tuple[T, ...]): Associated index or data for this node.
         max (int): The maximum length of a substring key among this
@@ -63,7 +64,7 @@ class RadixTree[T]:
         index (tuple[T, ...]): Tuple of associated data or index values.
     """
 
-    __slots__ = ("con", "end", "index", "max", "ready")
+    __slots__ = ("con", "edges", "end", "index", "max", "ready")
 
     def __init__(self, init: str, index: tuple[T, ...], /) -> None:
         mer_init = _merge_lead_string_sep(init)
@@ -73,6 +74,7 @@ class RadixTree[T]:
             self.index = index
         self.ready: bool = False
         self.con: tuple[_RQP[T], ...] = tuple()
+        self.edges: dict[str, _RQP[T]] = {}
         self.max = 1
         if mer_init:
             self.con = ((mer_init[0].upper(), RadixTree[T](mer_init[1:], index)),)
@@ -157,6 +159,8 @@ def radix_add[T](radix: RadixTree[T], to_add: str, index: tuple[T, ...], /) -> N
 def radix_compact[T](radix: RadixTree[T], /) -> None:
     if not radix.ready:
         _compact(radix)
+        # the first chars of the keys are unique among siblings
+        radix.edges = {key[0]: (key, node) for key, node in radix.con}
         radix.ready = True
 
 
@@ -164,84 +168,189 @@ def radix_keys[T](radix: RadixTree[T], /) -> list[str]:
     return list(key for key, _ in radix.con)
 
 
-@final
-class _SOMap:
-    __slots__ = ("__map_seq", "__org_len", "__origin", "__short")
+def _radix_path(key: str, /) -> str:
+    # the chars radix_add would use as node keys for this string,
+    # a trailing run of separators keeps one separator per char but the last
+    trail = 0
+    while trail < len(key) and not is_word_char(key[-1 - trail]):
+        trail += 1
+    path = replace_non_word_chars(key).upper()
+    if trail == 0:
+        return path
+    return path[:-1] + STR_DEFINED_SEP * (trail - 1)
+
+
+def _path_tokens(path: str, /) -> list[str]:
+    # compacted keys: single separators and maximal runs of other chars
+    tokens: list[str] = []
+    start = 0
+    for pos, char in enumerate(path):
+        if char == STR_DEFINED_SEP:
+            if pos > start:
+                tokens.append(path[start:pos])
+            tokens.append(STR_DEFINED_SEP)
+            start = pos + 1
+    if start < len(path):
+        tokens.append(path[start:])
+    return tokens
+
+
+type _BulkKey[T] = tuple[str, int, tuple[T, ...]]
+
+
+def _new_node[T](con: tuple[_RQP[T], ...], /) -> RadixTree[T]:
+    node: RadixTree[T] = RadixTree.__new__(RadixTree)
+    node.end = False
+    node.index = tuple()
+    node.con = con
+    node.edges = {key[0]: (key, child) for key, child in con}
+    node.max = max((len(key) for key, _ in con), default=1)
+    node.ready = True
+    return node
+
+
+def _end_index[T](
+    keys: list[_BulkKey[T]], lo: int, end: int, first_seq: int, /
+) -> tuple[T, ...]:
+    # the first key creates the end node with its own index,
+    # unless an earlier key already created the node on its way down
+    _, seq, index = keys[lo]
+    merged: tuple[T, ...] = tuple(set(index)) if first_seq < seq else index
+    for _, _, add in keys[lo + 1 : end]:
+        if len(add) > 0:
+            merged = tuple(set(merged) | set(add))
+    return merged
+
+
+def _build_chain[T](tail: str, end_node: RadixTree[T], /) -> RadixTree[T]:
+    node = end_node
+    for token in reversed(_path_tokens(tail)):
+        node = _new_node(((token, node),))
+    return node
+
+
+def _merge_child[T](char: str, child: RadixTree[T], /) -> _RQP[T] | None:
+    if (
+        char != STR_DEFINED_SEP
+        and not child.end
+        and len(child.con) == 1
+        and child.con[0][0] != STR_DEFINED_SEP
+    ):
+        key, grand = child.con[0]
+        return f"{char}{key}", grand
+    return None
 
-    def __init__(self, origin: str, short: str, /) -> None:
-        super().__init__()
-        self.__map_seq = {}  # mapping idx of short on idx of origin
-        self.__origin = origin
-        self.__org_len = len(self.__origin)
-        self.__short = short
-        running_offset = 0
-        for sh_i, char in enumerate(short):
-            while char != origin[running_offset + sh_i] and char != STR_DEFINED_SEP:
-                running_offset += 1
-            self.__map_seq[sh_i] = running_offset + sh_i
-
-    @property
-    def short_seq(self) -> str:
-        return self.__short
-
-    def map_seq(self, last_ind: int, /) -> str:
-        if last_ind == -1:
-            return ""
-        # last_ind = idx of short
-        # mapped_pos = equivalent pos in origin
-        mapped_pos = self.__map_seq[last_ind]
-        if (
-            self.__org_len > mapped_pos + 1
-            and self.__origin[mapped_pos + 1] in _SET_BRACETS_CLOSE
-        ):
-            mapped_pos += 1
-        # return the full original until the end of short,
-        # with clean cutoff at the end, including brackets
-        # but not extra chars of any kind
-        return self.__origin[0 : mapped_pos + 1]
-
-    def is_clearly_sep(self, pos: int, /) -> bool:
-        return _is_clearly_sep(pos, self.__origin)
+
+def _build_range[T](
+    keys: list[_BulkKey[T]], lo: int, hi: int, depth: int, /
+) -> tuple[RadixTree[T], int]:
+    # returns the node for the common prefix and the first insertion in its subtree
+    end = lo
+    while end < hi and len(keys[end][0]) == depth:
+        end += 1
+    if end < hi and keys[end][0] == keys[hi - 1][0]:
+        # a single remaining path becomes one chain of compacted nodes
+        leaf: RadixTree[T] = _new_node(tuple())
+        leaf.end, leaf.index = True, _end_index(keys, end, hi, keys[end][1])
+        node = _build_chain(keys[end][0][depth:], leaf)
+        first_seq = keys[end][1]
+    else:
+        # children with the insertion order of their first key
+        plain: list[tuple[int, _RQP[T]]] = []
+        merged: list[tuple[int, _RQP[T]]] = []
+        first_seq = keys[lo][1] if end > lo else len(keys)
+        start = end
+        while start < hi:
+            char = keys[start][0][depth]
+            stop = start + 1
+            while stop < hi and keys[stop][0][depth] == char:
+                stop += 1
+            child, child_seq = _build_range(keys, start, stop, depth + 1)
+            first_seq = min(first_seq, child_seq)
+            if (to_merge := _merge_child(char, child)) is not None:
+                merged.append((child_seq, to_merge))
+            else:
+                plain.append((child_seq, (char, child)))
+            start = stop
+        plain.sort(key=lambda item: item[0])
+        merged.sort(key=lambda item: item[0])
+        node = _new_node(tuple(item for _, item in (*plain, *merged)))
+    if end > lo:
+        first_seq = min(first_seq, keys[lo][1])
+        node.end, node.index = True, _end_index(keys, lo, end, first_seq)
+    return node, first_seq
+
+
+def radix_build[T](keys: Iterable[tuple[str, tuple[T, ...]]], /) -> RadixTree[T] | None:
+    """Builds a compacted radix tree from all keys at once.
+
+    The keys are sorted once and the tree is created bottom-up,
+    the result equals adding the keys in the given order with `radix_add`
+    followed by `radix_compact`.
+
+    Args:
+        keys: the strings with their associated index values.
+
+    Returns:
+        The compacted tree, or None if no keys were given.
+    """
+    bulk: list[_BulkKey[T]] = [
+        (_radix_path(key), seq, index) for seq, (key, index) in enumerate(keys)
+    ]
+    if len(bulk) == 0:
+        return None
+    bulk.sort(key=lambda item: (item[0], item[1]))
+    return _build_range(bulk, 0, len(bulk), 0)[0]
+
+
+def _short_positions(origin: str, short: str, /) -> array[int]:
+    # maps each index of the normalized short string on the index in origin
+    positions = array("l", bytes(len(short) * array("l").itemsize))
+    running_offset = 0
+    for sh_i, char in enumerate(short):
+        while char != origin[running_offset + sh_i] and char != STR_DEFINED_SEP:
+            running_offset += 1
+        positions[sh_i] = running_offset + sh_i
+    return positions
+
+
+def _map_seq(origin: str, mapped_pos: int, /) -> str:
+    # return the full original until the end of short,
+    # with clean cutoff at the end, including brackets
+    # but not extra chars of any kind
+    if len(origin) > mapped_pos + 1 and origin[mapped_pos + 1] in _SET_BRACETS_CLOSE:
+        mapped_pos += 1
+    return origin[0 : mapped_pos + 1]
 
 
 def _is_clearly_sep(pos: int, text: str, /) -> bool:
     if len(text) > pos + 1:
-        two_chars = text[pos : pos + 2]
-        if _PATTERN_TWO_CHAR.match(two_chars) is not None:
+        first, second = text[pos], text[pos + 1]
+        if first in _ASCII_LETTERS and second in _ASCII_LETTERS:
             return False
-        if _PATTERN_TWO_NUM.match(two_chars) is not None:
+        if first in _ASCII_DIGITS and second in _ASCII_DIGITS:
             return False
     return True
 
 
-def _search_node[T](
-    radix: RadixTree[T], to_find: str, /
-) -> tuple[bool, tuple[T, ...], RadixTree[T] | None]:
-    node = radix_get_next(radix, to_find)
-    if node is None:
-        return False, tuple(), node
-    return node.end, node.index, node
-
-
 def _search[T](
-    radix: RadixTree[T],
-    to_find: _SOMap,
-    start: int,
-    container: dict[int, tuple[T, ...]],
-    /,
-) -> None:
-    to_sea = to_find.short_seq[start : start + radix.max]
-    if to_sea != "":
-        max_ind = len(to_sea)
-        for ind in range(0, max_ind):
-            sea_sub = to_sea[0 : max_ind - ind]
-            end_node, end_index, next_node = _search_node(radix, sea_sub)
-            if next_node:
-                next_start = start + max_ind - ind
-                mom_pos = next_start - 1
-                _search(next_node, to_find, next_start, container)
-                if end_node and to_find.is_clearly_sep(mom_pos) and mom_pos > 0:
-                    container[mom_pos] = end_index
+    radix: RadixTree[T], short: str, origin: str, /
+) -> list[tuple[int, tuple[T, ...]]]:
+    # the separator check runs on the short index
+    found: list[tuple[int, tuple[T, ...]]] = []
+    node, start, short_len = radix, 0, len(short)
+    while start < short_len:
+        edge = node.edges.get(short[start])
+        if edge is None or not short.startswith(edge[0], start):
+            break
+        key, node = edge
+        start += len(key)
+        mom_pos = start - 1
+        if node.end and _is_clearly_sep(mom_pos, origin) and mom_pos > 0:
+            found.append((mom_pos, node.index))
+    # deeper matches first
+    found.reverse()
+    return found
 
 
 def is_full_match[T](radix: RadixTree[T], to_sea: str, /) -> tuple[bool, tuple[T, ...]]:
@@ -250,11 +359,9 @@ def is_full_match[T](radix: RadixTree[T], to_sea: str, /) -> tuple[bool, tuple[T
     f_sea_fixed = replace_non_word_chars(f_sea)
     if f_sea_fixed == "":
         return False, tuple()
-    mapper = _SOMap(f_sea, f_sea_fixed)
-    found_pos: dict[int, tuple[T, ...]] = dict()
-    _search(radix, mapper, 0, found_pos)
-    if len(found_pos) > 0 and (last_id := max(found_pos)) == len(to_sea) - 1:
-        return True, found_pos.get(last_id, tuple())
+    found_pos = _search(radix, f_sea_fixed, f_sea)
+    if len(found_pos) > 0 and found_pos[0][0] == len(to_sea) - 1:
+        return True, found_pos[0][1]
     return False, tuple()
 
 
@@ -268,42 +375,55 @@ def find_first_match_with_fix[T](
     f_sea_fix = replace_non_word_chars(f_sea)
     if f_sea_fix == "":
         return []
-    mapper = _SOMap(f_sea, f_sea_fix)
-    found_pos: dict[int, tuple[T, ...]] = dict()
-    _search(radix, mapper, 0, found_pos)
-    return [(mapper.map_seq(pos), index) for pos, index in found_pos.items()]
-
-
-def _create_sea[T](
-    radix: RadixTree[T], full_txt: str, start: int, /
-) -> Iterable[tuple[str, int]]:
-    to_find = iter(replace_non_word_chars_iter(full_txt, start))
-    to_sea = 0
-    while to_sea < radix.max:
-        try:
-            iter_char, iter_pos = next(to_find)
-            to_sea += 1
-            yield iter_char.upper(), iter_pos
-        except StopIteration:
-            break
+    found_pos = _search(radix, f_sea_fix, f_sea)
+    if len(found_pos) == 0:
+        return []
+    positions = _short_positions(f_sea, f_sea_fix)
+    return [(_map_seq(f_sea, positions[pos]), index) for pos, index in found_pos]
+
+
+def _match_key(key: str, full_txt: str, start: int, /) -> int:
+    # compares the key with the normalized text starting fresh at start,
+    # returns the text index of the last compared char or -1
+    txt_pos, txt_len, last_sep = start, len(full_txt), False
+    for key_char in key:
+        while txt_pos < txt_len:
+            char = full_txt[txt_pos]
+            if is_word_char(char):
+                last_sep = False
+                break
+            if not last_sep:
+                last_sep = True
+                char = STR_DEFINED_SEP
+                break
+            txt_pos += 1
+        else:
+            return -1
+        if char.upper() != key_char:
+            return -1
+        txt_pos += 1
+    return txt_pos - 1
 
 
 def _search_simple[T](
     radix: RadixTree[T], full_txt: str, start: int, /
-) -> Iterable[tuple[T, ...]]:
-    to_sea_con = tuple(_create_sea(radix, full_txt, start))
-    max_ind = len(to_sea_con)
-    if max_ind > 0:
-        for ind in range(0, max_ind):
-            sea_sub = "".join(txt for txt, *_ in to_sea_con[0 : max_ind - ind])
-            end_node, end_index, next_node = _search_node(radix, sea_sub)
-            if next_node:
-                *_, mom_pos = to_sea_con[max_ind - ind - 1]
-                next_start = mom_pos + 1
-                for next_node_res in _search_simple(next_node, full_txt, next_start):
-                    yield next_node_res
-                if end_node and _is_clearly_sep(mom_pos, full_txt) and mom_pos > 0:
-                    yield end_index
+) -> list[tuple[T, ...]]:
+    found: list[tuple[T, ...]] = []
+    node, txt_len = radix, len(full_txt)
+    while start < txt_len:
+        char = full_txt[start]
+        first = char.upper() if is_word_char(char) else STR_DEFINED_SEP
+        if (edge := node.edges.get(first)) is None:
+            break
+        key, node = edge
+        if (mom_pos := _match_key(key, full_txt, start)) < 0:
+            break
+        if node.end and _is_clearly_sep(mom_pos, full_txt) and mom_pos > 0:
+            found.append(node.index)
+        start = mom_pos + 1
+    # deeper matches first
+    found.reverse()
+    return found
 
 
 def find_first_match_simple[T](
@@ -311,3 +431,162 @@ def find_first_match_simple[T](
 ) -> Iterable[tuple[T, ...]]:
     radix_compact(radix)
     yield from _search_simple(radix, to_sea, pos)
+
+
+def _next_row(
+    rows: tuple[list[int], list[int]],
+    key_char: str,
+    last_char: str,
+    query: str,
+    depth: int,
+    max_dist: int,
+    /,
+) -> list[int]:
+    # next row of the edit distance matrix, the key char against every query prefix,
+    # swapping two adjacent chars counts as one edit (optimal string alignment);
+    # cells farther than max_dist from the diagonal cannot be within max_dist,
+    # so only the band is computed and everything else is capped at max_dist + 1
+    before, row = rows
+    cap = max_dist + 1
+    nxt = [cap] * len(row)
+    nxt[0] = min(depth, cap)
+    for pos in range(max(1, depth - max_dist), min(len(query), depth + max_dist) + 1):
+        char = query[pos - 1]
+        cost = min(nxt[pos - 1] + 1, row[pos] + 1, row[pos - 1] + (char != key_char))
+        if pos > 1 and char == last_char and query[pos - 2] == key_char:
+            cost = min(cost, before[pos - 2] + 1)
+        nxt[pos] = min(cost, cap)
+    return nxt
+
+
+def _fuzzy_ends(query: str, prefix: bool, /) -> list[int]:
+    # query lengths a key may be compared against
+    if not prefix:
+        return [len(query)]
+    return [pos + 1 for pos in range(len(query)) if _is_clearly_sep(pos, query)]
+
+
+def _fuzzy_edges[T](
+    node: RadixTree[T],
+    rows: tuple[list[int], list[int]],
+    path: str,
+    query: str,
+    max_dist: int,
+    /,
+) -> Iterable[_RQP[T]]:
+    # a first char missing in the query window yields the same row for every child,
+    # if that row is out of range only the children starting with a window char remain
+    depth = len(path) + 1
+    miss = _next_row(rows, "", path[-1:], query, depth, max_dist)
+    if min(miss) <= max_dist:
+        return node.con
+    window = set(query[max(0, depth - max_dist - 2) : depth + max_dist])
+    return [edge for char in window if (edge := node.edges.get(char)) is not None]
+
+
+def find_fuzzy_matches[T](
+    radix: RadixTree[T], to_sea: str, max_dist: int, prefix: bool = False, /
+) -> list[tuple[str, int, tuple[T, ...]]]:
+    """Finds all keys within an edit distance of the normalized text.
+
+    Insertions, deletions, substitutions, and swaps of two adjacent chars
+    count as one edit each (optimal string alignment).
+
+    The distance matrix is computed row by row while walking the tree,
+    so shared key prefixes are compared once and a branch is dropped
+    as soon as no cell of its last row is within `max_dist`.
+    With `prefix` the keys are compared against every prefix of the text
+    ending at a clear separator and the smallest distance is kept.
+
+    Returns:
+        list[tuple[str, int, tuple[T, ...]]]: The normalized keys, their distance,
+            and their index, ordered by distance and key.
+    """
+    radix_compact(radix)
+    query = replace_non_word_chars(to_sea.upper())
+    if query == "" or max_dist < 0:
+        return []
+    ends = _fuzzy_ends(query, prefix)
+    found: list[tuple[str, int, tuple[T, ...]]] = []
+    first = [min(pos, max_dist + 1) for pos in range(len(query) + 1)]
+    stack: list[tuple[RadixTree[T], str, tuple[list[int], list[int]]]] = [
+        (radix, "", (first, first))
+    ]
+    while len(stack) > 0:
+        node, path, rows = stack.pop()
+        for key, child in _fuzzy_edges(node, rows, path, query, max_dist):
+            cur, last_char, depth = rows, path[-1:], len(path)
+            for char in key:
+                depth += 1
+                cur = (cur[1], _next_row(cur, char, last_char, query, depth, max_dist))
+                last_char = char
+                if min(cur[1]) > max_dist:
+                    break
+            else:
+                c_path = f"{path}{key}"
+                if child.end and (dist := min(cur[1][end] for end in ends)) <= max_dist:
+                    found.append((c_path, dist, child.index))
+                stack.append((child, c_path, cur))
+    found.sort(key=lambda res: (res[1], res[0]))
+    return found
+
+
+_ROOT: Final[int] = 0
+
+
+@final
+class PrefixIndex:
+    """Char-level view of a radix tree to find all keys prefixing a text in one pass.
+
+    The text is normalized while walking, exactly like in `find_first_match_with_fix`,
+    but neither a normalized copy nor a position map is created.
+    Built from a tree of reversed keys, it finds every key ending at a text position.
+    """
+
+    __slots__ = ("__end", "__next")
+
+    def __init__(self, radix: RadixTree[Any], /) -> None:
+        radix_compact(radix)
+        self.__next: list[dict[str, int]] = [{}]
+        self.__end: list[bool] = [radix.end]
+        stack: list[tuple[int, RadixTree[Any]]] = [(_ROOT, radix)]
+        while len(stack) > 0:
+            node_id, node = stack.pop()
+            for key, child in node.con:
+                cur = node_id
+                for char in key:
+                    nxt = len(self.__next)
+                    cur = self.__next[cur].setdefault(char, nxt)
+                    if cur == nxt:
+                        self.__next.append({})
+                        self.__end.append(False)
+                self.__end[cur] = child.end
+                stack.append((cur, child))
+        super().__init__()
+
+    def find_prefixes(self, to_sea: str, /) -> list[str]:
+        f_sea = to_sea.upper()
+        nexts, ends = self.__next, self.__end
+        # short index and origin index of every accepted key end
+        found: list[tuple[int, int]] = []
+        node, sh_pos, last_sep = _ROOT, -1, False
+        for org_pos, char in enumerate(f_sea):
+            if is_word_char(char):
+                last_sep = False
+            elif last_sep:
+                continue
+            else:
+                char, last_sep = STR_DEFINED_SEP, True
+            sh_pos += 1
+            if (nxt := nexts[node].get(char)) is None:
+                break
+            node = nxt
+            # the separator check runs on the short index, as in `_search`
+            if ends[node] and sh_pos > 0 and _is_clearly_sep(sh_pos, f_sea):
+                found.append((sh_pos, org_pos))
+        res = []
+        for _, org_pos in reversed(found):
+            if len(f_sea) > org_pos + 1 and f_sea[org_pos + 1] in _SET_BRACETS_CLOSE:
+                org_pos += 1
+            res.append(f_sea[0 : org_pos + 1])
+        return res
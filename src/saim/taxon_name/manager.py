@@ -17,8 +17,9 @@ from saim.shared.data_con.taxon import (
 )
 from saim.shared.error.exceptions import GlobalManagerEx, RequestURIEx, ValidationEx
 from saim.shared.error.warnings import ManagerWarn
+from saim.shared.misc.metrics import METRICS, timed
 from saim.shared.parse.general import pa_int
-from saim.shared.search.radix_tree import RadixTree, radix_add
+from saim.shared.search.radix_tree import RadixTree, radix_build
 from saim.taxon_name.extract_taxa import extract_taxa_from_text
 from saim.taxon_name.private.container import (
     CorTaxonNameId,
@@ -159,11 +160,13 @@ class TaxonManager:
             cleaned = cleaned[0].upper() + cleaned[1:].lower()
         for cleaner in _NAME_CLEAN:
             cleaned = cleaner.sub("", cleaned)
-        return (
-            cleaned,
-            self.__gbif.get_name(cleaned),
-        )
+        with METRICS.timer("taxon.gbif"):
+            return (
+                cleaned,
+                self.__gbif.get_name(cleaned),
+            )
 
+    @timed("taxon.get_patched_name")
     @_verify_date
     def get_patched_name(self, name: str, /) -> str:
         cl_name, tax_name = self.__prep_name(name)
@@ -177,6 +180,7 @@ class TaxonManager:
             return cl_name
         return ""
 
+    @timed("taxon.get_correct_name")
     @_verify_date
     def get_correct_name(
         self, name: str, ncbi_id: int = -1, lpsn_id: int = -1, /
@@ -187,8 +191,10 @@ class TaxonManager:
         def fun(nam: str) -> CorTaxonNameId:
             return CorTaxonNameId(name=nam)
 
-        ncbi = self._ncbi.get_correct_name(cl_name, ncbi_id)
-        lpsn = self.__lpsn.get_correct_name(cl_name, lpsn_id)
+        with METRICS.timer("taxon.ncbi"):
+            ncbi = self._ncbi.get_correct_name(cl_name, ncbi_id)
+        with METRICS.timer("taxon.lpsn"):
+            lpsn = self.__lpsn.get_correct_name(cl_name, lpsn_id)
         _fill_con(cor_names, ncbi, lambda con, nid: con.ncbi.add(nid), fun)
         _fill_con(cor_names, lpsn, lambda con, lid: con.lpsn.add(lid), fun)
         return [cor_nam for cor_nam in cor_names.values()]
@@ -201,13 +207,14 @@ class TaxonManager:
         eval: Callable[[T], bool],
         /,
     ) -> list[tuple[T, int]]:
-        if lpsn_id > 0 and eval(lpsn_val := get_lpsn(lpsn_id)):
-            return [(lpsn_val, lpsn_id)]
-        return [
-            (lpsn_val, lid)
-            for _, lid in self.__lpsn.get_name([name])
-            if eval(lpsn_val := get_lpsn(lid))
-        ]
+        with METRICS.timer("taxon.lpsn"):
+            if lpsn_id > 0 and eval(lpsn_val := get_lpsn(lpsn_id)):
+                return [(lpsn_val, lpsn_id)]
+            return [
+                (lpsn_val, lid)
+                for _, lid in self.__lpsn.get_name([name])
+                if eval(lpsn_val := get_lpsn(lid))
+            ]
 
     def __cr_ncbi_id[T](
         self,
@@ -217,14 +224,16 @@ class TaxonManager:
         eval: Callable[[T], bool],
         /,
     ) -> list[tuple[T, int]]:
-        if ncbi_id > 0 and eval(ncbi_val := get_ncbi(ncbi_id)):
-            return [(ncbi_val, ncbi_id)]
-        return [
-            (ncbi_val, nid)
-            for _, nid in self._ncbi.get_name(name)
-            if eval(ncbi_val := get_ncbi(nid))
-        ]
-
+        with METRICS.timer("taxon.ncbi"):
+            if ncbi_id > 0 and eval(ncbi_val := get_ncbi(ncbi_id)):
+                return [(ncbi_val, ncbi_id)]
+            return [
+                (ncbi_val, nid)
+                for _, nid in self._ncbi.get_name(name)
+                if eval(ncbi_val := get_ncbi(nid))
+            ]
+
+    @timed("taxon.get_rank")
     @_verify_date
     def get_rank(
         self, name: str, ncbi_id: int = -1, lpsn_id: int = -1, /
@@ -247,6 +256,7 @@ class TaxonManager:
             return [rank for rank in ranks.values() if _keep_ids(ncbi_id, lpsn_id, rank)]
         return [RankId(rank=self.__gbif.get_rank(cl_name))]
 
+    @timed("taxon.get_domain")
     @_verify_date
     def get_domain(
         self, name: str, ncbi_id: int = -1, lpsn_id: int = -1, /
@@ -273,6 +283,7 @@ class TaxonManager:
             return [dom for dom in domains.values() if _keep_ids(ncbi_id, lpsn_id, dom)]
         return []
 
+    @timed("taxon.get_genus")
     @_verify_date
     def get_genus(
         self, name: str, ncbi_id: int = -1, lpsn_id: int = -1, /
@@ -295,6 +306,7 @@ class TaxonManager:
             return [gen for gen in genus.values() if _keep_ids(ncbi_id, lpsn_id, gen)]
         return []
 
+    @timed("taxon.get_species")
     @_verify_date
     def get_species(
         self, name: str, ncbi_id: int = -1, lpsn_id: int = -1, /
@@ -335,18 +347,15 @@ class TaxonManager:
     ) -> tuple[int, dict[int, str], RadixTree[int]]:
         if self._nid_sg is None or self._radix_sg is None:
             self._nid_sg = dict()
-            radix: None | RadixTree[int] = None
+            keys: list[tuple[str, tuple[int, ...]]] = []
             jump = 0
             for nid, names in itertools.chain(*[name() for name in gen]):
                 for name in names:
                     if nid not in self._nid_sg:
                         self._nid_sg[nid] = name
                     jump = jump if len(name) < jump else len(name)
-                    if radix is None:
-                        radix = RadixTree(name, (nid,))
-                    else:
-                        radix_add(radix, name, (nid,))
-            self._radix_sg = radix
+                    keys.append((name, (nid,)))
+            self._radix_sg = radix_build(keys)
             self.__jump = jump
         if self._radix_sg is None:
             raise GlobalManagerEx("Could not initialize taxon radix tree")
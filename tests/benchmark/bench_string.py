@@ -0,0 +1,109 @@
+"""Micro-benchmarks for `saim.shared.parse.string`.
+
+Run with `PYTHONPATH=src python -m tests.benchmark.bench_string`.
+The current functions are also measured in the `string` group of `tests.benchmark.run`.
+"""
+
+from importlib import resources
+import timeit
+from typing import Callable, Final
+
+from saim import data
+from saim.shared.parse.string import (
+    PATTERN_CORE_ID_EDGE_R,
+    PATTERN_EDGE_R,
+    PATTERN_ID_EDGE_R,
+    PATTERN_SEP_R,
+    clean_core_id_edges,
+    clean_edges,
+    clean_id_edges,
+    clean_string,
+    remove_non_word_chars_upper,
+    replace_non_word_chars,
+)
+from tests.fixture.string_reference import (
+    DES_CL_REFERENCE,
+    replace_non_word_chars_reference,
+)
+
+_REPEAT: Final[int] = 5
+_NUMBER: Final[int] = 200
+
+
+def load_corpus() -> list[str]:
+    with resources.files(data).joinpath("example_ccnos.txt").open("r") as fhd:
+        ccnos = [line.rstrip("\n") for line in fhd]
+    decorated = [f"Type strain: {ccno} (old) T" for ccno in ccnos] + [
+        f"-- {ccno}, voucher. --" for ccno in ccnos
+    ]
+    return ccnos + decorated
+
+
+def _designation_cleaner() -> Callable[[str], str] | None:
+    try:
+        from saim.designation.extract_ccno import clean_designation
+    except ImportError:
+        return None
+    return clean_designation
+
+
+def _time(func: Callable[[str], str], corpus: list[str], /) -> float:
+    def run() -> None:
+        for text in corpus:
+            func(text)
+
+    best = min(timeit.repeat(run, repeat=_REPEAT, number=_NUMBER))
+    return best / (_NUMBER * len(corpus)) * 1e9
+
+
+def create_cases() -> list[tuple[str, Callable[[str], str], Callable[[str], str]]]:
+    cases: list[tuple[str, Callable[[str], str], Callable[[str], str]]] = [
+        (
+            "replace_non_word_chars",
+            replace_non_word_chars_reference,
+            replace_non_word_chars,
+        ),
+        (
+            "remove_non_word_chars_upper",
+            lambda txt: clean_string(
+                replace_non_word_chars_reference(txt), PATTERN_SEP_R, PATTERN_EDGE_R
+            ).upper(),
+            remove_non_word_chars_upper,
+        ),
+        ("clean_edges", lambda txt: clean_string(txt, PATTERN_EDGE_R), clean_edges),
+        (
+            "clean_id_edges",
+            lambda txt: clean_string(txt, PATTERN_ID_EDGE_R),
+            clean_id_edges,
+        ),
+        (
+            "clean_core_id_edges",
+            lambda txt: clean_string(txt, PATTERN_CORE_ID_EDGE_R),
+            clean_core_id_edges,
+        ),
+    ]
+    if (des_cleaner := _designation_cleaner()) is not None:
+        cases.append(
+            (
+                "clean_designation",
+                lambda txt: clean_string(txt, *DES_CL_REFERENCE),
+                des_cleaner,
+            )
+        )
+    return cases
+
+
+def run() -> None:
+    corpus = load_corpus()
+    print(f"{'function':<30}{'reference ns':>14}{'current ns':>14}{'speedup':>10}")
+    for name, reference, current in create_cases():
+        for text in corpus:
+            if reference(text) != current(text):
+                raise AssertionError(f"{name} differs for {text!r}")
+        ref_ns = _time(reference, corpus)
+        cur_ns = _time(current, corpus)
+        print(f"{name:<30}{ref_ns:>14.1f}{cur_ns:>14.1f}{ref_ns / cur_ns:>9.2f}x")
+
+
+if __name__ == "__main__":
+    run()
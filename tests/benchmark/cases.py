@@ -0,0 +1,307 @@
+"""Benchmark cases for the saim hot paths, grouped by area.
+
+Groups depending on the cafi database are built lazily,
+so the remaining groups still run without it.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Final, Never
+
+from saim.shared.search.radix_tree import (
+    RadixTree,
+    find_first_match_simple,
+    find_first_match_with_fix,
+    find_fuzzy_matches,
+    is_full_match,
+    radix_add,
+    radix_build,
+    radix_compact,
+)
+from tests.benchmark.bench_string import create_cases as create_string_cases
+from tests.benchmark.bench_string import load_corpus as load_string_corpus
+from tests.benchmark.corpus import (
+    create_ccnos,
+    create_html_page,
+    create_random,
+    create_taxa,
+    create_taxa_texts,
+    create_taxdump,
+    create_texts,
+)
+from tests.benchmark.harness import BenchCase
+
+type _Cases = list[BenchCase[Any]]
+_BATCH: Final[int] = 16
+
+
+def _batch[T](items: list[T], /) -> list[list[T]]:
+    return [items[pos : pos + _BATCH] for pos in range(0, len(items), _BATCH)]
+
+
+def _string_cases(scale: int, /) -> _Cases:
+    batches = _batch(load_string_corpus() * scale)
+
+    def bind(func: Callable[[str], str], /) -> Callable[[list[str]], object]:
+        return lambda batch: [func(text) for text in batch]
+
+    return [
+        BenchCase(name=f"string.{name}", func=bind(current), inputs=batches)
+        for name, _, current in create_string_cases()
+    ]
+
+
+def _radix_cases(scale: int, /) -> _Cases:
+    rnd = create_random(10)
+    upper = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    acronyms = {
+        "".join(rnd.choice(upper) for _ in range(rnd.randint(2, 6)))
+        for _ in range(2_000 * scale)
+    }
+    acronyms.update(("DSM", "DSMZ", "ATCC", "JCM", "CBS", "IMI"))
+    first, *rest = sorted(acronyms)
+    radix: RadixTree[Never] = RadixTree(first, tuple())
+    for acr in rest:
+        radix_add(radix, acr, tuple())
+    radix_compact(radix)
+    ccnos = create_ccnos(2_000 * scale)
+    return [
+        BenchCase(
+            name="radix.find_first_match_with_fix",
+            func=lambda ccno: find_first_match_with_fix(radix, ccno, True),
+            inputs=ccnos,
+        ),
+        BenchCase(
+            name="radix.is_full_match",
+            func=lambda ccno: is_full_match(radix, ccno.split(" ")[0]),
+            inputs=ccnos,
+        ),
+        BenchCase(
+            name="radix.find_first_match_simple",
+            func=lambda ccno: list(find_first_match_simple(radix, ccno, 0)),
+            inputs=ccnos,
+        ),
+        BenchCase(
+            name="radix.find_fuzzy_matches",
+            func=lambda ccno: find_fuzzy_matches(radix, ccno, 1, True),
+            inputs=ccnos,
+        ),
+    ]
+
+
+def _add_and_compact[T](keys: list[tuple[str, tuple[T, ...]]], /) -> RadixTree[T]:
+    (first, first_ind), *rest = keys
+    radix: RadixTree[T] = RadixTree(first, first_ind)
+    for key, ind in rest:
+        radix_add(radix, key, ind)
+    radix_compact(radix)
+    return radix
+
+
+def _radix_build_cases(scale: int, /) -> _Cases:
+    # species set shaped like the NCBI genus and species names
+    keys = [
+        (name, (nid,))
+        for nid, name in enumerate(
+            name for gen, spe in create_taxa(1_000 * scale, 20) for name in (gen, *spe)
+        )
+    ]
+    return [
+        BenchCase(name="radix.build_add_compact", func=_add_and_compact, inputs=[keys]),
+        BenchCase(name="radix.build_bulk", func=radix_build, inputs=[keys]),
+    ]
+
+
+def _designation_cases(scale: int, /) -> _Cases:
+    from saim.designation.extract_ccno import extract_ccno_from_text, identify_ccno
+    from saim.designation.known_acr_db import create_brc_con
+
+    brc = create_brc_con()
+    radix_compact(brc.kn_acr)
+    radix_compact(brc.kn_acr_rev)
+    return [
+        BenchCase(
+            name="designation.identify_ccno",
+            func=lambda ccno: identify_ccno(ccno, brc),
+            inputs=create_ccnos(2_000 * scale),
+        ),
+        BenchCase(
+            name="designation.extract_ccno_from_text",
+            func=lambda text: list(extract_ccno_from_text(text, brc)),
+            inputs=create_texts(100 * scale, 200, 0.1),
+        ),
+    ]
+
+
+def _taxon_cases(scale: int, /) -> _Cases:
+    from saim.taxon_name.extract_taxa import extract_taxa_from_text
+    from saim.taxon_name.private.ncbi import _create_ncbi_container
+
+    taxa = create_taxa(300 * scale, 10)
+    radix: RadixTree[int] | None = None
+    jump = 0
+    for nid, name in enumerate(name for gen, spe in taxa for name in (gen, *spe)):
+        jump = max(jump, len(name))
+        if radix is None:
+            radix = RadixTree(name, (nid,))
+        else:
+            radix_add(radix, name, (nid,))
+    if radix is None:
+        return []
+    tax_radix = radix
+    return [
+        BenchCase(
+            name="taxon.extract_taxa_from_text",
+            func=lambda text: list(extract_taxa_from_text(text, tax_radix, jump)),
+            inputs=create_taxa_texts(taxa, 100 * scale, 200),
+        ),
+        BenchCase(
+            name="taxon.ncbi_taxdump",
+            func=_create_ncbi_container,
+            inputs=[create_taxdump(create_taxa(200 * scale, 10))],
+        ),
+    ]
+
+
+@dataclass(slots=True)
+class _BenchStrain:
+    relation: list[str] = field(default_factory=list)
+    strain_id = -1
+
+
+@dataclass(slots=True)
+class _BenchCCNo:
+    ccno: str
+    acr: str
+    brc_id: int
+    id: Any
+    id_syn: list[Any]
+    status: Any
+    strain: _BenchStrain
+
+    def to_json(self) -> str:
+        return self.ccno
+
+
+def _match_cases(scale: int, /) -> _Cases:
+    from cafi.library.loader import CURRENT_VER
+
+    from saim.designation.manager import AcronymManager
+    from saim.shared.data_con.culture import CultureStatus
+    from saim.shared.data_con.designation import CCNoId
+    from saim.shared.data_con.strain import StrainCultureId
+    from saim.strain_matching.manager import MatchCache
+    from saim.strain_matching.private.container import CulMatCon
+    from saim.strain_matching.private.strain_match import StrainMatch
+
+    rnd = create_random(11)
+    acr_man = AcronymManager(CURRENT_VER)
+    brc_id = min(acr_man.identify_acr("DSM"), default=1)
+    strains = 1_000 * scale
+    cache = MatchCache(
+        culture_ccno={
+            (brc_id, "", str(sid), ""): StrainCultureId(s=sid, c=sid)
+            for sid in range(1, strains + 1)
+        },
+        relation_ccno={
+            ("DSM", "", str(sid), ""): {sid: sid} for sid in range(1, strains + 1)
+        },
+        si_id={sid: sid for sid in range(1, strains + 1)},
+        si_cu_err=set(),
+    )
+    matcher: StrainMatch[_BenchCCNo] = StrainMatch(cache, acr_man, False)
+    cultures = []
+    for _ in range(1_000 * scale):
+        sid = rnd.randint(1, strains * 2)
+        cultures.append(
+            CulMatCon(
+                cul=_BenchCCNo(
+                    ccno=f"DSM {sid}",
+                    acr="DSM",
+                    brc_id=brc_id,
+                    id=CCNoId(full=str(sid), core=str(sid)),
+                    id_syn=[],
+                    status=CultureStatus.unk,
+                    strain=_BenchStrain(
+                        relation=[f"DSM {rnd.randint(1, strains)}", f"SI-ID {sid}"]
+                    ),
+                )
+            )
+        )
+    return [BenchCase(name="strain_matching.match", func=matcher.match, inputs=cultures)]
+
+
+def _history_cases(scale: int, /) -> _Cases:
+    from cafi.library.loader import CURRENT_VER
+
+    from saim.history.extract_dep_des import assign_depositor_designation
+    from saim.history.manager import HistoryManager
+    from saim.history.private.types import STRAIN_DP
+    from saim.shared.data_con.history import DepositCon
+
+    rnd = create_random(12)
+    manager = HistoryManager(CURRENT_VER)
+    ccnos = create_ccnos(400)
+    strains: list[STRAIN_DP] = []
+    for _ in range(50 * scale):
+        pool = rnd.sample(ccnos, 12)
+        strains.append(
+            {
+                dep_id: DepositCon(
+                    designation=rnd.choice(pool),
+                    history=[
+                        " <- ".join(rnd.sample(pool, rnd.randint(1, 4))) + " <- Doe"
+                    ],
+                    deposited_as=0,
+                    cc_id=-1,
+                    rel_des=[rnd.choice(pool)],
+                )
+                for dep_id in range(1, 21)
+            }
+        )
+    return [
+        BenchCase(
+            name="history.assign_depositor_designation",
+            func=lambda strain_dp: list(assign_depositor_designation(strain_dp, manager)),
+            inputs=strains,
+            rounds=1,
+        )
+    ]
+
+
+def _link_search_cases(scale: int, /) -> _Cases:
+    from saim.culture_link.private.search_matcher import SearchMatcher
+    from saim.shared.data_con.designation import CCNoDes, CCNoId
+
+    ccno = CCNoDes(
+        acr="DSM",
+        id=CCNoId(full="12345", core="12345"),
+        designation="DSM 12345",
+    )
+    matcher = SearchMatcher(ccno, ["Bacillus subtilis"])
+    size_kib = 2048 * scale
+    pages = {
+        "early": create_html_page(size_kib, "dsm 12345 Bacillus subtilis", 0.01),
+        "late": create_html_page(size_kib, "DSM-12345 Bacillus subtilis", 0.99),
+        "miss": create_html_page(size_kib, "", 0.0),
+    }
+    return [
+        BenchCase(
+            name=f"link_search.search_{name}",
+            func=matcher.search,
+            inputs=[page] * 4,
+        )
+        for name, page in pages.items()
+    ]
+
+
+GROUPS: Final[dict[str, Callable[[int], _Cases]]] = {
+    "string": _string_cases,
+    "radix": _radix_cases,
+    "radix_build": _radix_build_cases,
+    "designation": _designation_cases,
+    "taxon": _taxon_cases,
+    "strain_matching": _match_cases,
+    "history": _history_cases,
+    "link_search": _link_search_cases,
+}
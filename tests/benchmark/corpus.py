@@ -0,0 +1,174 @@
+"""Seeded synthetic and fixture corpora for the benchmark suite."""
+
+from importlib import resources
+from io import BytesIO
+import random
+import tarfile
+from typing import Final
+
+from saim import data
+
+_SEED: Final[int] = 20_240
+_ACRONYMS: Final[tuple[str, ...]] = (
+    "DSM",
+    "DSMZ",
+    "ATCC",
+    "JCM",
+    "NBRC",
+    "CBS",
+    "IMI",
+    "LMG",
+    "NCTC",
+    "CCUG",
+    "KCTC",
+    "CIP",
+)
+_FILLER: Final[tuple[str, ...]] = (
+    "the",
+    "strain",
+    "was",
+    "isolated",
+    "from",
+    "soil",
+    "and",
+    "deposited",
+    "as",
+    "in",
+    "culture",
+    "collection",
+    "grown",
+    "at",
+    "30",
+    "degrees",
+    "for",
+    "7",
+    "days",
+    "(type",
+    "strain)",
+    "=",
+    ";",
+)
+
+
+def create_random(offset: int = 0, /) -> random.Random:
+    return random.Random(_SEED + offset)  # noqa: S311
+
+
+def load_example_ccnos() -> list[str]:
+    with resources.files(data).joinpath("example_ccnos.txt").open("r") as fhd:
+        return [line.rstrip("\n") for line in fhd if line.strip() != ""]
+
+
+def create_ccnos(count: int, /) -> list[str]:
+    rnd = create_random(1)
+    ccnos = load_example_ccnos()
+    for _ in range(count - len(ccnos)):
+        acr = rnd.choice(_ACRONYMS)
+        sep = rnd.choice(("", " ", "-", ":"))
+        ccnos.append(f"{acr}{sep}{rnd.randint(1, 99_999)}")
+    return ccnos[:count]
+
+
+def create_texts(count: int, words: int, ccno_rate: float, /) -> list[str]:
+    rnd = create_random(2)
+    ccnos = create_ccnos(512)
+    return [
+        " ".join(
+            rnd.choice(ccnos) if rnd.random() < ccno_rate else rnd.choice(_FILLER)
+            for _ in range(words)
+        )
+        for _ in range(count)
+    ]
+
+
+def create_taxa(genera: int, species: int, /) -> list[tuple[str, list[str]]]:
+    rnd = create_random(3)
+    letters = "abcdefghiklmnoprstuvy"
+    taxa: list[tuple[str, list[str]]] = []
+    for _ in range(genera):
+        genus = "".join(rnd.choice(letters) for _ in range(rnd.randint(5, 11))).title()
+        epithets = [
+            "".join(rnd.choice(letters) for _ in range(rnd.randint(4, 12)))
+            for _ in range(species)
+        ]
+        taxa.append((genus, [f"{genus} {epi}" for epi in epithets]))
+    return taxa
+
+
+def create_taxa_texts(
+    taxa: list[tuple[str, list[str]]], count: int, words: int, /
+) -> list[str]:
+    rnd = create_random(4)
+    names = [name for genus, spe in taxa for name in (genus, *spe)]
+    return [
+        " ".join(
+            rnd.choice(names) if rnd.random() < 0.05 else rnd.choice(_FILLER)
+            for _ in range(words)
+        )
+        for _ in range(count)
+    ]
+
+
+def _dmp_line(*fields: str) -> bytes:
+    return ("\t|\t".join(fields) + "\t|\n").encode("utf-8")
+
+
+def _add_tar_member(tar: tarfile.TarFile, name: str, content: bytes, /) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(content)
+    tar.addfile(info, BytesIO(content))
+
+
+def create_taxdump(taxa: list[tuple[str, list[str]]], /) -> bytes:
+    # trimmed NCBI taxdump with one bacterial domain
+    nodes = [_dmp_line("1", "1", "no rank"), _dmp_line("2", "1", "domain")]
+    names = [
+        _dmp_line("1", "all", "", "synonym"),
+        _dmp_line("1", "root", "", "scientific name"),
+        _dmp_line("2", "Bacteria", "", "scientific name"),
+    ]
+    merged: list[bytes] = []
+    deleted: list[bytes] = []
+    next_id = 3
+    for genus, species in taxa:
+        gen_id = next_id
+        nodes.append(_dmp_line(str(gen_id), "2", "genus"))
+        names.append(_dmp_line(str(gen_id), genus, "", "scientific name"))
+        next_id += 1
+        for spe in species:
+            nodes.append(_dmp_line(str(next_id), str(gen_id), "species"))
+            names.append(_dmp_line(str(next_id), spe, "", "scientific name"))
+            names.append(_dmp_line(str(next_id), f"{spe} old", "", "synonym"))
+            names.append(_dmp_line(str(next_id), f"DSM {next_id}", "", "type material"))
+            merged.append(_dmp_line(str(next_id + 1_000_000), str(next_id)))
+            deleted.append(_dmp_line(str(next_id + 2_000_000)))
+            next_id += 1
+    buffer = BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, content in (
+            ("nodes.dmp", nodes),
+            ("names.dmp", names),
+            ("merged.dmp", merged),
+            ("delnodes.dmp", deleted),
+        ):
+            _add_tar_member(tar, name, b"".join(content))
+    return buffer.getvalue()
+
+
+def create_html_page(size_kib: int, hit: str, position: float, /) -> bytes:
+    rnd = create_random(5)
+    rows: list[str] = []
+    length = 0
+    while length < size_kib * 1024:
+        row = (
+            f'<tr class="row"><td><a href="/strain/{rnd.randint(1, 99_999)}">'
+            + " ".join(rnd.choice(_FILLER) for _ in range(12))
+            + "</a></td></tr>\n"
+        )
+        rows.append(row)
+        length += len(row)
+    if hit != "":
+        rows.insert(int(len(rows) * position), f"<tr><td>{hit}</td></tr>\n")
+    return ("<html><body><table>\n" + "".join(rows) + "</table></body></html>").encode(
+        "utf-8"
+    )
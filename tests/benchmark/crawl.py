@@ -0,0 +1,244 @@
+"""Crawls local fixture sites end to end with the culture link generator.
+
+Every site is its own domain serving one page kind with its own crawl delay,
+so the run measures the scheduling, the cool-downs and the browser workers
+without depending on the network or on remote catalogues.
+Needs playwright with an installed chromium.
+
+Run with `PYTHONPATH=src python -m tests.benchmark.crawl --help`.
+"""
+
+import argparse
+import asyncio
+from itertools import pairwise
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+import json
+from pathlib import Path
+import sys
+import tempfile
+import time
+from typing import Final, final
+import warnings
+
+from cafi.container.acr_db import AcrCoreReg, AcrDbEntry
+
+from saim.culture_link.create_links import CcnoLinkGenerator, SearchRequest
+from saim.culture_link.private.container import VerifiedURL
+from saim.culture_link.private.cool_down import get_cool_down_sec
+from saim.shared.data_con.designation import CCNoDes, CCNoId
+from saim.shared.misc.metrics import METRICS
+from tests.fixture.http_server import FixtureSite, SiteConfig
+
+# acronym, page kind, crawl delay
+_SITES: Final[tuple[tuple[str, str, int], ...]] = (
+    ("CAT", "catalogue", 1),
+    ("CATB", "catalogue", 2),
+    ("SLOW", "slow", 1),
+    ("HANG", "timeout", 1),
+    ("DROP", "drop", 1),
+    ("JS", "js", 1),
+)
+# slack for the time between the cool-down release and the request arrival
+_TOLERANCE_SEC: Final[float] = 0.05
+
+
+@final
+class _LocalLookup:
+    """Acronym lookups for the synthetic BRCs of the fixture sites."""
+
+    __slots__ = ("__acr_ids", "__brcs")
+
+    def __init__(self, sites: dict[str, tuple[str, FixtureSite]], /) -> None:
+        self.__brcs: dict[int, AcrDbEntry] = {}
+        self.__acr_ids: dict[str, set[int]] = {}
+        for brc_id, (acr, (kind, site)) in enumerate(sites.items(), 1):
+            self.__acr_ids[acr] = {brc_id}
+            self.__brcs[brc_id] = AcrDbEntry(
+                acr=acr,
+                code=acr,
+                name=f"{acr} fixture collection",
+                country="DE",
+                active=True,
+                regex_ccno=f"^{acr}\\s*\\d+$",
+                regex_id=AcrCoreReg(full="^\\d+$", core="\\d+"),
+                deprecated=False,
+                homepage=f"{site.url}/",
+                catalogue=[f"{site.url}/{kind}/<acr>/<id>"],
+                acr_changed_to=[],
+                acr_synonym=[],
+            )
+        super().__init__()
+
+    def get_brc_by_id(self, brc_id: int, /) -> AcrDbEntry | None:
+        return self.__brcs.get(brc_id)
+
+    def identify_ccno(self, designation: str, /) -> CCNoDes:
+        acr, _, cid = designation.partition(" ")
+        return CCNoDes(designation=designation, acr=acr, id=CCNoId(full=cid, core=cid))
+
+    def identify_ccno_batch(self, designations: Iterable[str], /) -> list[CCNoDes]:
+        return [self.identify_ccno(des) for des in designations]
+
+    def identify_ccno_by_brc(self, designation: str, _brc_id: int, /) -> CCNoDes:
+        return self.identify_ccno(designation)
+
+    def identify_acr(self, acr: str, /) -> set[int]:
+        return self.__acr_ids.get(acr, set())
+
+
+@final
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CoolDownReport:
+    domain: str
+    kind: str
+    requests: int
+    expected_sec: float
+    min_gap_sec: float
+    mean_gap_sec: float
+    # gaps shorter than the expected cool-down
+    violations: int
+
+
+@final
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CrawlReport:
+    tasks: int
+    found: int
+    pages: int
+    seconds: float
+    pages_per_sec: float
+    tasks_per_sec: float
+    worker_utilization: float
+    cool_down: list[CoolDownReport]
+
+
+def _cool_down_report(kind: str, site: FixtureSite, /) -> CoolDownReport:
+    times = sorted(req_time for req_time, _ in site.requests)
+    gaps = [second - first for first, second in pairwise(times)]
+    expected = get_cool_down_sec(site.config.crawl_delay)
+    return CoolDownReport(
+        domain=site.domain,
+        kind=kind,
+        requests=len(times),
+        expected_sec=expected,
+        min_gap_sec=min(gaps, default=0.0),
+        mean_gap_sec=sum(gaps) / len(gaps) if len(gaps) > 0 else 0.0,
+        violations=sum(gap < expected - _TOLERANCE_SEC for gap in gaps),
+    )
+
+
+async def _collect(
+    generator: CcnoLinkGenerator, requests: list[SearchRequest], /
+) -> list[VerifiedURL]:
+    return [res async for res in generator.ccno_linking(requests)]
+
+
+def run_crawl(
+    workers: int, per_site: int, pool_size: int, config: SiteConfig, /
+) -> CrawlReport:
+    sites: dict[str, tuple[str, FixtureSite]] = {}
+    try:
+        for acr, kind, delay in _SITES:
+            site_config = SiteConfig(
+                crawl_delay=delay,
+                slow_sec=config.slow_sec,
+                hang_sec=config.hang_sec,
+                js_msec=config.js_msec,
+            )
+            sites[acr] = (kind, FixtureSite(site_config))
+        # interleaved like a mixed culture export
+        designations = [f"{acr} {num}" for num in range(1, per_site + 1) for acr in sites]
+        requests = [
+            SearchRequest(find_ccno=des, task_id=tid)
+            for tid, des in enumerate(designations)
+        ]
+        METRICS.reset()
+        METRICS.enable()
+        with tempfile.TemporaryDirectory() as work_dir:
+            generator = CcnoLinkGenerator(
+                workers, Path(work_dir), "", 1, _LocalLookup(sites), pool_size
+            )
+            start = time.monotonic()
+            results = asyncio.run(_collect(generator, requests))
+            seconds = time.monotonic() - start
+        gauges = METRICS.snapshot()["gauges"]
+        pages = sum(len(site.requests) for _, site in sites.values())
+        return CrawlReport(
+            tasks=len(results),
+            found=sum(res.result is not None for res in results),
+            pages=pages,
+            seconds=seconds,
+            pages_per_sec=pages / seconds,
+            tasks_per_sec=len(results) / seconds,
+            worker_utilization=gauges.get("culture_link.worker_utilization_ratio", 0.0),
+            cool_down=[_cool_down_report(kind, site) for kind, site in sites.values()],
+        )
+    finally:
+        METRICS.disable()
+        for _, site in sites.values():
+            site.close()
+
+
+def format_report(report: CrawlReport, /) -> str:
+    lines = [
+        f"tasks {report.tasks} found {report.found} pages {report.pages}"
+        f" in {report.seconds:.1f}s",
+        f"{report.pages_per_sec:.2f} pages/s {report.tasks_per_sec:.2f} tasks/s"
+        f" worker utilization {report.worker_utilization:.2f}",
+        f"{'domain':<22} {'kind':<10} {'req':>5} {'expected':>9} {'min gap':>9}"
+        f" {'mean gap':>9} {'violations':>10}",
+    ]
+    lines.extend(
+        f"{cool.domain:<22} {cool.kind:<10} {cool.requests:>5}"
+        f" {cool.expected_sec:>9.2f} {cool.min_gap_sec:>9.2f}"
+        f" {cool.mean_gap_sec:>9.2f} {cool.violations:>10}"
+        for cool in report.cool_down
+    )
+    return "\n".join(lines)
+
+
+def _parse_args(argv: list[str], /) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Measures pages per second, worker utilization and cool-down"
+        " accuracy of the culture link generator against local fixture sites"
+    )
+    parser.add_argument("-w", "--workers", type=int, default=4, help="browser workers")
+    parser.add_argument(
+        "-n", "--per-site", type=int, default=5, help="designations per site"
+    )
+    parser.add_argument(
+        "-p", "--pool-size", type=int, default=1, help="browser pages per worker"
+    )
+    parser.add_argument(
+        "--slow", type=float, default=2.0, help="seconds before a slow page answers"
+    )
+    parser.add_argument(
+        "--hang", type=float, default=3.0, help="seconds before a drop page closes"
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, default=None, help="json file for the report"
+    )
+    return parser.parse_args(argv)
+
+
+def run() -> None:
+    args = _parse_args(sys.argv[1:])
+    warnings.simplefilter("ignore")
+    report = run_crawl(
+        args.workers,
+        args.per_site,
+        args.pool_size,
+        SiteConfig(slow_sec=args.slow, hang_sec=args.hang),
+    )
+    print(format_report(report))
+    if args.output is not None:
+        with args.output.open("w", encoding="utf-8") as fhd:
+            json.dump(asdict(report), fhd, indent=2)
+    # the link generator closes its workers at exit
+    if any(cool.violations > 0 for cool in report.cool_down):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,169 @@
+"""Measurement and baseline handling for the benchmark suite."""
+
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime
+import json
+import math
+from pathlib import Path
+import platform
+import time
+import tracemalloc
+from typing import Any, Final, final
+
+_NS_TO_US: Final[float] = 1e-3
+
+
+@final
+@dataclass(frozen=True, slots=True, kw_only=True)
+class BenchCase[T]:
+    name: str
+    func: Callable[[T], object]
+    inputs: Sequence[T]
+    rounds: int = 3
+
+
+@final
+@dataclass(frozen=True, slots=True, kw_only=True)
+class BenchResult:
+    name: str
+    items: int
+    # items per second
+    throughput: float
+    p50_us: float
+    p95_us: float
+    p99_us: float
+    peak_kib: float
+    # mean bytes allocated on top of the live memory during one call
+    alloc_b: float = 0.0
+
+
+def _percentile(latencies: Sequence[int], pct: float, /) -> float:
+    # nearest-rank on sorted latencies
+    rank = max(1, math.ceil(pct / 100 * len(latencies)))
+    return latencies[rank - 1] * _NS_TO_US
+
+
+def _trace_memory[T](case: BenchCase[T], /) -> tuple[float, float]:
+    peak, alloc = 0, 0
+    tracemalloc.start()
+    try:
+        for inp in case.inputs:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            case.func(inp)
+            _, call_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, call_peak)
+            alloc += call_peak - before
+    finally:
+        tracemalloc.stop()
+    return peak / 1024, alloc / max(1, len(case.inputs))
+
+
+def measure[T](case: BenchCase[T], /) -> BenchResult:
+    """Measures one benchmark case.
+
+    The inputs are run once for warm-up, then timed per call for all rounds.
+    The peak memory and the bytes allocated per call are traced in a separate pass,
+    so the tracing overhead does not distort the latencies.
+    """
+    for inp in case.inputs:
+        case.func(inp)
+    latencies: list[int] = []
+    for _ in range(case.rounds):
+        for inp in case.inputs:
+            start = time.perf_counter_ns()
+            case.func(inp)
+            latencies.append(time.perf_counter_ns() - start)
+    latencies.sort()
+    peak_kib, alloc_b = _trace_memory(case)
+    total_sec = max(sum(latencies), 1) / 1e9
+    return BenchResult(
+        name=case.name,
+        items=len(latencies),
+        throughput=len(latencies) / total_sec,
+        p50_us=_percentile(latencies, 50),
+        p95_us=_percentile(latencies, 95),
+        p99_us=_percentile(latencies, 99),
+        peak_kib=peak_kib,
+        alloc_b=alloc_b,
+    )
+
+
+def write_results(results: Sequence[BenchResult], out_file: Path, /) -> None:
+    out_file.parent.mkdir(parents=True, exist_ok=True)
+    with out_file.open("w", encoding="utf-8") as fhd:
+        json.dump(
+            {
+                "meta": {
+                    "created": datetime.now().isoformat(timespec="seconds"),
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "system": platform.system(),
+                },
+                "results": {res.name: asdict(res) for res in results},
+            },
+            fhd,
+            indent=2,
+        )
+
+
+def load_results(in_file: Path, /) -> dict[str, BenchResult]:
+    with in_file.open("r", encoding="utf-8") as fhd:
+        content: dict[str, Any] = json.load(fhd)
+    return {name: BenchResult(**res) for name, res in content.get("results", {}).items()}
+
+
+def compare_results(
+    results: Sequence[BenchResult],
+    baseline: dict[str, BenchResult],
+    tolerance: float,
+    /,
+) -> list[str]:
+    """Compares results against a baseline.
+
+    Args:
+        results: current measurements.
+        baseline: stored measurements keyed by case name.
+        tolerance: allowed relative change, e.g. 0.2 for 20 %.
+
+    Returns:
+        A message for each regression, cases missing in the baseline are ignored.
+    """
+    regressions: list[str] = []
+    for res in results:
+        if (base := baseline.get(res.name)) is None:
+            continue
+        if res.throughput < base.throughput * (1 - tolerance):
+            regressions.append(
+                f"{res.name}: throughput {res.throughput:.1f}/s"
+                + f" < baseline {base.throughput:.1f}/s"
+            )
+        if res.p95_us > base.p95_us * (1 + tolerance):
+            regressions.append(
+                f"{res.name}: p95 {res.p95_us:.1f}us > baseline {base.p95_us:.1f}us"
+            )
+        if res.peak_kib > base.peak_kib * (1 + tolerance):
+            regressions.append(
+                f"{res.name}: peak {res.peak_kib:.1f}KiB"
+                + f" > baseline {base.peak_kib:.1f}KiB"
+            )
+        if base.alloc_b > 0 and res.alloc_b > base.alloc_b * (1 + tolerance):
+            regressions.append(
+                f"{res.name}: alloc {res.alloc_b:.0f}B/call"
+                + f" > baseline {base.alloc_b:.0f}B/call"
+            )
+    return regressions
+
+
+def format_results(results: Sequence[BenchResult], /) -> str:
+    lines = [
+        f"{'case':<36}{'items/s':>12}{'p50 us':>10}{'p95 us':>10}"
+        + f"{'p99 us':>10}{'peak KiB':>11}{'B/call':>10}"
+    ]
+    lines.extend(
+        f"{res.name:<36}{res.throughput:>12.1f}{res.p50_us:>10.1f}{res.p95_us:>10.1f}"
+        + f"{res.p99_us:>10.1f}{res.peak_kib:>11.1f}{res.alloc_b:>10.0f}"
+        for res in results
+    )
+    return "\n".join(lines)
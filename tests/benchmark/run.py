@@ -0,0 +1,87 @@
+"""Runs the benchmark suite and compares it against a stored baseline.
+
+Run with `PYTHONPATH=src python -m tests.benchmark.run --help`.
+"""
+
+import argparse
+from pathlib import Path
+import sys
+import warnings
+
+from tests.benchmark.cases import GROUPS
+from tests.benchmark.harness import (
+    BenchResult,
+    compare_results,
+    format_results,
+    load_results,
+    measure,
+    write_results,
+)
+
+
+def _parse_args(argv: list[str], /) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Measures throughput, latency percentiles and peak memory"
+        " of the saim hot paths"
+    )
+    parser.add_argument(
+        "-g",
+        "--group",
+        action="append",
+        choices=sorted(GROUPS),
+        help="benchmark group to run, can be repeated (default: all)",
+    )
+    parser.add_argument(
+        "-s", "--scale", type=int, default=1, help="corpus size multiplier"
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, default=None, help="json file for the results"
+    )
+    parser.add_argument(
+        "-b", "--baseline", type=Path, default=None, help="json file to compare with"
+    )
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed relative regression against the baseline",
+    )
+    return parser.parse_args(argv)
+
+
+def run_groups(groups: list[str], scale: int, /) -> list[BenchResult]:
+    results: list[BenchResult] = []
+    for group in groups:
+        try:
+            cases = GROUPS[group](scale)
+        except ImportError as exc:
+            print(f"skipping {group} - {exc!s}", file=sys.stderr)
+            continue
+        for case in cases:
+            print(f"running {case.name}", file=sys.stderr)
+            results.append(measure(case))
+    return results
+
+
+def run() -> None:
+    args = _parse_args(sys.argv[1:])
+    warnings.simplefilter("ignore")
+    results = run_groups(args.group or list(GROUPS), args.scale)
+    print(format_results(results))
+    if args.output is not None:
+        write_results(results, args.output)
+    if args.baseline is None:
+        return None
+    if not args.baseline.is_file():
+        print(f"baseline {args.baseline!s} not found", file=sys.stderr)
+        sys.exit(2)
+    regressions = compare_results(results, load_results(args.baseline), args.tolerance)
+    for reg in regressions:
+        print(f"REGRESSION {reg}", file=sys.stderr)
+    if len(regressions) > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run()
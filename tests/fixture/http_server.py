@@ -0,0 +1,161 @@
+"""Local catalogue sites for deterministic crawl tests.
+
+Every site listens on its own port, so each one is a separate domain
+with its own robots.txt and cool-down.
+"""
+
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Lock, Thread
+import time
+from typing import Final, Self, final
+from urllib.parse import unquote
+
+PAGE_KINDS: Final[tuple[str, ...]] = ("catalogue", "slow", "timeout", "drop", "js")
+_HOST: Final[str] = "127.0.0.1"
+_FILLER: Final[str] = "<p>Strain information and growth conditions.</p>" * 40
+
+
+@final
+@dataclass(frozen=True, slots=True, kw_only=True)
+class SiteConfig:
+    crawl_delay: int = 1
+    # seconds before a slow page is answered
+    slow_sec: float = 2.0
+    # seconds before a drop request is closed without an answer
+    hang_sec: float = 3.0
+    # milliseconds before the js page writes the designation
+    js_msec: int = 300
+
+
+def _page(body: str, /) -> bytes:
+    return (
+        f"<!DOCTYPE html><html><head><title>Catalogue</title></head>"
+        f"<body>{_FILLER}{body}{_FILLER}</body></html>"
+    ).encode()
+
+
+def _js_page(designation: str, delay_msec: int, /) -> bytes:
+    # char codes, so the designation is not part of the served html
+    codes = ",".join(str(ord(char)) for char in designation)
+    script = (
+        "<div id='ccno'></div><script>setTimeout(() => {"
+        "document.getElementById('ccno').textContent = "
+        f"String.fromCharCode({codes});}}, {delay_msec});</script>"
+    )
+    return _page(script)
+
+
+@final
+class _SiteServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, config: SiteConfig, /) -> None:
+        self.config = config
+        self.lock = Lock()
+        self.requests: list[tuple[float, str]] = []
+        # set on close, releases the hanging timeout requests
+        self.closing = Event()
+        super().__init__((_HOST, 0), _SiteHandler)
+
+    def record(self, path: str, /) -> None:
+        with self.lock:
+            self.requests.append((time.time(), path))
+
+
+@final
+class _SiteHandler(BaseHTTPRequestHandler):
+    server: _SiteServer
+
+    def __send(self, status: int, content: bytes, content_type: str, /) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def __robots(self) -> None:
+        robots = f"User-agent: *\nCrawl-delay: {self.server.config.crawl_delay}\n"
+        self.__send(200, robots.encode(), "text/plain")
+
+    def __catalogue(self, kind: str, designation: str, /) -> None:
+        config = self.server.config
+        match kind:
+            case "catalogue":
+                self.__send(200, _page(f"<h1>{designation}</h1>"), "text/html")
+            case "slow":
+                time.sleep(config.slow_sec)
+                self.__send(200, _page(f"<h1>{designation}</h1>"), "text/html")
+            case "timeout":
+                self.server.closing.wait()
+                self.close_connection = True
+            case "drop":
+                time.sleep(config.hang_sec)
+                self.close_connection = True
+            case "js":
+                self.__send(200, _js_page(designation, config.js_msec), "text/html")
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0]
+        if path == "/robots.txt":
+            return self.__robots()
+        if path == "/":
+            self.server.record(path)
+            return self.__send(200, _page("<h1>Culture collection</h1>"), "text/html")
+        match path.strip("/").split("/"):
+            case [kind, acr, cid] if kind in PAGE_KINDS:
+                self.server.record(path)
+                return self.__catalogue(kind, f"{unquote(acr)} {unquote(cid)}")
+        return self.__send(404, _page("not found"), "text/html")
+
+    def log_message(self, *_args: object) -> None:
+        return None
+
+
+@final
+class FixtureSite:
+    """A local catalogue site serving synthetic pages.
+
+    The pages are served at `/<kind>/<acr>/<id>` for every kind in `PAGE_KINDS`,
+    all of them contain the designation except for the timeout pages,
+    which never answer until the site is closed,
+    and the drop pages, which close the connection without an answer.
+    The time of every page request is recorded, robots.txt requests are not.
+    """
+
+    __slots__ = ("__server", "__thread")
+
+    def __init__(self, config: SiteConfig, /) -> None:
+        self.__server = _SiteServer(config)
+        self.__thread = Thread(target=self.__server.serve_forever, daemon=True)
+        self.__thread.start()
+        super().__init__()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        self.close()
+
+    @property
+    def config(self) -> SiteConfig:
+        return self.__server.config
+
+    @property
+    def domain(self) -> str:
+        return f"{_HOST}:{self.__server.server_address[1]}"
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.domain}"
+
+    @property
+    def requests(self) -> list[tuple[float, str]]:
+        with self.__server.lock:
+            return list(self.__server.requests)
+
+    def close(self) -> None:
+        self.__server.closing.set()
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
@@ -1,3 +1,5 @@
+from collections.abc import Iterator
+
 import pytest
 
 from saim.culture_link.private.cached_session import BrowserPWAdapter, PWContext
@@ -5,6 +7,7 @@ from saim.culture_link.private.container import CachedPageResp, SearchTask, Task
 from saim.culture_link.private.cool_down import CoolDownDomain
 from saim.shared.data_con.designation import CCNoDes, CCNoId
 from saim.shared.misc.ctx import get_worker_ctx
+from tests.fixture.http_server import FixtureSite, SiteConfig
 
 from cafi.container.links import CatalogueLink, LinkLevel
 
@@ -70,3 +73,9 @@ def task_pack(search_task: SearchTask) -> TaskPackage:
 @pytest.fixture(scope="session")
 def browser_adapter() -> BrowserPWAdapter:
     return BrowserPWAdapter(PWContext(2, True))
+
+
+@pytest.fixture
+def fixture_site() -> Iterator[FixtureSite]:
+    with FixtureSite(SiteConfig(crawl_delay=2, slow_sec=0.2, hang_sec=0.2)) as site:
+        yield site
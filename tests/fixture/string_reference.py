@@ -0,0 +1,31 @@
+"""Reference implementations of the string cleaners before their optimisation.
+
+Shared by the equivalence tests and the string micro-benchmarks.
+"""
+
+import re
+from typing import Final
+
+from saim.shared.parse.string import (
+    PATTERN_EDGE_R,
+    PATTERN_SEPARATOR_MULTI_R,
+    STR_DEFINED_SEP,
+)
+
+_SINGLE_WORD_CHAR_R: Final[re.Pattern[str]] = re.compile(r"^[A-Za-z0-9]$")
+DES_CL_REFERENCE: Final[tuple[re.Pattern[str], ...]] = (
+    re.compile(r"\(.*\)|\[.*]|<.*>"),
+    PATTERN_EDGE_R,
+    re.compile(r"^([Tt]ype[-\s]+)?[Ss]train[.:\s]+"),
+    re.compile(r"^([Ss]pecimen[-\s]+)?[Vv]oucher[.:\s]+"),
+    re.compile(r"^([Cc]ulture[-\s]+)?[Cc]ollection[.:\s]+"),
+    re.compile(r"[T\s]+$"),
+)
+
+
+def replace_non_word_chars_reference(input_str: str, /) -> str:
+    output_str = "".join(
+        char if _SINGLE_WORD_CHAR_R.match(char) is not None else STR_DEFINED_SEP
+        for char in input_str
+    )
+    return PATTERN_SEPARATOR_MULTI_R.sub(STR_DEFINED_SEP, output_str)
@@ -0,0 +1,28 @@
+from collections.abc import Iterator
+
+from saim.culture_link.create_links import pack_domain_tasks
+
+
+def test_pack_single_domain_lazily() -> None:
+    read = [0]
+
+    def requests() -> Iterator[tuple[str, int]]:
+        for task in range(100_000):
+            read[0] += 1
+            yield "one.test", task
+
+    packages = iter(pack_domain_tasks(requests(), 4))
+    assert len(next(packages)) == 4
+    assert read[0] <= 4 * 8
+    for _ in range(10):
+        next(packages)
+    assert read[0] <= 4 * 8 + 10 * 4
+
+
+def test_pack_spreads_domains() -> None:
+    tasks = [(f"{dom}.test", (dom, num)) for num in range(3) for dom in "abc"]
+    packages = list(pack_domain_tasks(tasks, 3))
+    assert all(len({dom for dom, _ in pack}) == len(pack) for pack in packages)
+    assert sorted(task for pack in packages for task in pack) == sorted(
+        task for _, task in tasks
+    )
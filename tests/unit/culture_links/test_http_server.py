@@ -0,0 +1,70 @@
+from pathlib import Path
+from threading import Thread
+import time
+
+import pytest
+import requests
+
+from saim.culture_link.private.robots_txt import RobotsService
+from saim.culture_link.private.search_matcher import SearchMatcher
+from saim.shared.data_con.designation import CCNoDes, CCNoId
+from tests.fixture.http_server import FixtureSite, SiteConfig
+
+pytest_plugins = ("tests.fixture.links",)
+
+
+def test_site_robots_delay(fixture_site: FixtureSite, tmp_path: Path) -> None:
+    robots = RobotsService(tmp_path)
+    assert robots.get(f"{fixture_site.url}/catalogue/ABC/1").get_delay() == 2
+    robots.close()
+    assert fixture_site.requests == []
+
+
+def test_site_pages(fixture_site: FixtureSite) -> None:
+    matcher = SearchMatcher(
+        CCNoDes(acr="ABC", id=CCNoId(full="1234", core="1234"), designation="ABC 1234"),
+        [],
+    )
+    for kind in ("catalogue", "slow"):
+        resp = requests.get(f"{fixture_site.url}/{kind}/ABC/1234", timeout=5)
+        assert resp.status_code == 200
+        assert matcher.search(resp.content)
+    # the designation only exists after the script ran
+    resp = requests.get(f"{fixture_site.url}/js/ABC/1234", timeout=5)
+    assert resp.status_code == 200
+    assert not matcher.search(resp.content)
+    assert requests.get(f"{fixture_site.url}/other", timeout=5).status_code == 404
+    with pytest.raises(requests.ConnectionError):
+        requests.get(f"{fixture_site.url}/drop/ABC/1234", timeout=5)
+    # hangs past the client timeout
+    with pytest.raises(requests.Timeout):
+        requests.get(f"{fixture_site.url}/timeout/ABC/1234", timeout=1)
+    assert [path for _, path in fixture_site.requests] == [
+        "/catalogue/ABC/1234",
+        "/slow/ABC/1234",
+        "/js/ABC/1234",
+        "/drop/ABC/1234",
+        "/timeout/ABC/1234",
+    ]
+
+
+def test_site_close_releases_timeout() -> None:
+    site = FixtureSite(SiteConfig())
+    errors: list[requests.RequestException] = []
+
+    def fetch() -> None:
+        try:
+            requests.get(f"{site.url}/timeout/ABC/1", timeout=30)
+        except requests.RequestException as exc:
+            errors.append(exc)
+
+    thread = Thread(target=fetch)
+    thread.start()
+    while len(site.requests) == 0:
+        time.sleep(0.01)
+    start = time.monotonic()
+    site.close()
+    thread.join()
+    assert time.monotonic() - start < 5
+    assert len(errors) == 1
+    assert isinstance(errors[0], requests.ConnectionError)
@@ -0,0 +1,93 @@
+import json
+from pathlib import Path
+
+from cafi.library.loader import CURRENT_VER
+import pytest
+
+from saim.culture_link.private.constants import VerificationStatus
+from saim.culture_link.private.container import LinkResult, LinkStatus, VerifiedURL
+from saim.culture_link.private.journal import ResultJournal, TaskIdSet
+from saim.culture_link.validate_cafi import validate_cafi
+from saim.shared.data_con.designation import CCNoDes
+from saim.shared.error.exceptions import ValidationEx
+
+
+pytest_plugins = ("tests.fixture.links",)
+
+_LINK = "http://test.test/1"
+
+
+def _verified(task_id: int, ccno_des: CCNoDes, /) -> VerifiedURL:
+    return VerifiedURL(
+        task_id,
+        LinkResult(_LINK, 1, ccno_des),
+        [LinkStatus(_LINK, "catalogue", VerificationStatus.ok)],
+    )
+
+
+def _failed(task_id: int, /) -> VerifiedURL:
+    return VerifiedURL(
+        task_id, None, [LinkStatus(_LINK, "homepage", VerificationStatus.fail_404)]
+    )
+
+
+def test_journal_compact(tmp_path: Path, ccno_des: CCNoDes) -> None:
+    journal = ResultJournal(tmp_path / "run.ndjson", False)
+    journal.append(_verified(1, ccno_des))
+    journal.append(_failed(2))
+    journal.append(_verified(3, ccno_des))
+    assert journal.compact(tmp_path / "res.json", tmp_path / "fail.json") == (2, 1)
+    journal.close()
+    with (tmp_path / "res.json").open() as sfh:
+        success = json.load(sfh)
+    with (tmp_path / "fail.json").open() as ffh:
+        failed = json.load(ffh)
+    assert list(success) == ["1", "3"]
+    assert success["1"]["link"] == _LINK
+    assert success["1"]["link_type"] == "catalogue"
+    assert failed == {
+        "2": {
+            "result": None,
+            "status": [
+                {
+                    "link": _LINK,
+                    "type": "homepage",
+                    "reason": VerificationStatus.fail_404.value,
+                }
+            ],
+        }
+    }
+
+
+def test_journal_resume(tmp_path: Path, ccno_des: CCNoDes) -> None:
+    j_file = tmp_path / "run.ndjson"
+    journal = ResultJournal(j_file, False)
+    journal.append(_verified(1, ccno_des))
+    journal.append(_failed(2))
+    journal.close()
+    with j_file.open("a") as jfh:
+        jfh.write('{"task_id": 3, "verif')
+    resumed = ResultJournal(j_file, True)
+    assert list(resumed.completed) == [1, 2]
+    resumed.append(_failed(3))
+    assert [task_id for task_id, *_ in resumed.entries()] == [1, 2, 3]
+    resumed.close()
+    assert len(ResultJournal(j_file, False).completed) == 0
+
+
+def test_task_id_set() -> None:
+    ids = TaskIdSet()
+    for task_id in (5, 0, 5, 1 << 30, -3, 9000):
+        ids.add(task_id)
+    assert len(ids) == 5
+    assert list(ids) == [0, 5, 9000, -3, 1 << 30]
+    assert 9000 in ids
+    assert 4 not in ids
+    assert 1 << 20 not in ids
+    assert "5" not in ids
+
+
+def test_resume_needs_output(tmp_path: Path) -> None:
+    # the journals of a temporary work directory are gone after the run
+    with pytest.raises(ValidationEx):
+        validate_cafi(CURRENT_VER, 1, 1, str(tmp_path / "missing"), "", True)
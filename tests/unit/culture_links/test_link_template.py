@@ -0,0 +1,105 @@
+import re
+
+from cafi.container.acr_db import AcrCoreReg, AcrDbEntry, CatArgs
+from cafi.container.links import CatalogueLink, LinkLevel
+from cafi.library.loader import CURRENT_VER
+import pytest
+
+from saim.culture_link.create_links import create_ccno_brc_links
+from saim.culture_link.private.link_template import LinkTemplateCache
+from saim.designation.manager import AcronymManager
+from saim.shared.cafi.adapter import get_domain_from_cafi
+from saim.shared.data_con.designation import CCNoDes, CCNoId
+
+
+def test_templates_equal_cafi() -> None:
+    acr_man = AcronymManager(CURRENT_VER)
+    cache = LinkTemplateCache(acr_man)
+    for exclude in ((), (LinkLevel.cat,), (LinkLevel.home,)):
+        for des in ("DSM 1234", "DSM 0012", "ATCC BAA-12", "JCM 7", "unknown 1"):
+            ccno = acr_man.identify_ccno(des)
+            for _ in range(2):
+                links = cache.create_links(ccno, -1, exclude)
+                assert links == create_ccno_brc_links(ccno, acr_man, -1, exclude)
+                for brc_id, link in links:
+                    assert cache.get_domain(
+                        brc_id, exclude, link, ""
+                    ) == get_domain_from_cafi(link, "")
+
+
+class _FakeLookup:
+    def __init__(self) -> None:
+        self.acr_db = AcrDbEntry(
+            acr="ABC",
+            code="ABC",
+            name="ABC collection",
+            country="DE",
+            active=True,
+            regex_ccno="^ABC\\s*\\d+$",
+            regex_id=AcrCoreReg(full="^\\d+$", core="\\d+"),
+            deprecated=False,
+            homepage="https://abc.test/",
+            catalogue=["https://cat.abc.test/<id>"],
+            acr_changed_to=[],
+            acr_synonym=[],
+        )
+
+    def get_brc_by_id(self, brc_id: int, /) -> AcrDbEntry | None:
+        return self.acr_db if brc_id == 1 else None
+
+    def identify_acr(self, acr: str, /) -> set[int]:
+        return {1} if acr == "ABC" else set()
+
+
+def _id_dependent_links(
+    acr_db: AcrDbEntry, args: CatArgs, exclude: tuple[LinkLevel, ...], /
+) -> CatalogueLink:
+    # catalogue links only for ids matching regex_id
+    if LinkLevel.cat not in exclude and re.match(acr_db.regex_id.full, args.id):
+        return CatalogueLink(
+            level=LinkLevel.cat,
+            catalogue=[f"https://cat.abc.test/{args.id}"],
+            homepage=acr_db.homepage,
+        )
+    return CatalogueLink(level=LinkLevel.home, catalogue=[], homepage=acr_db.homepage)
+
+
+def _check_links(ids: tuple[str, ...], /) -> None:
+    lookup = _FakeLookup()
+    cache = LinkTemplateCache(lookup)  # type: ignore[arg-type]
+    for cid in ids:
+        ccno = CCNoDes(acr="ABC", id=CCNoId(full=cid, core=cid), designation=f"ABC {cid}")
+        expected = create_ccno_brc_links(ccno, lookup, -1)  # type: ignore[arg-type]
+        assert cache.create_links(ccno, -1) == expected
+        for brc_id, link in expected:
+            assert cache.get_domain(brc_id, (), link, "") == get_domain_from_cafi(
+                link, ""
+            )
+
+
+def test_templates_follow_id_shape(monkeypatch: pytest.MonkeyPatch) -> None:
+    for module in ("create_links", "private.link_template"):
+        monkeypatch.setattr(
+            f"saim.culture_link.{module}.create_ccno_links", _id_dependent_links
+        )
+    _check_links(("12a", "12", "b", "7", "x-1", "12a", "345"))
+
+
+def _length_dependent_links(
+    acr_db: AcrDbEntry, args: CatArgs, _exclude: tuple[LinkLevel, ...], /
+) -> CatalogueLink:
+    # long ids are served by another catalogue
+    catalogue = "old" if len(args.id) < 5 else "new"
+    return CatalogueLink(
+        level=LinkLevel.cat,
+        catalogue=[f"https://cat.abc.test/{catalogue}/{args.id}"],
+        homepage=acr_db.homepage,
+    )
+
+
+def test_templates_follow_id_length(monkeypatch: pytest.MonkeyPatch) -> None:
+    for module in ("create_links", "private.link_template"):
+        monkeypatch.setattr(
+            f"saim.culture_link.{module}.create_ccno_links", _length_dependent_links
+        )
+    _check_links(("123456", "12", "654321", "34", "1234567"))
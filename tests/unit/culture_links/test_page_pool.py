@@ -0,0 +1,112 @@
+import asyncio
+from collections.abc import Callable
+from typing import Any, cast
+
+from playwright.async_api import BrowserContext, Error
+
+from saim.culture_link.private.page_pool import PagePool
+
+
+class _FakePage:
+    def __init__(self) -> None:
+        self.closed = False
+        self.fail_blank = False
+        self.visited: list[str] = []
+        self.handlers: dict[str, Callable[[Any], None]] = {}
+
+    async def route(self, *_: Any) -> None:
+        pass
+
+    def on(self, event: str, handler: Callable[[Any], None]) -> None:
+        self.handlers[event] = handler
+
+    async def set_extra_http_headers(self, *_: Any) -> None:
+        pass
+
+    async def goto(self, url: str) -> None:
+        if self.fail_blank:
+            raise Error("navigation failed")
+        self.visited.append(url)
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self) -> None:
+        self.pages: list[_FakePage] = []
+
+    async def new_page(self) -> _FakePage:
+        self.pages.append(_FakePage())
+        return self.pages[-1]
+
+
+def _create_pool(size: int, uses: int) -> tuple[_FakeBrowser, PagePool]:
+    browser = _FakeBrowser()
+    return browser, PagePool(cast(BrowserContext, browser), "", size, uses)
+
+
+def test_pool_reuses_pages() -> None:
+    browser, pool = _create_pool(2, 10)
+
+    async def run() -> None:
+        await pool.warm_up()
+        for _ in range(5):
+            await pool.release(await pool.acquire())
+
+    asyncio.run(run())
+    assert len(browser.pages) == 2
+    assert browser.pages[1].visited == ["about:blank"] * 5
+    assert pool.stats["reused"] == 5
+    assert pool.stats["peak_busy"] == 1
+
+
+def test_pool_replaces_worn_out_pages() -> None:
+    browser, pool = _create_pool(1, 2)
+
+    async def run() -> None:
+        for _ in range(4):
+            await pool.release(await pool.acquire())
+
+    asyncio.run(run())
+    assert len(browser.pages) == 2
+    assert all(page.closed for page in browser.pages)
+    assert pool.stats["replaced"] == 2
+
+
+def test_pool_replaces_crashed_pages() -> None:
+    browser, pool = _create_pool(1, 10)
+
+    async def run() -> None:
+        pooled = await pool.acquire()
+        browser.pages[0].handlers["crash"](browser.pages[0])
+        await pool.release(pooled)
+        pooled = await pool.acquire()
+        pooled.page.fail_blank = True  # type: ignore[attr-defined]
+        await pool.release(pooled)
+        await pool.release(await pool.acquire())
+
+    asyncio.run(run())
+    assert len(browser.pages) == 3
+    assert browser.pages[0].closed
+    assert browser.pages[1].closed
+    assert not browser.pages[2].closed
+    assert pool.stats["replaced"] == 2
+
+
+def test_pool_bounds_idle_pages() -> None:
+    browser, pool = _create_pool(1, 10)
+
+    async def run() -> None:
+        first, second = await pool.acquire(), await pool.acquire()
+        await pool.release(first)
+        await pool.release(second)
+        await pool.close()
+
+    asyncio.run(run())
+    assert pool.stats["peak_busy"] == 2
+    assert pool.stats["idle"] == 0
+    assert all(page.closed for page in browser.pages)
@@ -0,0 +1,95 @@
+from pathlib import Path
+import sqlite3
+import time
+
+import pytest
+
+from saim.culture_link.private.result_store import (
+    StoredResult,
+    VerifyResultStore,
+    is_storable,
+)
+from saim.shared.error.exceptions import SessionCreationEx
+
+_KEY = "ab" * 32
+
+
+def _count_rows(db_path: Path, /) -> int:
+    with sqlite3.connect(db_path) as con:
+        return int(con.execute("SELECT COUNT(*) FROM results").fetchone()[0])
+
+
+def test_is_storable() -> None:
+    assert is_storable(200)
+    assert is_storable(302)
+    assert is_storable(403)
+    assert is_storable(404)
+    assert not is_storable(400)
+    assert not is_storable(500)
+
+
+def test_store_round_trip(tmp_path: Path) -> None:
+    db_path = tmp_path / "results.sqlite"
+    store = VerifyResultStore(db_path, 1)
+    assert store.get(_KEY) is None
+    store.put(_KEY, 200, True, 2)
+    stored = store.get(_KEY)
+    assert stored is not None
+    assert (stored.status, stored.found) == (200, True)
+    store.close()
+    reopened = VerifyResultStore(db_path, 1)
+    assert reopened.get(_KEY) == stored
+    reopened.close()
+
+
+def test_store_batches_commits(tmp_path: Path) -> None:
+    db_path = tmp_path / "results.sqlite"
+    store = VerifyResultStore(db_path, 1, 3, 3600.0)
+    for ind in range(2):
+        store.put(f"{ind:064x}", 404, False, 2)
+    assert _count_rows(db_path) == 0
+    store.put(f"{2:064x}", 404, False, 2)
+    assert _count_rows(db_path) == 3
+    store.close()
+
+
+def test_store_expired(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    db_path = tmp_path / "results.sqlite"
+    store = VerifyResultStore(db_path, 1)
+    store.put(_KEY, 200, False, 1)
+    store.flush()
+    assert isinstance(store.get(_KEY), StoredResult)
+    later = 2 * 86_400 + time.time()
+    monkeypatch.setattr("saim.culture_link.private.result_store.time.time", lambda: later)
+    assert store.get(_KEY) is None
+    store.flush()
+    assert _count_rows(db_path) == 0
+    store.close()
+
+
+def test_store_evicts_lru(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    db_path = tmp_path / "results.sqlite"
+    store = VerifyResultStore(db_path, 1, 1000, 3600.0)
+    for ind in range(300):
+        store.put(f"{ind:064x}", 200, True, 2)
+    store.flush()
+    assert _count_rows(db_path) == 300
+    monkeypatch.setattr(
+        VerifyResultStore, "_VerifyResultStore__live_size", lambda _: 2 * 1000**3
+    )
+    assert store.get(_KEY) is None
+    store.put(_KEY, 200, True, 2)
+    store.flush()
+    # one bounded eviction step per batch instead of clearing everything
+    assert _count_rows(db_path) == 300 + 1 - 256
+    assert store.get(_KEY) is not None
+    store.close()
+
+
+def test_store_invalid_args(tmp_path: Path) -> None:
+    with pytest.raises(SessionCreationEx):
+        VerifyResultStore(tmp_path / "results.sqlite", 0)
+    store = VerifyResultStore(tmp_path / "results.sqlite", 1)
+    with pytest.raises(SessionCreationEx):
+        store.put(_KEY, 200, True, 0)
+    store.close()
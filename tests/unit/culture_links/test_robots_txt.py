@@ -0,0 +1,100 @@
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+from threading import Thread
+from typing import Any
+
+import pytest
+
+from saim.culture_link.private.robots_txt import (
+    ROB_EXP_SEC,
+    RobotsRecord,
+    RobotsService,
+    RobotsTxt,
+    create_robots_url,
+)
+from saim.shared.error.exceptions import RequestURIEx
+
+_ROBOTS = "User-agent: saim\nDisallow: /private\nCrawl-delay: 2\n"
+
+
+class _RobotsHandler(BaseHTTPRequestHandler):
+    calls = 0
+
+    def do_GET(self) -> None:
+        type(self).calls += 1
+        if self.path != "/robots.txt":
+            self.send_response(404)
+            self.end_headers()
+            return None
+        body = _ROBOTS.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def robots_host() -> Iterator[str]:
+    _RobotsHandler.calls = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RobotsHandler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_create_robots_url() -> None:
+    assert create_robots_url("https://test.test/a/b?c=1") == (
+        "https://test.test/robots.txt"
+    )
+    with pytest.raises(RequestURIEx):
+        create_robots_url("ftp://test.test/")
+
+
+def test_robots_txt_rules() -> None:
+    robots = RobotsTxt(
+        RobotsRecord(url="http://t.t/robots.txt", active=True, text=_ROBOTS, fetched=0)
+    )
+    assert robots.get_delay() == 2
+    assert robots.can_fetch("http://t.t/public")
+    assert not robots.can_fetch("http://t.t/private/1")
+    inactive = RobotsTxt(
+        RobotsRecord(url="http://t.t/robots.txt", active=False, text="", fetched=0)
+    )
+    assert inactive.get_delay() == 0
+    assert inactive.can_fetch("http://t.t/private/1")
+
+
+def test_robots_service_prefetch(robots_host: str, tmp_path: Path) -> None:
+    service = RobotsService(tmp_path)
+    service.prefetch([f"{robots_host}/a", f"{robots_host}/b", "not a url"])
+    assert _RobotsHandler.calls == 1
+    robots = service.get(f"{robots_host}/c")
+    assert robots is service.get(f"{robots_host}/d")
+    assert robots.get_delay() == 2
+    assert not robots.can_fetch(f"{robots_host}/private")
+    assert _RobotsHandler.calls == 1
+    service.close()
+
+    reloaded = RobotsService(tmp_path)
+    assert reloaded.get(f"{robots_host}/c").get_delay() == 2
+    assert _RobotsHandler.calls == 1
+    reloaded.close()
+
+
+def test_robots_service_expired(robots_host: str, tmp_path: Path) -> None:
+    robots_url = f"{robots_host}/robots.txt"
+    expired = {"url": robots_url, "active": True, "text": "", "fetched": 0.0}
+    tmp_path.joinpath("robots_txt.json").write_text(json.dumps([expired]))
+    service = RobotsService(tmp_path)
+    assert service.get(robots_host).get_delay() == 2
+    assert _RobotsHandler.calls == 1
+    service.close()
+    stored = json.loads(tmp_path.joinpath("robots_txt.json").read_text())
+    assert stored[0]["fetched"] > ROB_EXP_SEC
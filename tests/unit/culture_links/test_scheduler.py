@@ -0,0 +1,66 @@
+from saim.culture_link.private.scheduler import DomainScheduler
+
+_DELAYS = {"slow.test": 10.0, "fast.test": 1.0}
+
+
+def _eligible(domain: str, last: float | None) -> float:
+    if last is None:
+        return 0.0
+    return last + _DELAYS.get(domain, 0.0)
+
+
+def _drain(scheduler: DomainScheduler[int], now: float) -> list[tuple[str, int]]:
+    ready: list[tuple[str, int]] = []
+    while (task := scheduler.pop_ready(now)) is not None:
+        ready.append(task)
+    return ready
+
+
+def test_scheduler_interleaves_domains() -> None:
+    scheduler: DomainScheduler[int] = DomainScheduler(_eligible)
+    for task in range(3):
+        scheduler.add("slow.test", task)
+    for task in range(3, 6):
+        scheduler.add("fast.test", task)
+    assert len(scheduler) == 6
+    assert _drain(scheduler, 100.0) == [("slow.test", 0), ("fast.test", 3)]
+    assert _drain(scheduler, 101.0) == [("fast.test", 4)]
+    assert _drain(scheduler, 102.0) == [("fast.test", 5)]
+    assert _drain(scheduler, 105.0) == []
+    assert _drain(scheduler, 110.0) == [("slow.test", 1)]
+    assert len(scheduler) == 1
+
+
+def test_scheduler_remembers_last_dispatch() -> None:
+    scheduler: DomainScheduler[int] = DomainScheduler(_eligible)
+    scheduler.add("slow.test", 1)
+    assert _drain(scheduler, 100.0) == [("slow.test", 1)]
+    scheduler.add("slow.test", 2)
+    assert scheduler.next_eligible() == 110.0
+    assert _drain(scheduler, 105.0) == []
+    assert _drain(scheduler, 110.0) == [("slow.test", 2)]
+    assert len(scheduler) == 0
+    assert scheduler.next_eligible() is None
+
+
+def test_scheduler_requeue() -> None:
+    scheduler: DomainScheduler[int] = DomainScheduler(_eligible)
+    scheduler.add("other.test", 1)
+    domain, task = _drain(scheduler, 100.0)[0]
+    scheduler.requeue(domain, task)
+    assert _drain(scheduler, 100.0) == [("other.test", 1)]
+
+
+def test_scheduler_skips_rejected_domains() -> None:
+    scheduler: DomainScheduler[int] = DomainScheduler(_eligible)
+    scheduler.add("slow.test", 1)
+    scheduler.add("fast.test", 2)
+    scheduler.add("fast.test", 3)
+    assert scheduler.pop_ready(100.0, lambda dom: dom != "slow.test") == (
+        "fast.test",
+        2,
+    )
+    assert scheduler.next_eligible(lambda dom: dom != "slow.test") == 101.0
+    assert scheduler.next_eligible(lambda _dom: False) is None
+    assert scheduler.next_eligible() == 0.0
+    assert scheduler.pop_ready(100.0) == ("slow.test", 1)
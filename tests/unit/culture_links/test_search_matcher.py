@@ -0,0 +1,74 @@
+from saim.culture_link.private.search_matcher import SearchMatcher
+from saim.shared.data_con.designation import CCNoDes, CCNoId
+
+
+pytest_plugins = ("tests.fixture.links",)
+
+
+def test_has_extra(ccno_des: CCNoDes) -> None:
+    assert SearchMatcher(ccno_des, ["abc"]).has_extra(b"ABC")
+    assert SearchMatcher(ccno_des, ["ab", "bc"]).has_extra(b"ABC")
+    assert SearchMatcher(ccno_des, ["a  b"]).has_extra(b"a b")
+    assert SearchMatcher(ccno_des, []).has_extra(b"")
+    assert not SearchMatcher(ccno_des, ["abd"]).has_extra(b"ABC")
+    assert not SearchMatcher(ccno_des, ["abcd"]).has_extra(b"ABC")
+    assert not SearchMatcher(ccno_des, ["abc"]).has_extra(b"")
+
+
+def test_has_extra_case_insensitive(ccno_des: CCNoDes) -> None:
+    assert SearchMatcher(ccno_des, ["ABC"]).has_extra(b"<b>abc</b>")
+    assert SearchMatcher(ccno_des, ["müller"]).has_extra("MÜLLER".encode("utf-8"))
+    assert not SearchMatcher(ccno_des, ["müller"]).has_extra(b"MULLER")
+
+
+def test_has_ccno(ccno_des: CCNoDes) -> None:
+    matcher = SearchMatcher(ccno_des, [])
+    assert matcher.has_ccno(b"ABC 1234")
+    assert matcher.has_ccno(b"ABC-1234")
+    assert matcher.has_ccno(b"abc 01234")
+    assert matcher.has_ccno(b"<td>abc</td><td>1234</td>")
+    assert not matcher.has_ccno(b"ABC-12-34")
+    assert not matcher.has_ccno(b"ABC 12345")
+    assert not matcher.has_ccno(b"")
+    assert not matcher.has_ccno(b"HELLO WORLD")
+
+
+def test_has_ccno_non_ascii(ccno_des: CCNoDes) -> None:
+    matcher = SearchMatcher(ccno_des, [])
+    # non-ascii letters continue the word like in a str search
+    assert not matcher.has_ccno("ABC 1234é".encode("utf-8"))
+    assert not matcher.has_ccno("ABC 1234ü ABC 1234٣".encode("utf-8"))
+    assert matcher.has_ccno("ABC 1234é ABC 1234".encode("utf-8"))
+    # non-ascii separators still end it
+    assert matcher.has_ccno("ABC 1234\u3000".encode("utf-8"))
+    assert matcher.has_ccno("ABC 1234\u2013x".encode("utf-8"))
+
+    # non-ascii suffixes have to end at a word boundary as well
+    ccno_id = CCNoId(full="2\u00fc", core="2", pre="", suf="\u00fc")
+    matcher = SearchMatcher(CCNoDes(acr="ABC", id=ccno_id, designation="ABC 2\u00fc"), [])
+    assert not matcher.has_ccno("ABC 2 \u00fcsStsD".encode("utf-8"))
+    assert not matcher.has_ccno("ABC 2 \u00fcsStsD more".encode("utf-8"))
+    assert matcher.has_ccno("ABC 2 \u00fcsStsS".encode("utf-8"))
+    assert matcher.has_ccno("ABC 2 \u00dcsStsS more".encode("utf-8"))
+
+
+def test_has_ccno_suffix() -> None:
+    ccno_id = CCNoId(full="1234a", core="1234", pre="", suf="a")
+    matcher = SearchMatcher(CCNoDes(acr="ABC", id=ccno_id, designation="ABC 1234a"), [])
+    assert matcher.has_ccno(b"ABC 1234A")
+    assert matcher.has_ccno(b"abc 1234a")
+    assert not matcher.has_ccno(b"ABC 1234")
+
+
+def test_search(ccno_des: CCNoDes) -> None:
+    matcher = SearchMatcher(ccno_des, ["hello world"])
+    assert matcher.search("<div> ABC 1234 hello world </div>".encode("utf-8"))
+    assert not matcher.search("<div> ABC 1234 </div>".encode("utf-8"))
+    assert not matcher.search("<div> Hello World </div>".encode("utf-8"))
+
+
+def test_patterns(ccno_des: CCNoDes) -> None:
+    patterns = SearchMatcher(ccno_des, ["hello world", "hello"]).patterns
+    assert len(patterns) == 3
+    assert patterns[0].startswith("1234")
+    assert set(patterns[1:]) == {"HELLO", "WORLD"}
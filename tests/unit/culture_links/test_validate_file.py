@@ -0,0 +1,22 @@
+from pathlib import Path
+
+import pytest
+
+from saim.culture_link.validate_file import iter_tasks, read_tasks
+from saim.shared.error.warnings import ReadWarn
+
+
+def test_iter_tasks(tmp_path: Path) -> None:
+    in_file = tmp_path / "tasks.csv"
+    in_file.write_text(
+        'id,brc,ccno,extra,fallback\n1,7,DSM 1,"a, b,",\n\n2,x,DSM 2,,http://t.t\n3,1\n'
+    )
+    with pytest.warns(ReadWarn):
+        tasks = list(iter_tasks(in_file))
+    assert [task.task_id for task in tasks] == [1, 2]
+    assert tasks[0].brc_id == 7
+    assert tasks[0].find_extra == ["a", "b"]
+    assert tasks[1].brc_id == -1
+    assert tasks[1].fallback_link == "http://t.t"
+    with pytest.warns(ReadWarn):
+        assert read_tasks(in_file) == tasks
@@ -0,0 +1,183 @@
+import heapq
+from collections.abc import Callable
+from itertools import pairwise
+
+from saim.culture_link.private.scheduler import DomainScheduler
+from saim.culture_link.private.work_steal import WorkStealingDeques
+
+# the first task of a domain on a worker pays for a fresh browser context
+_WARM_UP = 2.0
+_COOL_DOWN = 0.5
+_WORKERS = 4
+
+# releases and dispatches the tasks at the given time
+type _Release = Callable[[float], None]
+
+
+def _workload() -> list[tuple[str, float]]:
+    return [
+        (f"site{dom}.test", 0.5 + dom % 4 * 0.6) for dom in range(20) for _ in range(10)
+    ]
+
+
+def _eligible(_domain: str, last: float | None, /) -> float:
+    return 0.0 if last is None else last + _COOL_DOWN
+
+
+class _Crawl:
+    """Runs the workload on virtual workers behind a domain scheduler.
+
+    Like the request manager the tasks leave the scheduler only for an idle
+    worker and a domain is never crawled by two workers at once.
+    """
+
+    def __init__(self) -> None:
+        self.scheduler: DomainScheduler[float] = DomainScheduler(_eligible)
+        for domain, duration in _workload():
+            self.scheduler.add(domain, duration)
+        self.idle = set(range(_WORKERS))
+        self.running: dict[int, str] = {}
+        self.__warm: set[tuple[int, str]] = set()
+        self.__starts: dict[str, list[float]] = {}
+        # finish time, worker
+        self.__events: list[tuple[float, int]] = []
+
+    def accept(self, domain: str, /) -> bool:
+        return domain not in self.running.values()
+
+    def start(self, now: float, worker: int, domain: str, duration: float, /) -> None:
+        self.idle.discard(worker)
+        self.running[worker] = domain
+        self.__starts.setdefault(domain, []).append(now)
+        if (worker, domain) not in self.__warm:
+            duration += _WARM_UP
+            self.__warm.add((worker, domain))
+        heapq.heappush(self.__events, (now + duration, worker))
+
+    def run(self, release: _Release, /) -> float:
+        now = 0.0
+        while len(self.scheduler) > 0 or len(self.__events) > 0:
+            release(now)
+            eligible = None
+            if len(self.idle) > 0:
+                eligible = self.scheduler.next_eligible(self.accept)
+            if len(self.__events) > 0 and (
+                eligible is None or self.__events[0][0] <= eligible
+            ):
+                now, worker = heapq.heappop(self.__events)
+                self.idle.add(worker)
+                del self.running[worker]
+            elif eligible is not None:
+                now = max(now, eligible)
+        return now
+
+    def warm_ups(self) -> int:
+        return len(self.__warm)
+
+    def early_requests(self) -> int:
+        # requests a real worker would have to hold back for the cool-down
+        return sum(
+            second - first < _COOL_DOWN
+            for starts in self.__starts.values()
+            for first, second in pairwise(starts)
+        )
+
+
+def _run_shared_queue(crawl: _Crawl, /) -> float:
+    def release(now: float, /) -> None:
+        while len(crawl.idle) > 0:
+            if (ready := crawl.scheduler.pop_ready(now, crawl.accept)) is None:
+                return None
+            crawl.start(now, min(crawl.idle), *ready)
+
+    return crawl.run(release)
+
+
+def _run_work_stealing(crawl: _Crawl, /) -> float:
+    deques: WorkStealingDeques[float] = WorkStealingDeques(_WORKERS)
+
+    def dispatch(now: float, /) -> None:
+        for worker in crawl.idle:
+            deques.finished(worker)
+        for take in (deques.pop_own, deques.steal):
+            for worker in sorted(crawl.idle):
+                if (task := take(worker)) is not None:
+                    deques.started(worker, task[0])
+                    crawl.start(now, worker, *task)
+
+    def release(now: float, /) -> None:
+        dispatch(now)
+        for accept in (
+            lambda dom: deques.owned_by(dom, crawl.idle),
+            lambda dom: not deques.in_flight(dom),
+        ):
+            while len(deques) < len(crawl.idle):
+                if (ready := crawl.scheduler.pop_ready(now, accept)) is None:
+                    break
+                deques.push(*ready)
+            dispatch(now)
+        assert len(deques) == 0
+
+    return crawl.run(release)
+
+
+def test_deques_affinity_and_steal() -> None:
+    deques: WorkStealingDeques[int] = WorkStealingDeques(2)
+    assert deques.push("a.test", 1) == 0
+    assert deques.push("b.test", 2) == 1
+    assert deques.push("a.test", 3) == 0
+    assert deques.push("a.test", 4) == 0
+    assert len(deques) == 4
+    assert deques.pop_own(0) == ("a.test", 1)
+    deques.started(0, "a.test")
+    assert deques.pop_own(1) == ("b.test", 2)
+    assert deques.pop_own(1) is None
+    # the only group left is in flight on its owner
+    assert deques.steal(1) is None
+    deques.finished(0)
+    assert deques.steal(1) == ("a.test", 3)
+    deques.started(1, "a.test")
+    assert deques.owned_by("a.test", {1})
+    assert not deques.owned_by("a.test", {0})
+    assert deques.owned_by("new.test", {0})
+    assert deques.steal(0) is None
+    deques.requeue(1, "a.test", 3)
+    assert deques.pop_own(1) == ("a.test", 3)
+    assert deques.pop_own(1) == ("a.test", 4)
+    assert len(deques) == 0
+
+
+def test_steal_domain_group() -> None:
+    deques: WorkStealingDeques[int] = WorkStealingDeques(2)
+    for domain, task in (("a.test", 1), ("b.test", 2), ("c.test", 3), ("c.test", 4)):
+        deques.push(domain, task)
+    assert deques.pop_own(1) == ("b.test", 2)
+    assert deques.steal(1) == ("c.test", 3)
+    assert deques.push("c.test", 5) == 1
+    assert [deques.pop_own(1), deques.pop_own(1)] == [("c.test", 4), ("c.test", 5)]
+
+
+def test_steal_skips_domains_in_flight() -> None:
+    deques: WorkStealingDeques[int] = WorkStealingDeques(3)
+    for domain, task in (("a.test", 1), ("a.test", 2), ("b.test", 3)):
+        deques.push(domain, task)
+    assert deques.pop_own(0) == ("a.test", 1)
+    deques.started(0, "a.test")
+    deques.push("c.test", 4)
+    assert deques.in_flight("a.test")
+    assert not deques.in_flight("a.test", 0)
+    assert not deques.in_flight("")
+    assert deques.pop_own(1) == ("b.test", 3)
+    # the a.test group is skipped, the c.test group is stolen
+    assert deques.steal(1) == ("c.test", 4)
+    assert deques.steal(1) is None
+    assert deques.pop_own(0) == ("a.test", 2)
+
+
+def test_affinity_shortens_crawl() -> None:
+    shared = _Crawl()
+    baseline = _run_shared_queue(shared)
+    stealing = _Crawl()
+    assert _run_work_stealing(stealing) < baseline * 0.85
+    assert stealing.warm_ups() < shared.warm_ups() * 0.5
+    assert shared.early_requests() == stealing.early_requests() == 0
@@ -1,11 +1,12 @@
 from typing import Any, Final
 import pytest
 import re
-from saim.designation.extract_ccno import get_ccno_id
+from saim.designation.extract_ccno import clean_designation, get_ccno_id
 
 from saim.shared.parse.string import clean_string
 from saim.shared.error.exceptions import DesignationEx
 from saim.shared.data_ops.clean import detect_empty_dict_keys
+from tests.fixture.string_reference import DES_CL_REFERENCE
 
 
 SAMPLE_IDS: Final[list[str]] = ["1234", "0001", "0000", "B987R"]
@@ -59,3 +60,21 @@ def test_get_ccno_id() -> None:
 
     with pytest.raises(DesignationEx):
         get_ccno_id("DSM 23", "SM")
+
+
+def test_clean_designation() -> None:
+    assert "DSM 12" == clean_designation("Type strain: DSM 12 T")
+    assert "DSM 12" == clean_designation("-strain.Voucher: DSM 12 (old)T\n")
+    assert "" == clean_designation("Culture collection: T T")
+    for des in (
+        "",
+        "TTT",
+        "Strain T",
+        "strain  voucher: collection:X",
+        "Voucher: Strain: DSM 1",
+        " [DSM] 12 <b>T</b> ",
+        "(DSM 12)",
+        "specimen-voucher.\tCBS 12 t",
+        "é DSM 12 _",
+    ):
+        assert clean_designation(des) == clean_string(des, *DES_CL_REFERENCE)
@@ -0,0 +1,74 @@
+import csv
+import io
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO
+
+import pytest
+
+from saim.designation.main import _open_input, classify_stream
+from saim.shared.data_con.brc import BrcContainer
+
+
+pytest_plugins = ("tests.fixture.designation",)
+
+_LINES = ["DSM 3\n", "hello\n", "DSM-0024413\n", "DSM T33\n", "DSM:3\n"]
+
+
+class TestMain:
+    def test_text(self, brc_simple: BrcContainer) -> None:
+        out = list(classify_stream(_LINES, brc_simple, "text", 1, 2))
+        assert [cnt for cnt, _ in out] == [2, 2, 1]
+        lines = "".join(res for _, res in out).splitlines()
+        assert len(lines) == len(_LINES)
+        assert lines[0].startswith("ccno - ")
+        assert lines[1].startswith("des - ")
+
+    def test_jsonl(self, brc_simple: BrcContainer) -> None:
+        out = "".join(
+            res for _, res in classify_stream(_LINES, brc_simple, "jsonl", 1, 3)
+        )
+        rows = [json.loads(line) for line in out.splitlines()]
+        assert [row["input"] for row in rows] == [line.strip() for line in _LINES]
+        assert rows[0]["type"] == "ccno"
+        assert rows[0]["acr"] == "DSM"
+        assert rows[0]["id"]["core"] == "3"
+
+    def test_csv(self, brc_simple: BrcContainer) -> None:
+        out = "".join(res for _, res in classify_stream(_LINES, brc_simple, "csv", 1, 4))
+        rows = list(csv.reader(io.StringIO(out)))
+        assert rows[0][:3] == ["DSM 3", "ccno", "DSM"]
+        assert rows[1][:3] == ["hello", "des", ""]
+
+    def test_jobs_keep_order(self, brc_simple: BrcContainer) -> None:
+        lines = _LINES * 20
+        serial = list(classify_stream(lines, brc_simple, "jsonl", 1, 7))
+        assert list(classify_stream(lines, brc_simple, "jsonl", 2, 7)) == serial
+
+    def test_jobs_bounded_read_ahead(self, brc_simple: BrcContainer) -> None:
+        read = [0]
+
+        def lines() -> Iterator[str]:
+            for line in _LINES * 1_000:
+                read[0] += 1
+                yield line
+
+        results = classify_stream(lines(), brc_simple, "text", 2, 7)
+        next(results)
+        # two pending chunks per job plus the one being read
+        assert read[0] <= 7 * 5
+
+    def test_open_input_passes_caller_errors(self, tmp_path: Path) -> None:
+        in_file = tmp_path / "lines.txt"
+        in_file.write_text("DSM 3\n")
+        opened: list[IO[str]] = []
+
+        def write_to_closed_pipe() -> None:
+            with _open_input(str(in_file)) as file_in:
+                opened.append(file_in)
+                raise BrokenPipeError
+
+        with pytest.raises(BrokenPipeError):
+            write_to_closed_pipe()
+        assert opened[0].closed
@@ -1,6 +1,10 @@
 from typing import Never
 from saim.shared.search.radix_tree import (
+    PrefixIndex,
     RadixTree,
+    find_first_match_with_fix,
+    find_fuzzy_matches,
+    radix_build,
     radix_add,
     radix_compact,
     radix_get_next,
@@ -8,6 +12,17 @@ from saim.shared.search.radix_tree import (
 )
 
 
+def _dump(node: RadixTree[int], /) -> tuple[object, ...]:
+    return (
+        node.end,
+        node.index,
+        node.max,
+        node.ready,
+        tuple((key, _dump(child)) for key, child in node.con),
+        tuple(sorted(node.edges)),
+    )
+
+
 class TestRadixTree:
     @staticmethod
     def _check_node_keys(
@@ -55,3 +70,65 @@ class TestRadixTree:
         for key_v in test_string:
             assert tree_node is not None
             tree_node = TestRadixTree._check_node_keys(tree_node, [key_v], key_v)
+
+    def test_prefix_index(self) -> None:
+        tree: RadixTree[Never] = RadixTree("MSD", tuple())
+        for acr in ("ZMSD", "T:MSD", "CCTA", "C-CTA", "AB", "AB:CD"):
+            radix_add(tree, acr, tuple())
+        index = PrefixIndex(tree)
+        assert index.find_prefixes("zmsd ecnerefer") == ["ZMSD"]
+        assert index.find_prefixes("ab-cd") == ["AB-CD", "AB"]
+        assert index.find_prefixes("T-MSD) yb") == ["T-MSD)"]
+        assert index.find_prefixes("MSD) yb") == ["MSD)"]
+        assert index.find_prefixes("MSDX") == []
+        assert index.find_prefixes("") == []
+        for text in (
+            "ZMSD ecnerefer",
+            "ab - cd",
+            "t. msd",
+            "CCTA:1",
+            "C--CTA",
+            "MS",
+            "C-CT",
+        ):
+            assert index.find_prefixes(text) == [
+                mat for mat, _ in find_first_match_with_fix(tree, text, False)
+            ]
+
+    def test_build_equals_add_and_compact(self) -> None:
+        keys: list[tuple[str, tuple[int, ...]]] = [
+            ("DSMZ", (1,)),
+            ("KCTC", (2,)),
+            ("DSM", (3,)),
+            ("DSM-T", (4, 4)),
+            ("dsm", (5,)),
+            ("JCM..", (6,)),
+            ("J.C", ()),
+            ("-KC", (7,)),
+        ]
+        (first, first_ind), *rest = keys
+        tree: RadixTree[int] = RadixTree(first, first_ind)
+        for key, ind in rest:
+            radix_add(tree, key, ind)
+        radix_compact(tree)
+        built = radix_build(keys)
+        assert built is not None
+        assert _dump(built) == _dump(tree)
+        assert radix_build([]) is None
+
+    def test_fuzzy_matches(self) -> None:
+        tree: RadixTree[int] = RadixTree("DSMZ", (1,))
+        for acr, ind in (("DSM", 2), ("ATCC", 3), ("JCM", 4), ("DSM-T", 5)):
+            radix_add(tree, acr, (ind,))
+        assert find_fuzzy_matches(tree, "dsm z", 1) == [
+            ("DSM:T", 1, (5,)),
+            ("DSMZ", 1, (1,)),
+        ]
+        assert find_fuzzy_matches(tree, "ACTT", 1) == []
+        assert find_fuzzy_matches(tree, "ACTT", 2) == [("ATCC", 2, (3,))]
+        assert find_fuzzy_matches(tree, "DSN", 1) == [("DSM", 1, (2,))]
+        assert find_fuzzy_matches(tree, "DSM T", 0) == [("DSM:T", 0, (5,))]
+        assert find_fuzzy_matches(tree, "", 3) == []
+        assert find_fuzzy_matches(tree, "ATC 1234", 1, True) == [("ATCC", 1, (3,))]
+        assert find_fuzzy_matches(tree, "JCM1234", 0, True) == [("JCM", 0, (4,))]
+        assert find_fuzzy_matches(tree, "JCMA1234", 0, True) == []
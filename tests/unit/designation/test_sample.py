@@ -2,10 +2,12 @@ from typing import Never
 
 from saim.designation.extract_ccno import (
     extract_ccno_from_text,
+    extract_ccno_spans_from_stream,
+    extract_ccno_spans_from_text,
     identify_all_valid_ccno,
     identify_ccno,
 )
-from saim.designation.known_acr_db import create_brc_con
+from saim.designation.known_acr_db import create_brc_con, identify_similar_acr
 from saim.shared.data_con.brc import BrcContainer
 from saim.shared.data_con.designation import CCNoDes, CCNoId, ccno_designation_to_dict
 from saim.shared.search.radix_tree import RadixTree, find_first_match_with_fix, radix_add
@@ -70,6 +72,14 @@ class TestSample:
         assert len(res) == 1
         assert res[0].acr == "DSM T"
 
+    def test_similar_acr(self, brc_ambiguous: BrcContainer) -> None:
+        assert identify_similar_acr("DMS T 1234", brc_ambiguous, 1) == [
+            ("DSM", 1, {1}),
+            ("DSMT", 1, {2}),
+        ]
+        assert identify_similar_acr("DSN 1234", brc_ambiguous, 1) == [("DSM", 1, {1})]
+        assert identify_similar_acr("JCM 1234", brc_ambiguous, 1) == []
+
     def test_search_ccno_all_text(self, brc_ambiguous: BrcContainer) -> None:
         test_text = """
 Described in literature was DSM-T 1234 strain and DSM T-1234.2.
@@ -95,6 +105,28 @@ Described in literature was DSM-T 1234 strain and DSM T-1234.2.
         ):
             assert ccno in test_res
 
+    def test_search_ccno_spans_text(self, brc_ambiguous: BrcContainer) -> None:
+        test_text = "Described in literature was DSM-T 1234 strain and DSM T-1234.2."
+        spans = list(extract_ccno_spans_from_text(test_text, brc_ambiguous))
+        assert [span.ccno for span in spans] == list(
+            extract_ccno_from_text(test_text, brc_ambiguous)
+        )
+        assert {test_text[span.start : span.end] for span in spans} == {
+            "DSM-T 1234",
+            "DSM T-1234.2",
+        }
+
+    def test_search_ccno_spans_stream(self, brc_ambiguous: BrcContainer) -> None:
+        test_text = " and ".join(["DSM-T 1234", "DSM T-1234.2", "DSM:T12"] * 40)
+        expected = list(extract_ccno_spans_from_text(test_text, brc_ambiguous))
+        assert len(expected) == 200
+        for size in (1, 5, 17, 256, len(test_text)):
+            chunks = (
+                test_text[pos : pos + size] for pos in range(0, len(test_text), size)
+            )
+            assert list(extract_ccno_spans_from_stream(chunks, brc_ambiguous)) == expected
+        assert len(list(extract_ccno_spans_from_stream([], brc_ambiguous))) == 0
+
     def test_search_algo_text(self) -> None:
         brc_full_test = create_brc_con()
         test_text = """
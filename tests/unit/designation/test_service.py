@@ -0,0 +1,23 @@
+import copy
+
+from cafi.library.loader import CURRENT_VER
+
+from saim.designation.manager import AcronymManager
+from saim.designation.service import AcronymService
+
+
+def test_service_client() -> None:
+    acr_man = AcronymManager(CURRENT_VER)
+    designations = ["DSM 1234", "DSM-T 12", "unknown 12"]
+    with AcronymService(CURRENT_VER) as service:
+        client = service.client()
+        assert client.identify_ccno_batch(designations) == acr_man.identify_ccno_batch(
+            designations
+        )
+        assert client.identify_acr("DSM") == acr_man.identify_acr("DSM")
+        # copies are rebuilt from the address and key like in a spawned worker
+        spawned = copy.copy(client)
+        assert spawned.identify_ccno("DSM 1234") == acr_man.identify_ccno("DSM 1234")
+        assert client.is_brc_deprecated(-1)
+        client.close()
+        spawned.close()
@@ -1,9 +1,21 @@
+import random
 import re
+from typing import Final
 
 from saim.shared.parse.string import (
+    PATTERN_CORE_ID_EDGE_R,
+    PATTERN_EDGE_R,
+    PATTERN_ID_EDGE_R,
+    PATTERN_SEP_R,
+    clean_core_id_edges,
+    clean_edges,
+    clean_id_edges,
     clean_string,
+    edge_span,
+    remove_non_word_chars_upper,
     replace_non_word_chars,
 )
+from tests.fixture.string_reference import replace_non_word_chars_reference
 
 
 def test_clean_string_nothing() -> None:
@@ -31,3 +43,62 @@ def test_replace_non_word_chars() -> None:
     assert replace_non_word_chars("-Test") == ":Test"
     assert replace_non_word_chars("-Test-") == ":Test:"
     assert replace_non_word_chars("---Test---") == ":Test:"
+
+
+_FUZZ_WORDS: Final[tuple[str, ...]] = (
+    "DSM",
+    "12",
+    "T",
+    ":",
+    " ",
+    ".",
+    "\n",
+    "\t",
+    "_",
+    "-",
+    "/",
+    ",",
+    "é",
+    "٣",
+    "　",
+    "ß",
+    "²",
+)
+
+
+def _fuzz_strings() -> list[str]:
+    rnd = random.Random(42)  # noqa: S311
+    return [
+        "".join(rnd.choice(_FUZZ_WORDS) for _ in range(rnd.randint(0, 8)))
+        for _ in range(2_000)
+    ]
+
+
+def test_replace_non_word_chars_equivalence() -> None:
+    for text in _fuzz_strings():
+        assert replace_non_word_chars(text) == replace_non_word_chars_reference(text)
+
+
+def test_remove_non_word_chars_upper() -> None:
+    assert remove_non_word_chars_upper("dsm-T (é)") == "DSMT"
+    for text in _fuzz_strings():
+        assert (
+            remove_non_word_chars_upper(text)
+            == clean_string(
+                replace_non_word_chars_reference(text), PATTERN_SEP_R, PATTERN_EDGE_R
+            ).upper()
+        )
+
+
+def test_clean_edges_equivalence() -> None:
+    for text in _fuzz_strings():
+        assert clean_edges(text) == clean_string(text, PATTERN_EDGE_R)
+        assert clean_id_edges(text) == clean_string(text, PATTERN_ID_EDGE_R)
+        assert clean_core_id_edges(text) == clean_string(text, PATTERN_CORE_ID_EDGE_R)
+        start, end = edge_span(text)
+        assert text[start:end] == clean_string(text, PATTERN_EDGE_R)
+
+
+def test_edge_span_window() -> None:
+    assert edge_span("--DSM 12--", 2, 6) == (2, 5)
+    assert edge_span("----") == (4, 4)
@@ -0,0 +1,54 @@
+from cafi.library.loader import CURRENT_VER
+
+from saim.history.extract_dep_des import (
+    assign_depositor_designation,
+    assign_depositor_designations,
+    create_history_pool,
+)
+from saim.history.manager import HistoryManager
+from saim.history.private.types import STRAIN_DP
+from saim.shared.data_con.history import DepositCon
+
+
+def _create_strain_dp(size: int = 600, /) -> STRAIN_DP:
+    strain_dp: STRAIN_DP = {}
+    for dep_id in range(1, size + 1):
+        strain_dp[dep_id] = DepositCon(
+            designation=f"DSM {dep_id}",
+            history=[f"ATCC {dep_id} <- JCM {dep_id + 1} <- J. Doe"],
+            deposited_as=0,
+            cc_id=-1,
+            rel_des=[],
+        )
+    for dep_id in range(size + 1, 2 * size + 1):
+        strain_dp[dep_id] = DepositCon(
+            designation=f"ATCC {dep_id - size}",
+            history=[],
+            deposited_as=0,
+            cc_id=-1,
+            rel_des=[],
+        )
+    return strain_dp
+
+
+class TestDepositorDesignation:
+    def test_parallel_equals_sequential(self) -> None:
+        strain_dp = _create_strain_dp()
+        manager = HistoryManager(CURRENT_VER)
+        sequential = list(assign_depositor_designation(strain_dp, manager))
+        assert len(sequential) > 0
+        with create_history_pool(manager.version, 2) as pool:
+            assert list(assign_depositor_designation(strain_dp, manager, pool)) == (
+                sequential
+            )
+
+    def test_batch_equals_sequential(self) -> None:
+        manager = HistoryManager(CURRENT_VER)
+        # small strains share chunks, the large one spans several
+        strains = [_create_strain_dp(size) for size in (0, 3, 40, 300, 7, 128)]
+        sequential = [
+            list(assign_depositor_designation(strain_dp, manager))
+            for strain_dp in strains
+        ]
+        assert list(assign_depositor_designations(strains, manager, 2)) == sequential
+        assert list(assign_depositor_designations(strains, manager, 1)) == sequential
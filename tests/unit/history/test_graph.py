@@ -0,0 +1,57 @@
+import random
+
+from saim.history.graph import find_all_cycle_members, find_cycle_members
+
+
+def _reference_members(history: list[tuple[int, int]], /) -> set[int]:
+    graph: dict[int, set[int]] = {}
+    for tar, src in history:
+        graph.setdefault(tar, set()).add(src)
+    members = set()
+    for start in graph:
+        seen: set[int] = set()
+        todo = list(graph[start])
+        while len(todo) > 0:
+            if (node := todo.pop()) == start:
+                members.add(start)
+                break
+            if node not in seen:
+                seen.add(node)
+                todo.extend(graph.get(node, set()))
+    return members
+
+
+class TestHistoryGraph:
+    def test_acyclic(self) -> None:
+        assert find_cycle_members([]) == set()
+        assert find_cycle_members([(1, 2), (2, 3), (4, 3)]) == set()
+
+    def test_cycle_members(self) -> None:
+        assert find_cycle_members([(1, 1)]) == {1}
+        assert find_cycle_members([(1, 2), (2, 3), (3, 2), (4, 1)]) == {2, 3}
+        assert find_cycle_members([(1, 2), (2, 1), (3, 4), (4, 5), (5, 3)]) == {
+            1,
+            2,
+            3,
+            4,
+            5,
+        }
+
+    def test_long_chain(self) -> None:
+        chain = [(dep, dep + 1) for dep in range(200_000)]
+        assert find_cycle_members(chain) == set()
+        assert find_cycle_members([*chain, (200_000, 0)]) == set(range(200_001))
+
+    def test_random_graphs(self) -> None:
+        rnd = random.Random(13)  # noqa: S311
+        for _ in range(2_000):
+            nodes = rnd.randint(1, 12)
+            history = [
+                (rnd.randint(1, nodes), rnd.randint(1, nodes))
+                for _ in range(rnd.randint(0, 15))
+            ]
+            assert find_cycle_members(history) == _reference_members(history)
+
+    def test_batch(self) -> None:
+        histories = {"a": [(1, 2)], "b": [(1, 2), (2, 1)], "c": []}
+        assert find_all_cycle_members(histories) == {"b": {1, 2}}
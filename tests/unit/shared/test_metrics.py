@@ -0,0 +1,40 @@
+from saim.shared.misc.metrics import MetricsRegistry
+
+
+class TestMetrics:
+    def test_disabled(self) -> None:
+        registry = MetricsRegistry()
+        with registry.timer("stage"):
+            registry.count("calls")
+        assert registry.snapshot()["counters"] == {}
+        assert registry.snapshot()["timers"] == {}
+
+    def test_enabled(self) -> None:
+        registry = MetricsRegistry()
+        registry.enable()
+        for _ in range(3):
+            with registry.timer("stage"):
+                registry.count("calls")
+        registry.observe("stage", 2.0)
+        snapshot = registry.snapshot()
+        assert snapshot["counters"] == {"calls": 3}
+        assert snapshot["timers"]["stage"]["count"] == 4
+        assert sum(snapshot["timers"]["stage"]["buckets"]) == 4
+        assert snapshot["timers"]["stage"]["max"] == 2.0
+
+    def test_merge_and_prometheus(self) -> None:
+        registry = MetricsRegistry()
+        registry.enable()
+        registry.count("link.cached", 2)
+        registry.observe("link.request", 0.2)
+        registry.gauge("culture_link.worker_utilization_ratio", 0.5)
+        merged = MetricsRegistry()
+        merged.merge(registry.snapshot())
+        merged.merge(registry.snapshot())
+        prom = merged.to_prometheus()
+        assert "saim_link_cached_total 4" in prom
+        assert 'saim_link_request_seconds_bucket{le="0.1"} 0' in prom
+        assert 'saim_link_request_seconds_bucket{le="0.5"} 2' in prom
+        assert 'saim_link_request_seconds_bucket{le="+Inf"} 2' in prom
+        assert "saim_link_request_seconds_count 2" in prom
+        assert "saim_culture_link_worker_utilization_ratio 0.5" in prom
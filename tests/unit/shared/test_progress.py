@@ -0,0 +1,43 @@
+from saim.shared.misc.progress import ProgressReport
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestProgress:
+    def test_rate_limited(self) -> None:
+        lines: list[str] = []
+        clock = _Clock()
+        progress = ProgressReport(10, 5.0, lines.append, clock)
+        clock.now = 1.0
+        progress.step()
+        clock.now = 2.0
+        progress.step()
+        assert len(lines) == 1
+        clock.now = 6.0
+        progress.step()
+        assert len(lines) == 2
+        assert lines[-1].startswith("PROGRESS - [3/10] - 30%")
+        assert "0.50 tasks/s" in lines[-1]
+        assert lines[-1].endswith("eta 0:00:14")
+
+    def test_every_step(self) -> None:
+        lines: list[str] = []
+        clock = _Clock()
+        progress = ProgressReport(2, 0.0, lines.append, clock)
+        progress.step()
+        progress.step()
+        assert len(lines) == 2
+        assert progress.done == 2
+
+    def test_summary(self) -> None:
+        clock = _Clock()
+        progress = ProgressReport(0, 1.0, lambda _: None, clock)
+        progress.step(7)
+        clock.now = 3661.0
+        assert progress.summary().startswith("DONE - 7 tasks in 1:01:01")